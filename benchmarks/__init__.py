@@ -0,0 +1,9 @@
+"""
+Benchmarks package initializer.
+
+This package contains:
+- A local stub API server (synthetic / recorded payloads)
+- Offline benchmark runners for extraction and pipelines
+
+Author: Chef Seasons – Data Engineering Team
+"""
@@ -0,0 +1,121 @@
+"""
+bench_extraction.py
+===================
+
+Offline, deterministic extraction benchmark.
+
+Starts the local stub API server, points API_1_URL / API_2_URL at it and
+times `fetch_api_1_data`, `fetch_api_2_data` and (optionally) the full
+`run_pipeline` functions end to end.
+
+Usage:
+    python -m benchmarks.bench_extraction --days 7 --api1-per-day 2000 \\
+        --api2-per-day 5000 --latency-ms 30 --repeat 3
+
+    # include transform + load (requires a configured database backend)
+    python -m benchmarks.bench_extraction --pipelines
+
+Author: Chef Seasons – Data Engineering Team
+"""
+
+import argparse
+import os
+import time
+from datetime import date, timedelta
+from typing import Callable, Dict, Any, List
+
+from benchmarks.stub_api_server import StubConfig, start_stub_server
+
+
+def _timed(label: str, fn: Callable[[], Any], repeat: int) -> Dict[str, Any]:
+    timings: List[float] = []
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - started)
+
+    if hasattr(result, "rows"):      # run_pipeline → PipelineResult
+        result = result.rows
+    rows = result if isinstance(result, int) else len(result or [])
+    best = min(timings)
+    return {
+        "label": label,
+        "rows": rows,
+        "best_s": round(best, 3),
+        "mean_s": round(sum(timings) / len(timings), 3),
+        "rows_per_s": round(rows / best, 1) if best else 0.0,
+    }
+
+
+def _parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Offline extraction benchmark")
+    parser.add_argument("--days", type=int, default=7)
+    parser.add_argument("--api1-per-day", type=int, default=1000)
+    parser.add_argument("--api2-per-day", type=int, default=2000)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--error-429", type=float, default=0.0)
+    parser.add_argument("--error-5xx", type=float, default=0.0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--cache", action="store_true", help="keep the HTTP response cache enabled")
+    parser.add_argument("--pipelines", action="store_true", help="also run full run_pipeline()")
+    parser.add_argument("--mode", choices=["synthetic", "replay"], default="synthetic")
+    parser.add_argument("--recordings-dir", default=os.path.join("benchmarks", "recordings"))
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = _parse_args(argv)
+
+    server = start_stub_server(StubConfig(
+        api1_per_day=args.api1_per_day,
+        api2_per_day=args.api2_per_day,
+        latency_ms=args.latency_ms,
+        error_429_rate=args.error_429,
+        error_5xx_rate=args.error_5xx,
+        retry_after_seconds=0,
+        mode=args.mode,
+        recordings_dir=args.recordings_dir,
+    ))
+
+    # Settings are read at import time → configure env before importing clients.
+    os.environ["API_1_URL"] = f"{server.base_url}/api1"
+    os.environ["API_2_URL"] = f"{server.base_url}/api2"
+    if not args.cache:
+        os.environ["HTTP_CACHE_ENABLED"] = "false"
+
+    from services.api_client_1 import fetch_api_1_data
+    from services.api_client_2 import fetch_api_2_data
+    from services.http_transport import get_transport_stats
+    from services.retry_policy import get_policy_stats
+
+    date_to = date.today()
+    date_from = date_to - timedelta(days=args.days - 1)
+    window = (date_from.strftime("%Y-%m-%d"), date_to.strftime("%Y-%m-%d"))
+
+    results = [
+        _timed("fetch_api_1_data", lambda: fetch_api_1_data(*window), args.repeat),
+        _timed("fetch_api_2_data",
+               lambda: fetch_api_2_data({"from": window[0], "to": window[1]}), args.repeat),
+    ]
+
+    if args.pipelines:
+        from etl.etl_pipeline_1 import run_pipeline as run_p1
+        from etl.etl_pipeline_2 import run_pipeline as run_p2
+        results.append(_timed("etl_pipeline_1.run_pipeline", lambda: run_p1(*window), 1))
+        results.append(_timed("etl_pipeline_2.run_pipeline", lambda: run_p2(*window), 1))
+
+    server.shutdown()
+
+    print(f"\nWindow {window[0]} → {window[1]}  latency={args.latency_ms}ms")
+    print(f"{'benchmark':32} {'rows':>9} {'best s':>8} {'mean s':>8} {'rows/s':>11}")
+    for r in results:
+        print(f"{r['label']:32} {r['rows']:>9} {r['best_s']:>8} {r['mean_s']:>8} {r['rows_per_s']:>11}")
+
+    print(f"\nStub responses by status: {server.status_counts}")
+    print(f"Transport: {get_transport_stats('api1')} | {get_transport_stats('api2')}")
+    print(f"Retry policy: {get_policy_stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+bench_load.py
+=============
+
+Load-path benchmark: compares loader backends and strategies on the
+same data.
+
+Generates deterministic Table1_ETL-shaped rows (same generator
+as the stub API), runs them through Pipeline 1's transform and schema
+validation once, then loads the identical records with every requested
+backend × mode combination and reports rows/s:
+
+- backends: sqlite (local stand-in, default), pyodbc, pymssql
+  (the SQL Server backends need DB_SERVER / DB_DATABASE / … configured)
+- modes:    insert, merge (first pass inserts, second pass updates)
+
+Usage:
+    python -m benchmarks.bench_load --rows 100000
+    python -m benchmarks.bench_load --backends sqlite pyodbc pymssql \\
+        --modes merge --chunk-rows 20000 --workers 4
+
+Author: Chef Seasons – Data Engineering Team
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from typing import Any, Dict, List
+
+from benchmarks.bench_memory import _raw_rows
+
+
+def _prepare(rows: int):
+    # imported late: settings may be overridden by the CLI first
+    from etl.etl_pipeline_1 import TABLE_SCHEMA, TRANSFORM_PLAN
+
+    raw = _raw_rows(rows)
+    columns, records = TABLE_SCHEMA.apply(TRANSFORM_PLAN.iter_apply(raw))
+    return columns, records
+
+
+def _run(backend: str, mode: str, columns: List[str], records: List[tuple],
+         chunk_rows: int, workers: int, passes: int) -> List[Dict[str, Any]]:
+    from services.db_service import TABLE_1_NAME, _load_dynamic
+
+    results = []
+    for n in range(1, passes + 1):
+        started = time.perf_counter()
+        counts = _load_dynamic(TABLE_1_NAME, records, columns, mode=mode,
+                               chunk_rows=chunk_rows, workers=workers, backend=backend)
+        elapsed = time.perf_counter() - started
+        results.append({
+            "backend": backend,
+            "mode": mode,
+            "pass": n,
+            "rows": len(records),
+            "inserted": counts["inserted"],
+            "updated": counts["updated"],
+            "seconds": round(elapsed, 3),
+            "rows_per_s": round(len(records) / elapsed) if elapsed else 0,
+        })
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Loader backend benchmark")
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--backends", nargs="+", default=["sqlite"],
+                        choices=["sqlite", "pyodbc", "pymssql"])
+    parser.add_argument("--modes", nargs="+", default=["insert", "merge"], choices=["insert", "merge"])
+    parser.add_argument("--chunk-rows", type=int, default=10000)
+    parser.add_argument("--workers", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    # fresh stand-in databases for every invocation
+    workdir = tempfile.mkdtemp(prefix="bench_load_")
+
+    columns, records = _prepare(args.rows)
+    print(f"Prepared {len(records)} records ({len(columns)} columns)")
+
+    from services.db_backends import get_backend
+    from services.db_service import close_db_pool
+
+    results: List[Dict[str, Any]] = []
+    for backend in args.backends:
+        for mode in args.modes:
+            if backend == "sqlite":
+                # each combination starts from an empty table
+                close_db_pool("sqlite")
+                get_backend("sqlite").path = os.path.join(workdir, f"{mode}.sqlite")
+            # insert mode loads once (a second pass would hit the primary key)
+            passes = 2 if mode == "merge" else 1
+            results.extend(_run(backend, mode, columns, records,
+                                args.chunk_rows, args.workers, passes))
+
+    print(f"{'backend':<9} {'mode':<7} {'pass':>4} {'rows':>8} {'inserted':>9} "
+          f"{'updated':>8} {'s':>8} {'rows/s':>9}")
+    for r in results:
+        print(f"{r['backend']:<9} {r['mode']:<7} {r['pass']:>4} {r['rows']:>8} {r['inserted']:>9} "
+              f"{r['updated']:>8} {r['seconds']:>8} {r['rows_per_s']:>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,389 @@
+"""
+stub_api_server.py
+==================
+
+Local HTTP stand-in for the vendor APIs used by the ETL pipelines.
+
+Serves API 1 and API 2 shaped payloads so that extraction (and whole
+pipelines) can be benchmarked and regression-tested offline.
+
+Features:
+- Synthetic, deterministic data of configurable volume
+    /api1?from=YYYY-MM-DD&to=YYYY-MM-DD         → production records
+    /api2?from=...&to=...&page=N&pageSize=M     → hygiene records (paginated)
+- Injectable latency, 429 (with Retry-After) and 5xx error rates
+- ETag / If-None-Match support (304 responses)
+- Record mode: proxy to the real upstream and save every response
+- Replay mode: serve previously recorded responses from disk
+
+Usage:
+    python -m benchmarks.stub_api_server --port 8765 --api1-per-day 2000 \\
+        --api2-per-day 5000 --latency-ms 40 --error-429 0.02
+
+    # then point the clients at it:
+    API_1_URL=http://127.0.0.1:8765/api1
+    API_2_URL=http://127.0.0.1:8765/api2
+
+Author: Chef Seasons – Data Engineering Team
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qsl, urlsplit
+
+from utils.logger import log
+
+
+# ------------------------------------------------------------
+# SERVER CONFIGURATION
+# ------------------------------------------------------------
+class StubConfig:
+    """Runtime configuration of the stub server."""
+
+    def __init__(self,
+                 api1_per_day: int = 1000,
+                 api2_per_day: int = 2000,
+                 latency_ms: float = 0.0,
+                 error_429_rate: float = 0.0,
+                 error_5xx_rate: float = 0.0,
+                 retry_after_seconds: int = 1,
+                 max_page_size: int = 1000,
+                 seed: int = 42,
+                 mode: str = "synthetic",
+                 recordings_dir: Optional[str] = None,
+                 upstream_api1: Optional[str] = None,
+                 upstream_api2: Optional[str] = None):
+        self.api1_per_day = api1_per_day
+        self.api2_per_day = api2_per_day
+        self.latency_ms = latency_ms
+        self.error_429_rate = error_429_rate
+        self.error_5xx_rate = error_5xx_rate
+        self.retry_after_seconds = retry_after_seconds
+        self.max_page_size = max_page_size
+        self.seed = seed
+        self.mode = mode                      # synthetic | record | replay
+        self.recordings_dir = recordings_dir
+        self.upstream_api1 = upstream_api1
+        self.upstream_api2 = upstream_api2
+
+
+# ------------------------------------------------------------
+# SYNTHETIC DATA
+# ------------------------------------------------------------
+PRODUCTS = [
+    ("URN-1001", "Tavuk Sote"),
+    ("URN-1002", "Mercimek Çorbası"),
+    ("URN-1003", "Izgara Köfte"),
+    ("URN-1004", "Sebzeli Pilav"),
+    ("URN-1005", "Fırın Makarna"),
+]
+CUSTOMERS = ["Chef Seasons", "Otel A", "Hastane B", "Okul C"]
+
+
+def _days(date_from: str, date_to: str) -> List[datetime]:
+    start = datetime.strptime(date_from, "%Y-%m-%d")
+    end = datetime.strptime(date_to, "%Y-%m-%d")
+    return [start + timedelta(days=i) for i in range((end - start).days + 1)]
+
+
+def _day_index(day: datetime) -> int:
+    return (day - datetime(2020, 1, 1)).days
+
+
+def make_api1_record(day: datetime, n: int, per_day: int) -> Dict[str, Any]:
+    """Deterministic Table1_ETL-shaped record."""
+    rid = _day_index(day) * per_day + n + 1
+    rnd = random.Random(rid)
+    code, name = PRODUCTS[rid % len(PRODUCTS)]
+    planned = round(rnd.uniform(100, 1000), 2)
+    produced = round(planned * rnd.uniform(0.8, 1.1), 2)
+    return {
+        "Id": rid,
+        "LineId": rid % 12 + 1,
+        "IsEmriNo": 900000000 + rid,
+        "Tarih": (day + timedelta(minutes=n % 1440)).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "Musteri": CUSTOMERS[rid % len(CUSTOMERS)],
+        "UrunKodu": code,
+        "UrunAdi": name,
+        "PartiNo": f"P-{day:%y%m%d}-{n:05d}",
+        "OdaNo": rid % 8 + 1,
+        "HedefCevrimSure": round(rnd.uniform(20, 60), 2),
+        "HedefKisiSayisi": rnd.randint(2, 10),
+        "UretimBirimMiktar": round(rnd.uniform(0.5, 5), 2),
+        "PlanlananMiktar": planned,
+        "GerceklesenUretimMiktar": produced,
+        "GerceklesenUretimMiktarKhenda": round(produced * rnd.uniform(0.95, 1.05), 2),
+        "GerceklesenUretimMiktarFarki": round(produced - planned, 2),
+        "PlanlananIsGucu": round(rnd.uniform(5, 50), 2),
+        "GerceklesenIsGucuKhenda": round(rnd.uniform(5, 50), 2),
+        "PlanlananBirimIsGucu": round(rnd.uniform(0.1, 2), 3),
+        "GerceklesenBirimIsGucuKhenda": round(rnd.uniform(0.1, 2), 3),
+        "GerceklesenCevrimSure": round(rnd.uniform(20, 60), 2),
+        "GerceklesenCevrimSureKhenda": round(rnd.uniform(20, 60), 2),
+    }
+
+
+def make_api2_record(day: datetime, n: int, per_day: int) -> Dict[str, Any]:
+    """Deterministic khenda_hygiene-shaped record."""
+    rid = _day_index(day) * per_day + n + 1
+    rnd = random.Random(rid)
+    return {
+        "id": rid,
+        "hygieneId": rid % 50 + 1,
+        "datetime": (day + timedelta(seconds=(n * 17) % 86400)).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "valid": rnd.random() > 0.1,
+        "duration": round(rnd.uniform(5, 60), 1),
+    }
+
+
+def synthetic_api1(config: StubConfig, query: Dict[str, str]) -> List[Dict[str, Any]]:
+    today = datetime.today().strftime("%Y-%m-%d")
+    days = _days(query.get("from", today), query.get("to", today))
+    return [make_api1_record(d, n, config.api1_per_day)
+            for d in days for n in range(config.api1_per_day)]
+
+
+def synthetic_api2(config: StubConfig, query: Dict[str, str]) -> List[Dict[str, Any]]:
+    today = datetime.today().strftime("%Y-%m-%d")
+    days = _days(query.get("from", today), query.get("to", today))
+    page = int(query.get("page", 1))
+    page_size = min(int(query.get("pageSize", 200)), config.max_page_size)
+
+    total = len(days) * config.api2_per_day
+    start = (page - 1) * page_size
+    end = min(start + page_size, total)
+
+    rows = []
+    for pos in range(start, end):
+        day = days[pos // config.api2_per_day]
+        rows.append(make_api2_record(day, pos % config.api2_per_day, config.api2_per_day))
+    return rows
+
+
+# ------------------------------------------------------------
+# RECORD / REPLAY STORAGE
+# ------------------------------------------------------------
+def recording_key(path: str, query: Dict[str, str]) -> str:
+    raw = json.dumps([path, sorted(query.items())], separators=(",", ":"))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _recording_path(config: StubConfig, path: str, query: Dict[str, str]) -> str:
+    return os.path.join(config.recordings_dir, recording_key(path, query) + ".json")
+
+
+def save_recording(config: StubConfig, path: str, query: Dict[str, str],
+                   status: int, body: bytes):
+    os.makedirs(config.recordings_dir, exist_ok=True)
+    with open(_recording_path(config, path, query), "w", encoding="utf-8") as f:
+        json.dump({"path": path, "query": query, "status": status,
+                   "body": body.decode("utf-8")}, f)
+
+
+def load_recording(config: StubConfig, path: str,
+                   query: Dict[str, str]) -> Optional[Dict[str, Any]]:
+    try:
+        with open(_recording_path(config, path, query), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except OSError:
+        return None
+
+
+# ------------------------------------------------------------
+# REQUEST HANDLER
+# ------------------------------------------------------------
+class StubHandler(BaseHTTPRequestHandler):
+    """Serves /api1 and /api2 according to the server's StubConfig."""
+
+    server_version = "ChefSeasonsStub/1.0"
+    protocol_version = "HTTP/1.1"   # keep-alive, like the real APIs
+
+    @property
+    def config(self) -> StubConfig:
+        return self.server.stub_config
+
+    def log_message(self, fmt, *args):  # silence default stderr logging
+        pass
+
+    def _send(self, status: int, body: bytes = b"", headers: Optional[Dict[str, str]] = None):
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+        self.server.count(status)
+
+    def _inject_faults(self) -> bool:
+        """Apply latency / error injection. Returns True if a fault was sent."""
+        cfg = self.config
+        if cfg.latency_ms:
+            time.sleep(cfg.latency_ms / 1000.0)
+
+        roll = self.server.random()
+        if roll < cfg.error_429_rate:
+            self._send(429, b'{"error":"throttled"}',
+                       {"Retry-After": str(cfg.retry_after_seconds)})
+            return True
+        if roll < cfg.error_429_rate + cfg.error_5xx_rate:
+            self._send(503, b'{"error":"unavailable"}')
+            return True
+        return False
+
+    def _proxy(self, path: str, query: Dict[str, str]):
+        import requests  # only needed in record mode
+
+        upstream = self.config.upstream_api1 if path == "/api1" else self.config.upstream_api2
+        response = requests.get(
+            upstream,
+            params=query,
+            headers={"Authorization": self.headers.get("Authorization", ""),
+                     "Accept": "application/json"},
+            timeout=60,
+        )
+        save_recording(self.config, path, query, response.status_code, response.content)
+        return response.status_code, response.content
+
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        path = parts.path.rstrip("/")
+        query = dict(parse_qsl(parts.query))
+
+        if path not in ("/api1", "/api2"):
+            self._send(404, b'{"error":"not found"}')
+            return
+
+        if self._inject_faults():
+            return
+
+        mode = self.config.mode
+        if mode == "replay":
+            rec = load_recording(self.config, path, query)
+            if rec is None:
+                self._send(404, b'{"error":"no recording"}')
+                return
+            status, body = rec["status"], rec["body"].encode("utf-8")
+        elif mode == "record":
+            status, body = self._proxy(path, query)
+        else:
+            rows = synthetic_api1(self.config, query) if path == "/api1" \
+                else synthetic_api2(self.config, query)
+            status, body = 200, json.dumps(rows, separators=(",", ":")).encode("utf-8")
+
+        if status != 200:
+            self._send(status, body)
+            return
+
+        etag = '"' + hashlib.md5(body).hexdigest() + '"'
+        if self.headers.get("If-None-Match") == etag:
+            self._send(304, b"", {"ETag": etag})
+            return
+
+        self._send(200, body, {"ETag": etag})
+
+
+class StubServer(ThreadingHTTPServer):
+    """Threading HTTP server carrying config, RNG and request counters."""
+
+    daemon_threads = True
+
+    def __init__(self, address, config: StubConfig):
+        super().__init__(address, StubHandler)
+        self.stub_config = config
+        self._rng = random.Random(config.seed)
+        self._lock = threading.Lock()
+        self.status_counts: Dict[int, int] = {}
+
+    def random(self) -> float:
+        with self._lock:
+            return self._rng.random()
+
+    def count(self, status: int):
+        with self._lock:
+            self.status_counts[status] = self.status_counts.get(status, 0) + 1
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+# ------------------------------------------------------------
+# PROGRAMMATIC START / STOP
+# ------------------------------------------------------------
+def start_stub_server(config: Optional[StubConfig] = None,
+                      host: str = "127.0.0.1", port: int = 0) -> StubServer:
+    """
+    Start the stub server on a background thread.
+
+    Args:
+        config (StubConfig, optional): Server behaviour.
+        host (str): Bind address.
+        port (int): Port (0 → pick a free port).
+
+    Returns:
+        StubServer: Running server; call `.shutdown()` to stop it.
+    """
+    server = StubServer((host, port), config or StubConfig())
+    thread = threading.Thread(target=server.serve_forever, name="stub-api", daemon=True)
+    thread.start()
+    log(f"🧪 [STUB] API stub listening on {server.base_url} (mode={server.stub_config.mode})")
+    return server
+
+
+def _parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Local stub for API 1 / API 2")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--api1-per-day", type=int, default=1000)
+    parser.add_argument("--api2-per-day", type=int, default=2000)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--error-429", type=float, default=0.0, help="429 probability")
+    parser.add_argument("--error-5xx", type=float, default=0.0, help="503 probability")
+    parser.add_argument("--retry-after", type=int, default=1)
+    parser.add_argument("--max-page-size", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--mode", choices=["synthetic", "record", "replay"], default="synthetic")
+    parser.add_argument("--recordings-dir", default=os.path.join("benchmarks", "recordings"))
+    parser.add_argument("--upstream-api1", default=os.getenv("API_1_URL"))
+    parser.add_argument("--upstream-api2", default=os.getenv("API_2_URL"))
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = _parse_args(argv)
+    config = StubConfig(
+        api1_per_day=args.api1_per_day,
+        api2_per_day=args.api2_per_day,
+        latency_ms=args.latency_ms,
+        error_429_rate=args.error_429,
+        error_5xx_rate=args.error_5xx,
+        retry_after_seconds=args.retry_after,
+        max_page_size=args.max_page_size,
+        seed=args.seed,
+        mode=args.mode,
+        recordings_dir=args.recordings_dir,
+        upstream_api1=args.upstream_api1,
+        upstream_api2=args.upstream_api2,
+    )
+    server = StubServer((args.host, args.port), config)
+    log(f"🧪 [STUB] API stub listening on {server.base_url} (mode={config.mode})")
+    log(f"🧪 [STUB] API_1_URL={server.base_url}/api1  API_2_URL={server.base_url}/api2")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        log(f"🧪 [STUB] Stopped. Responses by status: {server.status_counts}")
+
+
+if __name__ == "__main__":
+    main()
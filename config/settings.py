@@ -26,4 +26,102 @@ API_2_TOKEN = os.getenv("API_2_TOKEN")
 DB_SERVER = os.getenv("DB_SERVER")
 DB_DATABASE = os.getenv("DB_DATABASE")
 DB_USERNAME = os.getenv("DB_USERNAME")
-DB_PASSWORD = os.getenv("DB_PASSWORD")
\ No newline at end of file
+DB_PASSWORD = os.getenv("DB_PASSWORD")
+
+
+# ------------------------------------------------------------
+# DATABASE LOADING
+# ------------------------------------------------------------
+# Loader backend (services/db_backends.py): "pyodbc" | "pymssql" | "sqlite"
+DB_BACKEND = os.getenv("DB_BACKEND", "pyodbc").lower()
+DB_ODBC_DRIVER = os.getenv("DB_ODBC_DRIVER", "ODBC Driver 17 for SQL Server")
+DB_SQLITE_PATH = os.getenv("DB_SQLITE_PATH", os.path.join(".state", "standin.sqlite"))
+# INFORMATION_SCHEMA column metadata cache used for pyodbc setinputsizes
+TABLE_METADATA_TTL_SECONDS = float(os.getenv("TABLE_METADATA_TTL_SECONDS", "3600"))
+
+# Connection pool (services/db_pool.py)
+DB_POOL_MIN_SIZE = int(os.getenv("DB_POOL_MIN_SIZE", "1"))
+DB_POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE", "8"))
+DB_POOL_IDLE_SECONDS = float(os.getenv("DB_POOL_IDLE_SECONDS", "600"))
+DB_POOL_CHECKOUT_TIMEOUT = float(os.getenv("DB_POOL_CHECKOUT_TIMEOUT", "30"))
+
+# "merge" → #staging + MERGE upsert on the table key, "insert" → plain INSERT
+LOAD_MODE = os.getenv("LOAD_MODE", "merge").lower()
+LOAD_CHUNK_ROWS = int(os.getenv("LOAD_CHUNK_ROWS", "10000"))   # rows per transaction (0 → whole batch)
+LOAD_WORKERS = int(os.getenv("LOAD_WORKERS", "1"))             # parallel loader connections
+
+
+# ------------------------------------------------------------
+# HTTP RESPONSE CACHE
+# ------------------------------------------------------------
+HTTP_CACHE_ENABLED = os.getenv("HTTP_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+HTTP_CACHE_DIR = os.getenv("HTTP_CACHE_DIR", os.path.join(".cache", "http"))
+
+
+# ------------------------------------------------------------
+# INCREMENTAL EXTRACTION (WATERMARKS)
+# ------------------------------------------------------------
+WATERMARK_DB_PATH = os.getenv("WATERMARK_DB_PATH", os.path.join(".state", "watermarks.sqlite"))
+WATERMARK_LOOKBACK_HOURS = float(os.getenv("WATERMARK_LOOKBACK_HOURS", "2"))
+
+
+# ------------------------------------------------------------
+# ADAPTIVE PAGE SIZING
+# ------------------------------------------------------------
+PAGE_SIZE_STATE_PATH = os.getenv("PAGE_SIZE_STATE_PATH", os.path.join(".state", "page_size.json"))
+
+
+# ------------------------------------------------------------
+# RAW LANDING ZONE
+# ------------------------------------------------------------
+LANDING_ENABLED = os.getenv("LANDING_ENABLED", "true").lower() in ("1", "true", "yes")
+LANDING_DIR = os.getenv("LANDING_DIR", "landing")
+LANDING_RETENTION_DAYS = int(os.getenv("LANDING_RETENTION_DAYS", "14"))
+LANDING_MAX_BYTES = int(os.getenv("LANDING_MAX_BYTES", str(2 * 1024 * 1024 * 1024)))
+# after a transform/load failure, keep landing the rest of the window (opt-in, capped)
+LANDING_DRAIN_ON_FAILURE = os.getenv("LANDING_DRAIN_ON_FAILURE", "false").lower() in ("1", "true", "yes")
+LANDING_DRAIN_MAX_PAGES = int(os.getenv("LANDING_DRAIN_MAX_PAGES", "200"))
+
+
+# ------------------------------------------------------------
+# REJECT QUARANTINE
+# ------------------------------------------------------------
+# Rows failing schema validation are written here (gzip NDJSON) for replay
+QUARANTINE_DIR = os.getenv("QUARANTINE_DIR", "quarantine")
+
+
+# ------------------------------------------------------------
+# TRANSFORM ENGINE
+# ------------------------------------------------------------
+# "python" → etl.common_transforms (list[dict]), "pandas" → etl.dataframe_transforms
+TRANSFORM_ENGINE = os.getenv("TRANSFORM_ENGINE", "python").lower()
+
+
+# ------------------------------------------------------------
+# SCHEMA REGISTRY
+# ------------------------------------------------------------
+SCHEMA_REGISTRY_PATH = os.getenv("SCHEMA_REGISTRY_PATH", os.path.join(".state", "schemas.json"))
+
+
+# ------------------------------------------------------------
+# CHANGE DETECTION (ROW FINGERPRINTS)
+# ------------------------------------------------------------
+CHANGE_DETECTION_ENABLED = os.getenv("CHANGE_DETECTION_ENABLED", "true").lower() in ("1", "true", "yes")
+FINGERPRINT_DB_PATH = os.getenv("FINGERPRINT_DB_PATH", os.path.join(".state", "fingerprints.sqlite"))
+
+
+# ------------------------------------------------------------
+# CHUNKED EXECUTION
+# ------------------------------------------------------------
+# Rows transformed + loaded per chunk (0 → whole window / API page at once)
+CHUNK_ROWS = int(os.getenv("CHUNK_ROWS", "0"))
+
+
+# ------------------------------------------------------------
+# PARALLEL TRANSFORMS
+# ------------------------------------------------------------
+# Worker processes for transforms (0/1 → serial). Batches smaller than
+# PARALLEL_TRANSFORM_MIN_ROWS always run serially.
+TRANSFORM_WORKERS = int(os.getenv("TRANSFORM_WORKERS", "0"))
+PARALLEL_TRANSFORM_MIN_ROWS = int(os.getenv("PARALLEL_TRANSFORM_MIN_ROWS", "50000"))
+PARALLEL_SHARD_ROWS = int(os.getenv("PARALLEL_SHARD_ROWS", "10000"))
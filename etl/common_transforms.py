@@ -9,24 +9,30 @@ functions that ensure consistency across pipelines.
 
 Provided Features:
 ------------------
-- Column name standardization
-- Date normalization (ISO, timestamps → YYYY-MM-DD HH:MM:SS)
+- Column name standardization (mapping cached per schema fingerprint)
+- Date normalization (ISO, timestamps → YYYY-MM-DD HH:MM:SS) on declared
+  or sample-inferred date columns, with a memoized parser
 - Schema validation for required fields
 - Empty row filtering
 - Safe type conversion utilities
 - Null fallback handler
+- Re-chunking of streamed pages into fixed-size row batches
 
 """
 
 from datetime import datetime
-from typing import List, Dict, Any
+from functools import lru_cache
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Sequence, Tuple
+
+from etl.schema_registry import SchemaRegistry, get_schema_registry
 from utils.logger import log
 
 
 # ------------------------------------------------------------
 # COLUMN CLEANING
 # ------------------------------------------------------------
-def clean_column_names(data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+def clean_column_names(data: List[Dict[str, Any]],
+                       registry: Optional[SchemaRegistry] = None) -> List[Dict[str, Any]]:
     """
     Standardizes column names for consistency across ETL pipelines.
 
@@ -34,28 +40,100 @@ def clean_column_names(data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     - Replaces spaces with underscores
     - Strips leading/trailing whitespace
 
+    The raw → clean mapping is computed once per raw key set by the
+    schema registry; pass a source registry to also get drift reports.
+
     Args:
         data (list[dict]): Raw API payload.
+        registry (SchemaRegistry, optional): Registry of the source.
 
     Returns:
         list[dict]: List with normalized column names.
     """
-    cleaned = []
-
-    for row in data:
-        new_row = {
-            str(k).strip().lower().replace(" ", "_"): v
-            for k, v in row.items()
-        }
-        cleaned.append(new_row)
-
-    return cleaned
+    return (registry or get_schema_registry()).remap_rows(data)
 
 
 # ------------------------------------------------------------
 # DATE NORMALIZATION
 # ------------------------------------------------------------
-def normalize_dates(data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+DATE_MEMO_SIZE = 65536        # bounded LRU memo: raw string → normalized string
+DATE_SAMPLE_SIZE = 200        # rows sampled per batch for date column inference
+DATE_DRIFT_THRESHOLD = 0.5    # share of unparseable strings that flags drift
+
+_DATE_TOKENS = ("-", "T", "/")
+_DATE_DRIFT = {"batches": 0, "drift_events": 0, "drifted_columns": set()}
+_DEFERRED_DATE_DRIFT: Optional[List[Tuple[Dict[str, int], Dict[str, int]]]] = None
+
+
+@lru_cache(maxsize=DATE_MEMO_SIZE)
+def normalize_date_string(value: str) -> Optional[str]:
+    """
+    Parse an ISO-like date string once and memoize the result.
+
+    Returns:
+        str | None: `YYYY-MM-DD HH:MM:SS`, or None if not a date.
+    """
+    if not any(token in value for token in _DATE_TOKENS):
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "").replace("/", "-"))
+    except Exception:
+        return None
+    return parsed.strftime("%Y-%m-%d %H:%M:%S")
+
+
+def infer_date_columns(data: List[Dict[str, Any]],
+                       sample_size: int = DATE_SAMPLE_SIZE) -> List[str]:
+    """
+    Infer date columns from a sample of the batch.
+
+    A column is treated as a date column when any sampled string value
+    parses as an ISO-like date. Both the head and the tail of the batch
+    are sampled.
+
+    Args:
+        data (list[dict]): Batch to inspect.
+        sample_size (int): Rows sampled (half from each end).
+
+    Returns:
+        list[str]: Date column names.
+    """
+    half = max(sample_size // 2, 1)
+    sample = data[:half] + data[-half:] if len(data) > sample_size else data
+
+    columns: Dict[str, None] = {}
+    for row in sample:
+        for key, value in row.items():
+            if key in columns or not isinstance(value, str):
+                continue
+            if normalize_date_string(value) is not None:
+                columns[key] = None
+
+    return list(columns)
+
+
+def get_date_parse_stats() -> Dict[str, Any]:
+    """
+    Memo and drift statistics for date normalization.
+
+    Returns:
+        dict: hits, misses, hit_rate, memo size, drift counters.
+    """
+    info = normalize_date_string.cache_info()
+    lookups = info.hits + info.misses
+    return {
+        "hits": info.hits,
+        "misses": info.misses,
+        "hit_rate": round(info.hits / lookups, 3) if lookups else 0.0,
+        "memo_size": info.currsize,
+        "batches": _DATE_DRIFT["batches"],
+        "drift_events": _DATE_DRIFT["drift_events"],
+        "drifted_columns": sorted(_DATE_DRIFT["drifted_columns"]),
+    }
+
+
+def normalize_dates(data: List[Dict[str, Any]],
+                    date_columns: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
     """
     Normalize any ISO-like or timestamp-like strings to a consistent
     datetime format: `YYYY-MM-DD HH:MM:SS`.
@@ -65,26 +143,90 @@ def normalize_dates(data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         - 2025-01-05 12:33:00
         - 2025/01/05 12:33:00
 
+    Only date columns are parsed: either declared by the pipeline via
+    `date_columns`, or inferred once per batch from a sample. Parsing
+    goes through a bounded LRU memo, so repeated timestamps are parsed
+    once. Values that do not parse are left untouched; a declared or
+    inferred column whose strings mostly fail to parse is reported as
+    type drift (values are kept as-is).
+
     Args:
         data (list[dict]): Payload to process.
+        date_columns (list[str], optional): Columns holding dates.
 
     Returns:
         list[dict]: Updated dataset with normalized date fields.
     """
+    if not data:
+        return data
 
-    for row in data:
-        for key, value in row.items():
-            if isinstance(value, str) and any(token in value for token in ["-", "T", "/"]):
-                try:
-                    parsed = datetime.fromisoformat(value.replace("Z", "").replace("/", "-"))
-                    row[key] = parsed.strftime("%Y-%m-%d %H:%M:%S")
-                except Exception:
-                    # ignore fields not parseable as dates
-                    pass
+    columns = list(date_columns) if date_columns is not None else infer_date_columns(data)
+    if not columns:
+        return data
+
+    failures = dict.fromkeys(columns, 0)
+    strings = dict.fromkeys(columns, 0)
 
+    for row in data:
+        for key in columns:
+            value = row.get(key)
+            if not isinstance(value, str):
+                continue
+            strings[key] += 1
+            normalized = normalize_date_string(value)
+            if normalized is None:
+                failures[key] += 1
+            else:
+                row[key] = normalized
+
+    record_date_drift(strings, failures)
     return data
 
 
+def record_date_drift(strings: Dict[str, int], failures: Dict[str, int]):
+    """
+    Register per-column parse results of one batch and report columns
+    whose values mostly stopped being dates (logged once per column).
+
+    In a process with `defer_date_drift`, the results are buffered for
+    `drain_date_drift` instead.
+
+    Args:
+        strings (dict): column → number of string values seen.
+        failures (dict): column → number of values that did not parse.
+    """
+    if _DEFERRED_DATE_DRIFT is not None:
+        _DEFERRED_DATE_DRIFT.append((dict(strings), dict(failures)))
+        return
+
+    _DATE_DRIFT["batches"] += 1
+    for key, seen in strings.items():
+        if seen and failures.get(key, 0) / seen > DATE_DRIFT_THRESHOLD:
+            _DATE_DRIFT["drift_events"] += 1
+            if key not in _DATE_DRIFT["drifted_columns"]:
+                _DATE_DRIFT["drifted_columns"].add(key)
+                log(f"⚠️ Date column '{key}' drifted: {failures[key]}/{seen} "
+                    f"values are not dates; kept as-is.", level="warning")
+
+
+def defer_date_drift():
+    """
+    Buffer per-batch date parse results instead of recording them. Used
+    by parallel transform workers, which ship them back to the parent.
+    """
+    global _DEFERRED_DATE_DRIFT
+    _DEFERRED_DATE_DRIFT = []
+
+
+def drain_date_drift() -> List[Tuple[Dict[str, int], Dict[str, int]]]:
+    """Remove and return buffered (strings, failures) results (see `defer_date_drift`)."""
+    if not _DEFERRED_DATE_DRIFT:
+        return []
+    batches = list(_DEFERRED_DATE_DRIFT)
+    _DEFERRED_DATE_DRIFT.clear()
+    return batches
+
+
 # ------------------------------------------------------------
 # EMPTY ROW FILTERING
 # ------------------------------------------------------------
@@ -194,3 +336,39 @@ def null_to_default(data: List[Dict[str, Any]], defaults: Dict[str, Any]):
                 row[col] = default_val
 
     return data
+
+
+# ------------------------------------------------------------
+# CHUNKING
+# ------------------------------------------------------------
+def rechunk(batches: Iterable[List[Dict[str, Any]]],
+            chunk_rows: int) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Regroup a stream of pages/slices into chunks of `chunk_rows` rows.
+
+    Only one chunk (plus the current source batch) is held at a time,
+    so memory is bounded independent of the total volume.
+
+    Args:
+        batches (iterable[list[dict]]): Source pages or slices.
+        chunk_rows (int): Rows per emitted chunk (> 0).
+
+    Yields:
+        list[dict]: Chunks of exactly `chunk_rows` rows (last may be smaller).
+    """
+    if chunk_rows <= 0:
+        raise ValueError("chunk_rows must be positive")
+
+    buffer: List[Dict[str, Any]] = []
+    for batch in batches:
+        start = 0
+        while start < len(batch):
+            take = chunk_rows - len(buffer)
+            buffer.extend(batch[start:start + take])
+            start += take
+            if len(buffer) == chunk_rows:
+                yield buffer
+                buffer = []
+
+    if buffer:
+        yield buffer
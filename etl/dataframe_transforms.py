@@ -0,0 +1,309 @@
+"""
+dataframe_transforms.py
+=======================
+
+Vectorized, pandas-backed variants of the shared transformation API.
+
+Mirrors `common_transforms` with the same semantics, but operates on a
+DataFrame so that the per-row Python loops are replaced by column-wise
+operations:
+
+- Column names normalized once per frame (not once per row)
+- Empty-row filtering via boolean masks
+- Vectorized ISO date parsing per column
+- Column defaults applied with `fillna`
+- Direct conversion to loader-ready positional tuples (no dict rebuild)
+
+Pipelines select the engine with the TRANSFORM_ENGINE setting
+("python" → common_transforms, "pandas" → this module).
+
+Notes on semantics:
+    Keys missing from some rows become NaN in the frame; they are treated
+    like absent keys (ignored by emptiness checks, exported as None).
+    `standard_transform_df` marks absent *required* keys with
+    `schema_validation.MISSING` instead, so `apply_tuples` rejects those
+    rows exactly like the dict-based engine does.
+
+"""
+
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from etl.schema_registry import SchemaRegistry, clean_key, get_schema_registry
+from etl.schema_validation import MISSING
+from utils.logger import log
+
+
+DATE_TOKENS = ("-", "T", "/")
+
+
+# ------------------------------------------------------------
+# FRAME CONSTRUCTION / EXPORT
+# ------------------------------------------------------------
+def to_frame(data: List[Dict[str, Any]]) -> pd.DataFrame:
+    """
+    Build a DataFrame from a raw API payload (list of dicts).
+
+    Columns are kept as `object` so values round-trip unchanged (ints
+    with missing values are not widened to float, bools stay bools).
+    """
+    return pd.DataFrame(data, dtype=object)
+
+
+def _as_object(df: pd.DataFrame) -> pd.DataFrame:
+    """Object-typed copy with NaN/NaT replaced by None."""
+    obj = df.astype(object)
+    return obj.where(obj.notna(), None)
+
+
+def to_records(df: pd.DataFrame) -> List[Dict[str, Any]]:
+    """Export a frame back to list[dict] (NaN → None)."""
+    return _as_object(df).to_dict(orient="records")
+
+
+def to_tuples(df: pd.DataFrame,
+              columns: Optional[Sequence[str]] = None) -> Tuple[List[str], List[tuple]]:
+    """
+    Export a frame straight to loader-ready positional tuples.
+
+    Args:
+        df (DataFrame): Transformed frame.
+        columns (list[str], optional): Column order (defaults to frame order).
+
+    Returns:
+        tuple[list[str], list[tuple]]: (columns, values) for the loader.
+    """
+    columns = list(columns) if columns is not None else list(df.columns)
+    values = list(_as_object(df[columns]).itertuples(index=False, name=None))
+    return columns, values
+
+
+# ------------------------------------------------------------
+# COLUMN CLEANING
+# ------------------------------------------------------------
+def clean_column_names_df(df: pd.DataFrame,
+                          registry: Optional[SchemaRegistry] = None) -> pd.DataFrame:
+    """
+    Standardize column names once per frame.
+
+    - Converts to lowercase
+    - Replaces spaces with underscores
+    - Strips leading/trailing whitespace
+
+    When two raw names collapse to the same clean name, the last one
+    wins (same as the dict-based implementation). The mapping comes from
+    the schema registry, so drift is reported for source registries.
+    """
+    df = df.copy(deep=False)
+    df.columns = list((registry or get_schema_registry()).mapping_for(tuple(df.columns)))
+
+    if df.columns.has_duplicates:
+        df = df.loc[:, ~df.columns.duplicated(keep="last")]
+
+    return df
+
+
+# ------------------------------------------------------------
+# EMPTY ROW FILTERING
+# ------------------------------------------------------------
+def _empty_mask(df: pd.DataFrame) -> pd.DataFrame:
+    """Boolean frame: True where a cell is None/NaN, "" , [] or {}."""
+    mask = df.isna()
+
+    for col in df.columns:
+        series = df[col]
+        if series.dtype == object or pd.api.types.is_string_dtype(series):
+            mask[col] |= series.eq("").fillna(False).astype(bool)
+            if series.dtype == object:
+                is_container = series.map(type).isin((list, dict))
+                if is_container.any():
+                    mask[col] |= is_container & series.str.len().eq(0).fillna(False).astype(bool)
+
+    return mask
+
+
+def drop_empty_rows_df(df: pd.DataFrame) -> pd.DataFrame:
+    """Remove rows where all values are empty, null or blank."""
+    if df.empty:
+        return df
+    return df.loc[~_empty_mask(df).all(axis=1)].reset_index(drop=True)
+
+
+# ------------------------------------------------------------
+# DATE NORMALIZATION
+# ------------------------------------------------------------
+def _normalize_date_value(value: Any) -> Any:
+    """Scalar fallback identical to common_transforms.normalize_dates."""
+    if isinstance(value, str) and any(token in value for token in DATE_TOKENS):
+        try:
+            parsed = datetime.fromisoformat(value.replace("Z", "").replace("/", "-"))
+            return parsed.strftime("%Y-%m-%d %H:%M:%S")
+        except Exception:
+            return value
+    return value
+
+
+def normalize_dates_df(df: pd.DataFrame,
+                       columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    """
+    Normalize ISO-like date strings to `YYYY-MM-DD HH:MM:SS` per column.
+
+    Each string column is parsed once with a vectorized ISO8601 parser;
+    values that do not parse are left untouched. Columns with mixed
+    time zones (or other parser edge cases) fall back to the scalar
+    implementation.
+
+    Args:
+        df (DataFrame): Frame to process.
+        columns (list[str], optional): Restrict parsing to these columns.
+    """
+    df = df.copy(deep=False)
+    candidates = columns if columns is not None else list(df.columns)
+
+    for col in candidates:
+        if col not in df.columns:
+            continue
+        series = df[col]
+        if not (series.dtype == object or pd.api.types.is_string_dtype(series)):
+            continue
+
+        is_str = series.map(type).eq(str)
+        if not is_str.any():
+            continue
+
+        strings = series[is_str].astype(str)
+        has_token = strings.str.contains("-", regex=False) \
+            | strings.str.contains("T", regex=False) \
+            | strings.str.contains("/", regex=False)
+        if not has_token.any():
+            continue
+
+        raw = strings[has_token]
+        try:
+            parsed = pd.to_datetime(
+                raw.str.replace("Z", "", regex=False).str.replace("/", "-", regex=False),
+                format="ISO8601",
+                errors="coerce",
+            )
+            ok = parsed.notna()
+            formatted = parsed[ok].dt.strftime("%Y-%m-%d %H:%M:%S")
+        except (ValueError, TypeError):
+            formatted = raw.map(_normalize_date_value)
+
+        if len(formatted):
+            series = series.astype(object).copy()
+            series.loc[formatted.index] = formatted.values
+            df[col] = series
+
+    return df
+
+
+# ------------------------------------------------------------
+# NULL FALLBACK HANDLER
+# ------------------------------------------------------------
+def null_to_default_df(df: pd.DataFrame, defaults: Dict[str, Any]) -> pd.DataFrame:
+    """Replace null/empty values per column using `fillna`."""
+    present = {col: val for col, val in defaults.items() if col in df.columns}
+    if not present:
+        return df
+
+    df = df.copy(deep=False)
+    cols = list(present)
+    df[cols] = df[cols].astype(object).mask(df[cols].astype(object).eq(""))
+    return df.fillna(value=present)
+
+
+# ------------------------------------------------------------
+# SCHEMA VALIDATION
+# ------------------------------------------------------------
+def validate_schema_df(df: pd.DataFrame, required_fields: List[str]):
+    """
+    Ensure that required fields exist in the frame.
+
+    Raises:
+        ValueError: If the frame is empty or required fields are missing.
+    """
+    if df.empty:
+        raise ValueError("Schema validation failed: dataset is empty.")
+
+    missing = [col for col in required_fields if col not in df.columns]
+
+    if missing:
+        raise ValueError(
+            f"Schema validation failed: missing required fields → {missing}"
+        )
+
+    log("✔ Schema validated successfully.")
+
+
+# ------------------------------------------------------------
+# MISSING REQUIRED KEYS
+# ------------------------------------------------------------
+def _mark_missing_required(df: pd.DataFrame, data: List[Dict[str, Any]],
+                           raw_columns: Sequence[Any],
+                           required_fields: Sequence[str]) -> pd.DataFrame:
+    """
+    Replace required cells whose key was absent from the raw row with MISSING.
+
+    `df` must still carry the positional index of `data`; `raw_columns`
+    are the frame's column names before cleaning. Only null cells are
+    looked up in the raw rows, so complete batches cost one `isna` per
+    required column.
+    """
+    raw_names: Dict[str, List[Any]] = {}
+    for raw in raw_columns:
+        raw_names.setdefault(clean_key(raw), []).append(raw)
+
+    df = df.copy(deep=False)
+    for key in required_fields:
+        if key not in df.columns:
+            df[key] = pd.Series([MISSING] * len(df), index=df.index, dtype=object)
+            continue
+
+        nulls = df.index[df[key].isna()]
+        sources = raw_names.get(key, ())
+        absent = [i for i in nulls if not any(raw in data[i] for raw in sources)]
+        if absent:
+            series = df[key].astype(object).copy()
+            series.loc[absent] = MISSING
+            df[key] = series
+
+    return df
+
+
+# ------------------------------------------------------------
+# STANDARD CHAIN
+# ------------------------------------------------------------
+def standard_transform_df(data: List[Dict[str, Any]],
+                          required_fields: List[str],
+                          allow_empty: bool = False,
+                          date_columns: Optional[Sequence[str]] = None,
+                          source: Optional[str] = None) -> pd.DataFrame:
+    """
+    clean_column_names → drop_empty_rows → normalize_dates → validate,
+    i.e. the chain both pipelines apply, on a single DataFrame.
+
+    Required keys absent from a row are marked with MISSING (see
+    `_mark_missing_required`) rather than exported as None.
+
+    Args:
+        allow_empty (bool): Return an empty frame instead of failing
+            validation when every row was dropped.
+        date_columns (list[str], optional): Declared date columns
+            (default: every string column is considered).
+        source (str, optional): Source name for schema drift detection.
+    """
+    frame = to_frame(data)
+    df = clean_column_names_df(frame, get_schema_registry(source))
+    if not df.empty:
+        # drop_empty_rows_df, keeping the positions of `data` until marked
+        df = df.loc[~_empty_mask(df).all(axis=1)]
+        df = _mark_missing_required(df, data, frame.columns, required_fields)
+        df = df.reset_index(drop=True)
+    if df.empty and allow_empty:
+        return df
+    df = normalize_dates_df(df, columns=date_columns)
+    validate_schema_df(df, required_fields)
+    return df
@@ -0,0 +1,129 @@
+"""
+deduplication.py
+================
+
+In-batch primary-key deduplication between transform and load.
+
+Overlapping extraction windows and paginated APIs that shift records
+between pages can return the same key more than once in one run; every
+copy would otherwise be sent to SQL Server. The deduplicator:
+
+- Indexes rows by the configured key column with a hash map (one pass,
+  memory bounded by the number of distinct keys)
+- Resolves duplicates with a selectable policy: keep-first, keep-last
+  or newest-by-column
+- Optionally applies the same policy across batches of one run
+  (streamed pages / chunks): keep-first drops keys emitted earlier,
+  keep-last and newest let a superseding later copy through, so the
+  MERGE load overwrites the earlier one
+- Reports how many duplicates were dropped
+
+Works on the positional tuples produced by the schema validator.
+
+Author: Chef Seasons – Data Engineering Team
+"""
+
+from typing import Any, List, Optional, Sequence
+
+from utils.logger import log
+
+
+# ------------------------------------------------------------
+# POLICIES
+# ------------------------------------------------------------
+KEEP_FIRST = "keep_first"
+KEEP_LAST = "keep_last"
+NEWEST = "newest"           # highest value of `order_by` wins (ties → later row)
+
+_POLICIES = (KEEP_FIRST, KEEP_LAST, NEWEST)
+
+
+class Deduplicator:
+    """
+    Key-based deduplicator for positional rows.
+
+    Args:
+        columns (list[str]): Column order of the rows.
+        key (str): Key column (e.g. "id").
+        policy (str): KEEP_FIRST, KEEP_LAST or NEWEST.
+        order_by (str, optional): Column compared by the NEWEST policy.
+        across_batches (bool): Apply the policy across `apply` calls
+            (streamed pages of the same run). KEEP_FIRST drops keys already
+            emitted; KEEP_LAST keeps every later copy and NEWEST every later
+            copy that is not older than the emitted one — both rely on the
+            MERGE load mode to overwrite the earlier row.
+    """
+
+    def __init__(self, columns: Sequence[str], key: str = "id", policy: str = KEEP_LAST,
+                 order_by: Optional[str] = None, across_batches: bool = False):
+        if policy not in _POLICIES:
+            raise ValueError(f"Unknown dedup policy '{policy}' (expected one of {_POLICIES})")
+        if policy == NEWEST and not order_by:
+            raise ValueError("Dedup policy 'newest' requires an order_by column")
+
+        columns = list(columns)
+        self.key = key
+        self.policy = policy
+        self.order_by = order_by
+        self._key_index = columns.index(key)
+        self._order_index = columns.index(order_by) if order_by else None
+        # key → emitted `order_by` value; KEEP_LAST needs no memory (later copies always win)
+        self._emitted = {} if across_batches and policy != KEEP_LAST else None
+        self.dropped = 0
+
+    def apply(self, values: List[tuple]) -> List[tuple]:
+        """Return `values` without duplicate keys (linear time)."""
+        k = self._key_index
+
+        if self.policy == KEEP_FIRST:
+            seen = set()
+            add = seen.add
+            kept = [row for row in values if not (row[k] in seen or add(row[k]))]
+
+        elif self.policy == KEEP_LAST:
+            seen = set()
+            add = seen.add
+            kept = [row for row in reversed(values) if not (row[k] in seen or add(row[k]))]
+            kept.reverse()
+
+        else:
+            o = self._order_index
+            best = {}
+            for row in values:
+                current = best.get(row[k])
+                if current is None or _not_older(row[o], current[o]):
+                    best[row[k]] = row
+            kept = list(best.values())
+
+        emitted = self._emitted
+        if emitted is not None:
+            if self.policy == KEEP_FIRST:
+                kept = [row for row in kept if row[k] not in emitted]
+                emitted.update(dict.fromkeys(row[k] for row in kept))
+            else:
+                o = self._order_index
+                kept = [row for row in kept
+                        if row[k] not in emitted or _not_older(row[o], emitted[row[k]])]
+                emitted.update((row[k], row[o]) for row in kept)
+
+        dropped = len(values) - len(kept)
+        if dropped:
+            self.dropped += dropped
+            log(f"🧹 Dropped {dropped} duplicate rows on '{self.key}' ({self.policy})")
+
+        return kept
+
+
+def _not_older(candidate: Any, current: Any) -> bool:
+    """NULLs sort oldest; otherwise a plain >= comparison."""
+    if candidate is None:
+        return current is None
+    if current is None:
+        return True
+    return candidate >= current
+
+
+def deduplicate_rows(columns: Sequence[str], values: List[tuple], key: str = "id",
+                     policy: str = KEEP_LAST, order_by: Optional[str] = None) -> List[tuple]:
+    """One-shot deduplication of a single batch (see `Deduplicator`)."""
+    return Deduplicator(columns, key=key, policy=policy, order_by=order_by).apply(values)
@@ -9,25 +9,118 @@ This pipeline performs:
     - Pull raw data from API Client 1
     - Filtered by a provided date window (date_from → date_to, last 7 days)
 2. Transformation:
-    - Apply standardized cleaning & validation
+    - Apply standardized cleaning & full-batch typed validation
 3. Loading:
     - Persist processed data into SQL Server via dynamic insert/upsert
 
+Raw payloads are persisted to the landing zone, so a failed run can be
+replayed without the API:
+    python main.py p1 --from-landing <run_id>
+
 Author: Chef Seasons – Data Engineering Team
 """
 
-from services.api_client_1 import fetch_api_1_data
-from services.db_service import insert_into_table_1
-from etl.common_transforms import (
-    clean_column_names,
-    normalize_dates,
-    drop_empty_rows,
-    validate_schema
+from typing import Any, Dict, List, Optional, Tuple
+
+from config.settings import CHUNK_ROWS, LANDING_ENABLED, TRANSFORM_ENGINE
+from services.api_client_1 import fetch_api_1_data, iter_api_1_slices
+from services.db_service import TABLE_1_NAME, insert_into_table_1, iter_table_rows
+from services.fingerprint_store import ChangeDetector, rebuild_fingerprints
+from services.landing_zone import (
+    LandingWriter,
+    drain_to_landing,
+    iter_landing_pages,
+    land_pages
+)
+from services.reject_quarantine import PipelineResult, QuarantineWriter
+from etl.common_transforms import rechunk
+from etl.deduplication import KEEP_LAST, Deduplicator, deduplicate_rows
+from etl.parallel_transform import parallel_transform
+from etl.schema_registry import get_schema_registry
+from etl.schema_validation import TableSchema, check_reject_ratio, compile_schema
+from etl.transform_plan import (
+    CLEAN_COLUMN_NAMES,
+    DROP_EMPTY_ROWS,
+    NORMALIZE_DATES,
+    build_transform_plan
 )
 from utils.logger import log
 
 
-def run_pipeline(date_from: str, date_to: str):
+# Schema fields, API → DB mapping varsayımsal:
+REQUIRED_FIELDS = [
+    "id",
+    "lineid",
+    "isemrino",
+    "tarih",
+    "musteri",
+    "urunkodu",
+    "urunadi",
+    "partino"
+]
+
+# Target columns, mirroring #P1_Staging in sql/upsert_pipeline1.sql (column, SQL type, nullable)
+TABLE_SCHEMA = compile_schema(TableSchema("#P1_Staging", [
+    ("id", "INT", False),
+    ("lineid", "INT", True),
+    ("isemrino", "BIGINT", True),
+    ("tarih", "NVARCHAR(200)", True),
+    ("musteri", "NVARCHAR(200)", True),
+    ("urunkodu", "NVARCHAR(100)", True),
+    ("urunadi", "NVARCHAR(510)", True),
+    ("partino", "NVARCHAR(100)", True),
+    ("odano", "INT", True),
+    ("hedefcevrimsure", "FLOAT", True),
+    ("hedefkisisayisi", "INT", True),
+    ("uretimbirimmiktar", "FLOAT", True),
+    ("planlananmiktar", "FLOAT", True),
+    ("gerceklesenuretimmiktar", "FLOAT", True),
+    ("gerceklesenuretimmiktarkhenda", "FLOAT", True),
+    ("gerceklesenuretimmiktarfarki", "FLOAT", True),
+    ("planlananisgucu", "FLOAT", True),
+    ("gerceklesenisgucukhenda", "FLOAT", True),
+    ("planlananbirimisgucu", "FLOAT", True),
+    ("gerceklesenbirimisgucukhenda", "FLOAT", True),
+    ("gerceklesencevrimsure", "FLOAT", True),
+    ("gerceklesencevrimsurekhenda", "FLOAT", True),
+], required=REQUIRED_FIELDS))
+
+# Watermark / fingerprint key of this pipeline
+PIPELINE_KEY = "pipeline1"
+
+# Duplicate ids (overlapping windows/slices) → the last extracted copy wins,
+# in whole-window and chunked runs alike
+DEDUP_KEY = "id"
+DEDUP_POLICY = KEEP_LAST
+
+# Only these columns carry timestamps; other hyphenated values
+# (product names, batch numbers) are never parsed as dates.
+DATE_COLUMNS = ["tarih"]
+
+# clean_column_names → drop_empty_rows → normalize_dates, fused into one pass
+TRANSFORM_PLAN = build_transform_plan([
+    (CLEAN_COLUMN_NAMES, {"source": "api1"}),
+    DROP_EMPTY_ROWS,
+    (NORMALIZE_DATES, {"columns": DATE_COLUMNS})
+])
+
+
+def _transform(raw_data: List[Dict[str, Any]],
+               allow_empty: bool = False) -> Tuple[List[str], List[tuple]]:
+    """Transform + validate raw rows into (columns, records) with the configured engine."""
+    if TRANSFORM_ENGINE == "pandas":
+        from etl.dataframe_transforms import standard_transform_df, to_tuples  # needs pandas
+
+        frame = standard_transform_df(raw_data, REQUIRED_FIELDS, allow_empty=allow_empty,
+                                      date_columns=DATE_COLUMNS, source="api1")
+        return TABLE_SCHEMA.apply_tuples(*to_tuples(frame), allow_empty=allow_empty)
+
+    # rows stream from the plan into compact records (no intermediate list[dict])
+    return TABLE_SCHEMA.apply(TRANSFORM_PLAN.iter_apply(raw_data), allow_empty=allow_empty)
+
+
+def run_pipeline(date_from: str, date_to: str, from_landing: Optional[str] = None,
+                 chunk_rows: Optional[int] = None):
     """
     Execute ETL Pipeline 1 for a specific date range.
 
@@ -37,24 +130,57 @@ def run_pipeline(date_from: str, date_to: str):
         date_from = "2025-12-01"
         date_to   = "2025-12-07"
 
+    The raw payload is persisted to the landing zone before transforming;
+    with `from_landing`, it is replayed from disk instead of the API.
+
+    With `chunk_rows` > 0 (default: CHUNK_ROWS), the window is streamed
+    slice by slice and transformed/loaded `chunk_rows` rows at a time,
+    so memory stays bounded for arbitrarily long windows.
+
     Args:
         date_from (str): Start date (YYYY-MM-DD)
         date_to (str): End date (YYYY-MM-DD)
+        from_landing (str, optional): Landing run id to replay.
+        chunk_rows (int, optional): Rows per chunk (0 → whole window).
+
+    Rows rejected by schema validation are written to the reject
+    quarantine (services/reject_quarantine.py) instead of being dropped;
+    the run fails when more than MAX_REJECT_RATIO of all its rows were
+    rejected.
 
     Returns:
-        int: Number of rows successfully inserted/updated in SQL Server.
+        PipelineResult: Rows inserted/updated in SQL Server, rows
+        quarantined and the quarantine file (None when nothing was rejected).
 
     Raises:
         RuntimeError: If extraction, transformation or loading fails.
     """
+    if chunk_rows is None:
+        chunk_rows = CHUNK_ROWS
 
     log(f"🚀 [ETL1] Pipeline 1 started for window {date_from} → {date_to}")
+    get_schema_registry("api1").start_run()
+
+    if chunk_rows > 0:
+        return _run_chunked(date_from, date_to, from_landing, chunk_rows)
+
+    quarantine = QuarantineWriter(PIPELINE_KEY)
 
     try:
         # ------------------------------------------------------------
         # 1. EXTRACT
         # ------------------------------------------------------------
-        raw_data = fetch_api_1_data(date_from=date_from, date_to=date_to)
+        if from_landing:
+            log(f"🛬 [ETL1] Replaying landing run {from_landing} (no API calls)")
+            raw_data = [row for page in iter_landing_pages("api1", from_landing) for row in page]
+        else:
+            raw_data = fetch_api_1_data(date_from=date_from, date_to=date_to)
+
+            if LANDING_ENABLED:
+                writer = LandingWriter("api1", date_from, date_to)
+                writer.write_rows(raw_data)
+                writer.close()
+
         log(f"📥 [ETL1] Extracted {len(raw_data)} raw records from API 1")
 
         # ------------------------------------------------------------
@@ -62,39 +188,116 @@ def run_pipeline(date_from: str, date_to: str):
         # ------------------------------------------------------------
         if not raw_data:
             log("⚠️ [ETL1] No data returned from API 1 for this window. Pipeline will end.")
-            return 0
-
-        cleaned = clean_column_names(raw_data)
-        cleaned = drop_empty_rows(cleaned)
-        cleaned = normalize_dates(cleaned)
-
-        # Schema fields, API → DB mapping varsayımsal:
-        validate_schema(
-            cleaned,
-            required_fields=[
-                "id",
-                "lineid",
-                "isemrino",
-                "tarih",
-                "musteri",
-                "urunkodu",
-                "urunadi",
-                "partino"
-            ]
-        )
-
-        log(f"🔧 [ETL1] Transformation phase completed. Total usable rows: {len(cleaned)}")
+            return PipelineResult(0, 0, None)
+
+        columns, cleaned = parallel_transform(_transform, raw_data, TABLE_SCHEMA.record_type,
+                                              source="api1")
+        quarantine.write(TABLE_SCHEMA.drain_rejects(), accepted=len(cleaned))
+        check_reject_ratio(TABLE_SCHEMA.schema.table, quarantine.count, quarantine.validated)
+        cleaned = deduplicate_rows(columns, cleaned, key=DEDUP_KEY, policy=DEDUP_POLICY)
+
+        log(f"🔧 [ETL1] Transformation phase completed ({TRANSFORM_ENGINE} engine). "
+            f"Total usable rows: {len(cleaned)}, {quarantine.count} rejected")
 
         # ------------------------------------------------------------
         # 3. LOAD
         # ------------------------------------------------------------
+        # Unchanged rows (same content hash as the last successful load) are skipped
+        detector = ChangeDetector(PIPELINE_KEY, columns, key=DEDUP_KEY)
+        changed = detector.filter_changed(cleaned)
+        log(f"🔏 [ETL1] {len(changed)} new/changed rows, {len(cleaned) - len(changed)} unchanged skipped")
+
         # Not: Güncelleme davranışı DB tarafında MERGE/UPSERT logic ile sağlanır.
-        inserted_count = insert_into_table_1(cleaned)
+        inserted_count = insert_into_table_1(changed, columns=columns)
+        detector.commit()
         log(f"💾 [ETL1] Successfully inserted/updated approx. {inserted_count} rows into Pipeline 1 target table")
 
         log("✅ [ETL1] Pipeline 1 completed successfully")
-        return inserted_count
+        return quarantine.result(inserted_count)
+
+    except Exception as exc:
+        log(f"❌ [ETL1] Pipeline 1 failed: {exc}", level="error")
+        raise RuntimeError(f"ETL Pipeline 1 failed: {exc}")
+
+    finally:
+        quarantine.close()
+
+
+def _run_chunked(date_from: str, date_to: str, from_landing: Optional[str],
+                 chunk_rows: int) -> PipelineResult:
+    """
+    Chunked execution: slices are streamed from the API (or landing
+    zone), regrouped into `chunk_rows`-row chunks and each chunk is
+    transformed, deduplicated, change-filtered and loaded before the
+    next one is read.
+
+    Duplicates resolve as in the whole-window path — the last copy wins:
+    within a chunk only the last copy is kept, and a copy in a later chunk
+    is loaded again so the MERGE upsert overwrites the earlier one (with
+    LOAD_MODE="insert" such keys would hit the primary key instead).
+    """
+    writer = None
+    slices = None
+    quarantine = QuarantineWriter(PIPELINE_KEY)
+
+    try:
+        if from_landing:
+            log(f"🛬 [ETL1] Replaying landing run {from_landing} (no API calls)")
+            slices = iter_landing_pages("api1", from_landing)
+        else:
+            slices = iter_api_1_slices(date_from, date_to)
+
+            if LANDING_ENABLED:
+                writer = LandingWriter("api1", date_from, date_to)
+                slices = land_pages(slices, writer)
+
+        dedup = Deduplicator(TABLE_SCHEMA.columns, key=DEDUP_KEY, policy=DEDUP_POLICY,
+                             across_batches=True)
+        detector = ChangeDetector(PIPELINE_KEY, TABLE_SCHEMA.columns, key=DEDUP_KEY)
+        total_raw = 0
+        inserted = 0
+
+        for chunk_no, chunk in enumerate(rechunk(slices, chunk_rows), start=1):
+            total_raw += len(chunk)
+            columns, values = parallel_transform(_transform, chunk, TABLE_SCHEMA.record_type,
+                                                 allow_empty=True, source="api1")
+            quarantine.write(TABLE_SCHEMA.drain_rejects(), accepted=len(values))
+            changed = detector.filter_changed(dedup.apply(values))
+            chunk_inserted = insert_into_table_1(changed, columns=columns)
+            detector.commit()
+            inserted += chunk_inserted
+            log(f"🧩 [ETL1] Chunk {chunk_no}: {len(chunk)} raw → {len(values)} valid → "
+                f"{chunk_inserted} loaded (running total {inserted})")
+
+        log(f"📥 [ETL1] Extracted {total_raw} raw records from API 1 in chunks of {chunk_rows}")
+        log(f"🔏 [ETL1] {detector.seen - detector.skipped} new/changed rows, "
+            f"{detector.skipped} unchanged skipped, {dedup.dropped} duplicates dropped, "
+            f"{quarantine.count} rejected")
+        log(f"💾 [ETL1] Successfully inserted/updated approx. {inserted} rows into Pipeline 1 target table")
+
+        # the reject tolerance covers the whole run; loaded chunks stay, the watermark does not move
+        check_reject_ratio(TABLE_SCHEMA.schema.table, quarantine.count, quarantine.validated)
+
+        log("✅ [ETL1] Pipeline 1 completed successfully")
+        return quarantine.result(inserted)
 
     except Exception as exc:
         log(f"❌ [ETL1] Pipeline 1 failed: {exc}", level="error")
+        if writer is not None:
+            drain_to_landing(slices, writer)
         raise RuntimeError(f"ETL Pipeline 1 failed: {exc}")
+
+    finally:
+        quarantine.close()
+
+
+def rebuild_fingerprint_store() -> int:
+    """
+    Rebuild the change-detection store of Pipeline 1 from the target table.
+
+    Returns:
+        int: Number of fingerprints stored.
+    """
+    columns = TABLE_SCHEMA.columns
+    rows = iter_table_rows(TABLE_1_NAME, columns)
+    return rebuild_fingerprints(PIPELINE_KEY, columns, rows, key=DEDUP_KEY)
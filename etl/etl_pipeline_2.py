@@ -6,92 +6,248 @@ Production ETL pipeline for API Source 2.
 
 Responsibilities:
     1. Extraction:
-        - Fetch data from a paginated API endpoint
+        - Stream pages from a paginated API endpoint
         - Filter results by a date window (date_from → date_to)
     2. Transformation:
         - Drop empty/invalid records
         - Normalize date fields
-        - Validate mandatory schema fields
+        - Validate and type-coerce every row against the table schema
     3. Load:
         - Insert processed data into SQL Server target table (khenda_hygiene)
 
+Pages are processed as they arrive (extract → transform → load per page)
+and persisted to the raw landing zone, so a failed run can be replayed:
+    python main.py p2 --from-landing <run_id>
+
 Author: Chef Seasons – Data Engineering Team
 """
 
-from services.api_client_2 import fetch_api_2_data
-from services.db_service import insert_into_table_2
-from etl.common_transforms import (
-    drop_empty_rows,
-    normalize_dates,
-    validate_schema,
-    clean_column_names
+from typing import Any, Dict, List, Optional, Tuple
+
+from config.settings import CHUNK_ROWS, LANDING_ENABLED, TRANSFORM_ENGINE
+from services.api_client_2 import iter_api_2_pages
+from services.db_service import TABLE_2_NAME, insert_into_table_2, iter_table_rows
+from services.fingerprint_store import ChangeDetector, rebuild_fingerprints
+from services.landing_zone import (
+    LandingWriter,
+    drain_to_landing,
+    iter_landing_pages,
+    land_pages
+)
+from services.reject_quarantine import PipelineResult, QuarantineWriter
+from etl.common_transforms import rechunk
+from etl.deduplication import KEEP_FIRST, Deduplicator
+from etl.parallel_transform import parallel_transform
+from etl.schema_registry import get_schema_registry
+from etl.schema_validation import TableSchema, check_reject_ratio, compile_schema
+from etl.transform_plan import (
+    CLEAN_COLUMN_NAMES,
+    DROP_EMPTY_ROWS,
+    NORMALIZE_DATES,
+    build_transform_plan
 )
 from utils.logger import log
 
 
-def run_pipeline(date_from: str, date_to: str):
+# hygiene tablosu için expected schema:
+REQUIRED_FIELDS = [
+    "id",
+    "hygieneid",
+    "datetime",
+    "valid",
+    "duration"
+]
+
+# Target columns, mirroring #P2_Staging in sql/upsert_pipeline2.sql (column, SQL type, nullable)
+TABLE_SCHEMA = compile_schema(TableSchema("#P2_Staging", [
+    ("id", "BIGINT", False),
+    ("hygieneid", "INT", False),
+    ("datetime", "DATETIME", False),
+    ("valid", "BIT", False),
+    ("duration", "FLOAT", False),
+], required=REQUIRED_FIELDS))
+
+# Watermark / fingerprint key of this pipeline
+PIPELINE_KEY = "pipeline2"
+
+# Records shifting between pages show up twice → keep the copy already loaded
+DEDUP_KEY = "id"
+DEDUP_POLICY = KEEP_FIRST
+
+# Only these columns carry timestamps; other hyphenated values
+# (product names, batch numbers) are never parsed as dates.
+DATE_COLUMNS = ["datetime"]
+
+# clean_column_names → drop_empty_rows → normalize_dates, fused into one pass
+TRANSFORM_PLAN = build_transform_plan([
+    (CLEAN_COLUMN_NAMES, {"source": "api2"}),
+    DROP_EMPTY_ROWS,
+    (NORMALIZE_DATES, {"columns": DATE_COLUMNS})
+])
+
+
+def _transform_and_load_page(raw_page: List[Dict[str, Any]], page_no: int,
+                             dedup: Deduplicator, detector: ChangeDetector,
+                             quarantine: QuarantineWriter) -> int:
+    """
+    Transform a single API page and load it into khenda_hygiene.
+
+    Args:
+        raw_page (list[dict]): Raw records of one API page.
+        page_no (int): 1-based page index (for logging).
+        dedup (Deduplicator): Run-wide deduplicator (drops ids already
+            loaded from earlier pages).
+        detector (ChangeDetector): Run-wide change detector (skips rows
+            unchanged since the last successful load).
+        quarantine (QuarantineWriter): Run-wide reject quarantine.
+
+    Returns:
+        int: Number of rows inserted for this page.
+    """
+    columns, values = parallel_transform(_transform, raw_page, TABLE_SCHEMA.record_type,
+                                         allow_empty=True, source="api2")
+    quarantine.write(TABLE_SCHEMA.drain_rejects(), accepted=len(values))
+
+    if not values:
+        log(f"⚠️ [ETL2] Page {page_no} contained no loadable rows. Skipping.")
+        return 0
+
+    return _load_changed(values, columns, dedup, detector)
+
+
+def _transform(raw_page: List[Dict[str, Any]],
+               allow_empty: bool = False) -> Tuple[List[str], List[tuple]]:
+    """Transform + validate raw rows into (columns, records) with the configured engine."""
+    if TRANSFORM_ENGINE == "pandas":
+        from etl.dataframe_transforms import standard_transform_df, to_tuples  # needs pandas
+
+        frame = standard_transform_df(raw_page, REQUIRED_FIELDS, allow_empty=allow_empty,
+                                      date_columns=DATE_COLUMNS, source="api2")
+        return TABLE_SCHEMA.apply_tuples(*to_tuples(frame), allow_empty=allow_empty)
+
+    return TABLE_SCHEMA.apply(TRANSFORM_PLAN.iter_apply(raw_page), allow_empty=allow_empty)
+
+
+def _load_changed(values: List[tuple], columns: List[str],
+                  dedup: Deduplicator, detector: ChangeDetector) -> int:
+    """Dedup → drop unchanged rows → insert → record fingerprints."""
+    changed = detector.filter_changed(dedup.apply(values))
+    inserted = insert_into_table_2(changed, columns=columns)
+    detector.commit()
+    return inserted
+
+
+def run_pipeline(date_from: str, date_to: str, from_landing: Optional[str] = None,
+                 chunk_rows: Optional[int] = None):
     """
     Execute ETL Pipeline 2 for a specific date range.
 
+    Pages are streamed from API 2 and transformed/loaded one at a time,
+    so peak memory is bounded by a single page rather than the whole
+    window. Every extracted page is persisted to the landing zone; with
+    `from_landing`, pages are replayed from disk instead of the API.
+
+    With `chunk_rows` > 0 (default: CHUNK_ROWS), pages are regrouped into
+    fixed-size chunks before transform/load, so memory per step no longer
+    depends on the API page size.
+
     Args:
         date_from (str): Start date (YYYY-MM-DD)
         date_to (str): End date (YYYY-MM-DD)
+        from_landing (str, optional): Landing run id to replay.
+        chunk_rows (int, optional): Rows per chunk (0 → one API page at a time).
+
+    Rows rejected by schema validation are written to the reject
+    quarantine (services/reject_quarantine.py) instead of being dropped;
+    the run fails when more than MAX_REJECT_RATIO of all its rows were
+    rejected.
 
     Returns:
-        int: Number of successfully inserted/updated rows.
+        PipelineResult: Inserted/updated rows, rows quarantined and the
+        quarantine file (None when nothing was rejected).
 
     Raises:
         RuntimeError: For extraction or transformation failures.
     """
 
-    log(f"🚀 [ETL2] Pipeline 2 started for window {date_from} → {date_to}")
+    if chunk_rows is None:
+        chunk_rows = CHUNK_ROWS
 
-    try:
-        # ------------------------------------------------------------
-        # 1. EXTRACT
-        # ------------------------------------------------------------
-        params = {
-            "from": date_from,
-            "to": date_to
-        }
+    log(f"🚀 [ETL2] Pipeline 2 started for window {date_from} → {date_to}")
+    get_schema_registry("api2").start_run()
 
-        raw_data = fetch_api_2_data(params=params)
-        log(f"📥 [ETL2] Extracted {len(raw_data)} raw records from API 2")
+    writer = None
+    pages = None
+    quarantine = QuarantineWriter(PIPELINE_KEY)
 
-        if not raw_data:
-            log("⚠️ [ETL2] No data found from API 2 for this window. Pipeline ending cleanly.")
-            return 0
+    try:
+        if from_landing:
+            log(f"🛬 [ETL2] Replaying landing run {from_landing} (no API calls)")
+            pages = iter_landing_pages("api2", from_landing)
+        else:
+            params = {
+                "from": date_from,
+                "to": date_to
+            }
+            pages = iter_api_2_pages(params=params)
+
+            if LANDING_ENABLED:
+                writer = LandingWriter("api2", date_from, date_to)
+                pages = land_pages(pages, writer)
+
+        total_raw = 0
+        inserted = 0
+        dedup = Deduplicator(TABLE_SCHEMA.columns, key=DEDUP_KEY, policy=DEDUP_POLICY,
+                             across_batches=True)
+        detector = ChangeDetector(PIPELINE_KEY, TABLE_SCHEMA.columns, key=DEDUP_KEY)
 
         # ------------------------------------------------------------
-        # 2. TRANSFORM
+        # EXTRACT → TRANSFORM → LOAD (page by page)
         # ------------------------------------------------------------
-        cleaned = clean_column_names(raw_data)
-        cleaned = drop_empty_rows(cleaned)
-        cleaned = normalize_dates(cleaned)
-
-        # hygiene tablosu için expected schema:
-        validate_schema(
-            cleaned,
-            required_fields=[
-                "id",
-                "hygieneid",
-                "datetime",
-                "valid",
-                "duration"
-            ]
-        )
-
-        log(f"🔧 [ETL2] Transformation completed. Valid rows: {len(cleaned)}")
+        batches, label = (rechunk(pages, chunk_rows), "Chunk") if chunk_rows > 0 else (pages, "Page")
+
+        for page_no, raw_page in enumerate(batches, start=1):
+            total_raw += len(raw_page)
+            page_inserted = _transform_and_load_page(raw_page, page_no, dedup, detector, quarantine)
+            inserted += page_inserted
+            log(f"🔧 [ETL2] {label} {page_no}: {len(raw_page)} raw → {page_inserted} loaded "
+                f"(running total {inserted})")
+
+        log(f"📥 [ETL2] Extracted {total_raw} raw records from API 2")
+        if dedup.dropped:
+            log(f"🧹 [ETL2] Dropped {dedup.dropped} duplicate records across pages")
+        log(f"🔏 [ETL2] {detector.seen - detector.skipped} new/changed rows, "
+            f"{detector.skipped} unchanged skipped, {quarantine.count} rejected")
+
+        if not total_raw:
+            log("⚠️ [ETL2] No data found from API 2 for this window. Pipeline ending cleanly.")
+            return PipelineResult(0, 0, None)
 
-        # ------------------------------------------------------------
-        # 3. LOAD
-        # ------------------------------------------------------------
-        inserted = insert_into_table_2(cleaned)
         log(f"💾 [ETL2] Inserted/updated approx. {inserted} records into khenda_hygiene")
 
+        # the reject tolerance covers the whole run; loaded pages stay, the watermark does not move
+        check_reject_ratio(TABLE_SCHEMA.schema.table, quarantine.count, quarantine.validated)
+
         log("✅ [ETL2] Pipeline 2 completed successfully")
-        return inserted
+        return quarantine.result(inserted)
 
     except Exception as exc:
         log(f"❌ [ETL2] Pipeline 2 failed: {exc}", level="error")
+        if writer is not None:
+            drain_to_landing(pages, writer)
         raise RuntimeError(f"ETL Pipeline 2 failed: {exc}")
+
+    finally:
+        quarantine.close()
+
+
+def rebuild_fingerprint_store() -> int:
+    """
+    Rebuild the change-detection store of Pipeline 2 from khenda_hygiene.
+
+    Returns:
+        int: Number of fingerprints stored.
+    """
+    columns = TABLE_SCHEMA.columns
+    rows = iter_table_rows(TABLE_2_NAME, columns)
+    return rebuild_fingerprints(PIPELINE_KEY, columns, rows, key=DEDUP_KEY)
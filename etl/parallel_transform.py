@@ -0,0 +1,189 @@
+"""
+parallel_transform.py
+=====================
+
+Opt-in process-pool executor for CPU-bound transforms.
+
+The transform chain (rename → drop empty → normalize dates → typed
+validation) is pure Python and runs on one core. For multi-month
+backfills this module:
+
+- Shards the extracted rows into fixed-size chunks
+- Runs the pipeline's transform function on each shard in a
+  `ProcessPoolExecutor` (one pool per process, reused across calls)
+- Ships shards column-oriented — one key tuple per run of rows with the
+  same schema plus value tuples — instead of pickling a dict per row
+- Reassembles the results in the original order as schema records
+- Registers every raw key set with the source's schema registry in the
+  parent (fingerprint + drift check) before shards are dispatched;
+  workers only map keys and never write the registry state file
+- Ships each shard's schema-validation rejects and date-drift results
+  back with its values, so the parent quarantines / records them
+- Falls back to the serial path for small batches (below
+  PARALLEL_TRANSFORM_MIN_ROWS) or when TRANSFORM_WORKERS <= 1, so
+  nightly runs never pay the process start-up cost
+
+Author: Chef Seasons – Data Engineering Team
+"""
+
+import atexit
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from config.settings import (
+    PARALLEL_SHARD_ROWS,
+    PARALLEL_TRANSFORM_MIN_ROWS,
+    TRANSFORM_WORKERS
+)
+from etl.common_transforms import defer_date_drift, drain_date_drift, record_date_drift
+from etl.schema_registry import disable_drift_checks, get_schema_registry
+from etl.schema_validation import drain_rejects, record_rejects
+from utils.logger import log
+
+
+TransformFn = Callable[..., Tuple[List[str], List[tuple]]]
+PackedShard = List[Tuple[Tuple[str, ...], List[tuple]]]
+
+_POOL: Optional[ProcessPoolExecutor] = None
+_POOL_WORKERS = 0
+_POOL_LOCK = threading.Lock()
+
+
+# ------------------------------------------------------------
+# SERIALIZATION
+# ------------------------------------------------------------
+def _pack(rows: List[Dict[str, Any]]) -> PackedShard:
+    """Group consecutive rows sharing a key set into (keys, value tuples) runs."""
+    packed: PackedShard = []
+    keys = None
+    values: List[tuple] = []
+    for row in rows:
+        row_keys = tuple(row)
+        if row_keys != keys:
+            if values:
+                packed.append((keys, values))
+            keys, values = row_keys, []
+        values.append(tuple(row.values()))
+    if values:
+        packed.append((keys, values))
+    return packed
+
+
+def _unpack(packed: PackedShard) -> List[Dict[str, Any]]:
+    return [dict(zip(keys, row)) for keys, values in packed for row in values]
+
+
+def _init_worker():
+    """Worker start-up: shared state stays with the parent process."""
+    disable_drift_checks()
+    defer_date_drift()
+
+
+def _run_shard(transform_fn: TransformFn, packed: PackedShard):
+    """
+    Worker entry point: unpack → transform → plain tuples (records are
+    rebuilt by the parent), plus the rows rejected by schema validation
+    and the buffered date-drift results of the shard.
+    """
+    columns, values = transform_fn(_unpack(packed), allow_empty=True)
+    return columns, [tuple(v) for v in values], drain_rejects(), drain_date_drift()
+
+
+# ------------------------------------------------------------
+# POOL
+# ------------------------------------------------------------
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    global _POOL, _POOL_WORKERS
+    with _POOL_LOCK:
+        if _POOL is None or _POOL_WORKERS != workers:
+            if _POOL is not None:
+                _POOL.shutdown(wait=True)
+            _POOL = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker)
+            _POOL_WORKERS = workers
+            log(f"🧵 [TRANSFORM] Process pool started with {workers} workers")
+        return _POOL
+
+
+def shutdown_pool():
+    """Stop the transform worker processes (called automatically at exit)."""
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is not None:
+            _POOL.shutdown(wait=True)
+            _POOL = None
+
+
+atexit.register(shutdown_pool)
+
+
+# ------------------------------------------------------------
+# PUBLIC API
+# ------------------------------------------------------------
+def parallel_transform(transform_fn: TransformFn,
+                       rows: List[Dict[str, Any]],
+                       record_type: Optional[type] = None,
+                       allow_empty: bool = False,
+                       source: Optional[str] = None,
+                       workers: Optional[int] = None,
+                       shard_rows: Optional[int] = None,
+                       min_rows: Optional[int] = None) -> Tuple[List[str], List[tuple]]:
+    """
+    Run `transform_fn(rows, allow_empty=...)` serially or sharded across
+    worker processes, depending on the batch size.
+
+    Args:
+        transform_fn (callable): Module-level transform returning
+            (columns, records) — must be importable by the workers.
+        rows (list[dict]): Raw rows.
+        record_type (type, optional): Record class to rebuild results with.
+        allow_empty (bool): Passed to the serial transform; in parallel
+            mode an empty overall result raises like the serial path.
+        source (str, optional): Schema-registry source of the rows
+            (e.g. "api1"); its key sets are registered in this process
+            before the shards are dispatched.
+        workers (int, optional): Defaults to TRANSFORM_WORKERS.
+        shard_rows (int, optional): Defaults to PARALLEL_SHARD_ROWS.
+        min_rows (int, optional): Defaults to PARALLEL_TRANSFORM_MIN_ROWS.
+
+    Returns:
+        tuple[list[str], list[tuple]]: (columns, records) in input order.
+    """
+    workers = TRANSFORM_WORKERS if workers is None else workers
+    shard_rows = shard_rows or PARALLEL_SHARD_ROWS
+    min_rows = PARALLEL_TRANSFORM_MIN_ROWS if min_rows is None else min_rows
+
+    if workers <= 1 or len(rows) < max(min_rows, 2 * shard_rows):
+        return transform_fn(rows, allow_empty=allow_empty)
+
+    shards = [_pack(rows[i:i + shard_rows]) for i in range(0, len(rows), shard_rows)]
+    log(f"🧵 [TRANSFORM] {len(rows)} rows → {len(shards)} shards on {workers} workers")
+
+    if source is not None:
+        # fingerprint + drift check of each key set here, in first-seen order
+        registry = get_schema_registry(source)
+        for keys in dict.fromkeys(keys for shard in shards for keys, _ in shard):
+            registry.mapping_for(keys)
+
+    pool = _get_pool(workers)
+    columns: List[str] = []
+    values: List[tuple] = []
+    new_record = tuple.__new__
+
+    # map() yields results in submission order → input order is preserved
+    for shard_columns, shard_values, shard_rejects, shard_date_drift in pool.map(
+            _run_shard, repeat(transform_fn), shards):
+        columns = shard_columns
+        record_rejects(shard_rejects)
+        for strings, failures in shard_date_drift:
+            record_date_drift(strings, failures)
+        if record_type is not None:
+            values.extend(new_record(record_type, v) for v in shard_values)
+        else:
+            values.extend(shard_values)
+
+    if not values and not allow_empty:
+        raise ValueError("Schema validation failed: dataset is empty.")
+
+    return columns, values
@@ -0,0 +1,230 @@
+"""
+schema_registry.py
+==================
+
+Schema fingerprint registry for raw API payloads.
+
+Within a batch — and usually across whole runs — API 1 and API 2 return
+the same key set for every record, so normalizing every key of every row
+is wasted work. The registry:
+
+- Fingerprints the raw key set of incoming rows
+- Computes the raw → clean column-name mapping once per fingerprint and
+  remaps rows through it
+- Persists the known fingerprints per source in a small JSON state file
+- Detects schema drift (added, removed or renamed fields) the first time
+  each key set is seen in a run — including a switch back to a key set
+  seen in an earlier run — and reports it, instead of letting it surface
+  later as an insert failure
+
+Author: Chef Seasons – Data Engineering Team
+"""
+
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from config.settings import SCHEMA_REGISTRY_PATH
+from utils.logger import log
+
+
+# ------------------------------------------------------------
+# CONFIGURABLE PARAMETERS
+# ------------------------------------------------------------
+MAX_SCHEMAS_PER_SOURCE = 50     # oldest fingerprints are forgotten beyond this
+MAX_CACHED_MAPPINGS = 1024      # oldest in-memory key-set mappings are dropped beyond this
+
+_STATE_LOCK = threading.Lock()
+_DRIFT_CHECKS = True            # False in parallel transform workers (see `disable_drift_checks`)
+
+
+def clean_key(key: Any) -> str:
+    """Column-name normalization shared by every transform engine."""
+    return str(key).strip().lower().replace(" ", "_")
+
+
+def fingerprint(raw_keys: Iterable[Any]) -> str:
+    """Stable fingerprint of a raw key set (order-independent)."""
+    joined = "\x1f".join(sorted(str(k) for k in raw_keys))
+    return hashlib.sha1(joined.encode("utf-8")).hexdigest()[:16]
+
+
+def disable_drift_checks():
+    """
+    Make every registry of this process mapping-only. Used by parallel
+    transform workers: the parent registers each key set (fingerprint,
+    drift check, state file) before dispatching shards, so workers never
+    touch the state file.
+    """
+    global _DRIFT_CHECKS
+    _DRIFT_CHECKS = False
+
+
+class SchemaRegistry:
+    """
+    Raw → clean key mapping cache with drift detection for one source.
+
+    With `source=None`, the registry only caches mappings (no state file,
+    no drift reports).
+
+    The mapping cache is cleared by `start_run()`, so a cache miss is the
+    first sighting of a key set in the run and is where drift is checked.
+    """
+
+    def __init__(self, source: Optional[str] = None):
+        self.source = source
+        self._lock = threading.Lock()
+        self._mappings: Dict[Tuple[Any, ...], Tuple[str, ...]] = {}
+        self._seen_this_run: set = set()
+        self.drift_events: List[Dict[str, Any]] = []
+
+    # -----------------------------
+    # REMAPPING
+    # -----------------------------
+    def mapping_for(self, raw_keys: Tuple[Any, ...]) -> Tuple[str, ...]:
+        """Clean names for `raw_keys`, in the same order."""
+        mapping = self._mappings.get(raw_keys)
+        if mapping is None:
+            mapping = self._register(raw_keys)
+        return mapping
+
+    def remap(self, row: Dict[str, Any]) -> Dict[str, Any]:
+        """Return `row` with clean keys (last duplicate wins)."""
+        keys = tuple(row)
+        mapping = self._mappings.get(keys)
+        if mapping is None:
+            mapping = self._register(keys)
+        return dict(zip(mapping, row.values()))
+
+    def remap_rows(self, data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        remap = self.remap
+        return [remap(row) for row in data]
+
+    def _register(self, raw_keys: Tuple[Any, ...]) -> Tuple[str, ...]:
+        mapping = tuple(clean_key(k) for k in raw_keys)
+        with self._lock:
+            if len(self._mappings) >= MAX_CACHED_MAPPINGS:
+                # insertion order: drop the oldest key set
+                self._mappings.pop(next(iter(self._mappings)), None)
+            self._mappings[raw_keys] = mapping
+            if self.source is not None and _DRIFT_CHECKS:
+                fp = fingerprint(raw_keys)
+                if fp not in self._seen_this_run:
+                    self._seen_this_run.add(fp)
+                    self._check_drift(fp, raw_keys)
+        return mapping
+
+    # -----------------------------
+    # DRIFT DETECTION
+    # -----------------------------
+    def start_run(self):
+        """Forget cached mappings and reported fingerprints, so drift is re-checked once per run."""
+        with self._lock:
+            self._mappings.clear()
+            self._seen_this_run.clear()
+            self.drift_events = []
+
+    def _check_drift(self, fp: str, raw_keys: Tuple[Any, ...]):
+        now = datetime.now().isoformat(timespec="seconds")
+
+        with _STATE_LOCK:
+            state = _load_state()
+            source_state = state.setdefault(self.source, {"current": None, "schemas": {}})
+            schemas = source_state["schemas"]
+            previous_fp = source_state.get("current")
+
+            known = fp in schemas
+            if known:
+                schemas[fp]["last_seen"] = now
+            else:
+                schemas[fp] = {
+                    "columns": sorted(str(k) for k in raw_keys),
+                    "first_seen": now,
+                    "last_seen": now,
+                }
+
+            if previous_fp and previous_fp != fp and previous_fp in schemas:
+                before = set(schemas[previous_fp]["columns"])
+                after = set(str(k) for k in raw_keys)
+                event = {
+                    "source": self.source,
+                    "from": previous_fp,
+                    "to": fp,
+                    "added": sorted(after - before),
+                    "removed": sorted(before - after),
+                    "known": known,
+                }
+                self.drift_events.append(event)
+                level = "info" if known else "warning"
+                log(f"🧬 Schema drift on {self.source}: {previous_fp} → {fp} "
+                    f"(added={event['added']}, removed={event['removed']}"
+                    f"{', previously seen' if known else ''})", level=level)
+            elif not previous_fp:
+                log(f"🧬 Schema registered for {self.source}: {fp} ({len(raw_keys)} fields)")
+
+            source_state["current"] = fp
+            _prune(schemas)
+            _save_state(state)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "source": self.source,
+            "cached_mappings": len(self._mappings),
+            "fingerprints_this_run": len(self._seen_this_run),
+            "drift_events": len(self.drift_events),
+        }
+
+
+# ------------------------------------------------------------
+# REGISTRY LOOKUP
+# ------------------------------------------------------------
+_REGISTRIES: Dict[Optional[str], SchemaRegistry] = {}
+_REGISTRIES_LOCK = threading.Lock()
+
+
+def get_schema_registry(source: Optional[str] = None) -> SchemaRegistry:
+    """Process-wide registry for `source` (None → mapping cache only)."""
+    with _REGISTRIES_LOCK:
+        registry = _REGISTRIES.get(source)
+        if registry is None:
+            registry = _REGISTRIES[source] = SchemaRegistry(source)
+        return registry
+
+
+def get_known_schemas(source: str) -> Dict[str, Any]:
+    """Persisted fingerprints for `source` (for inspection / debugging)."""
+    with _STATE_LOCK:
+        return _load_state().get(source, {"current": None, "schemas": {}})
+
+
+# ------------------------------------------------------------
+# STATE FILE
+# ------------------------------------------------------------
+def _prune(schemas: Dict[str, Any]):
+    if len(schemas) <= MAX_SCHEMAS_PER_SOURCE:
+        return
+    by_age = sorted(schemas, key=lambda fp: schemas[fp]["last_seen"])
+    for fp in by_age[:len(schemas) - MAX_SCHEMAS_PER_SOURCE]:
+        del schemas[fp]
+
+
+def _load_state() -> Dict[str, Any]:
+    try:
+        with open(SCHEMA_REGISTRY_PATH, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_state(state: Dict[str, Any]):
+    directory = os.path.dirname(SCHEMA_REGISTRY_PATH)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    # per-process temp file (only the parent process writes; see `disable_drift_checks`)
+    tmp = f"{SCHEMA_REGISTRY_PATH}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp, SCHEMA_REGISTRY_PATH)
@@ -0,0 +1,390 @@
+"""
+schema_validation.py
+====================
+
+Compiled, full-batch schema validation with typed coercion.
+
+`validate_schema` only looks at the keys of the first row, so missing
+or mistyped fields used to surface inside `cursor.executemany`, which
+aborts the whole batch on SQL Server. Table schemas declared here
+mirror the staging tables in `sql/upsert_pipeline*.sql`, and:
+
+- Are compiled once into per-column coercers (built on `safe_int` /
+  `safe_float`) so the per-row loop does no type dispatch
+- Check every row: required keys, NOT NULL, numeric ranges, BIT,
+  DATETIME and NVARCHAR lengths
+- Set invalid rows aside for the reject quarantine instead of letting
+  SQL Server abort the insert; pipelines drain them with `drain_rejects`,
+  write them to services/reject_quarantine.py, so no row is lost
+  silently, and fail the run with `check_reject_ratio` when the whole
+  run's share of rejects exceeds a tolerance
+- Emit compact, tuple-backed records (one generated class per schema,
+  no per-row dict) in table-column order that `_insert_dynamic` sends
+  as-is, without a second conversion pass
+
+Example:
+    schema = compile_schema(TableSchema("#P2_Staging", [
+        ("id", "BIGINT", False),
+        ("datetime", "DATETIME", False),
+    ]))
+    columns, values = schema.apply(cleaned)
+    insert_into_table_2(values, columns=columns)
+
+Author: Chef Seasons – Data Engineering Team
+"""
+
+import math
+import re
+import threading
+from collections import namedtuple
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from etl.common_transforms import normalize_date_string, safe_float, safe_int
+from utils.logger import log
+
+
+# ------------------------------------------------------------
+# CONFIGURABLE PARAMETERS
+# ------------------------------------------------------------
+MAX_REJECT_RATIO = 0.05     # fail the run when more of its rows than this are invalid (see check_reject_ratio)
+REJECT_SAMPLE_SIZE = 5      # invalid rows quoted in logs / errors
+
+_INVALID = object()
+
+
+class _Missing:
+    """Marker for a key absent from the raw row (pickles to the same singleton)."""
+
+    __slots__ = ()
+
+    def __repr__(self):
+        return "MISSING"
+
+    def __reduce__(self):
+        return "MISSING"
+
+
+# Positional cell whose key the source row did not have (see `apply_tuples`)
+MISSING = _Missing()
+_INT_RANGES = {
+    "TINYINT": (0, 255),
+    "SMALLINT": (-2 ** 15, 2 ** 15 - 1),
+    "INT": (-2 ** 31, 2 ** 31 - 1),
+    "BIGINT": (-2 ** 63, 2 ** 63 - 1),
+}
+_TEXT_TYPES = ("NVARCHAR", "VARCHAR", "NCHAR", "CHAR")
+_TYPE_PATTERN = re.compile(r"^\s*(\w+)\s*(?:\(\s*(\w+)\s*\))?\s*$")
+
+ColumnDef = Tuple[str, str, bool]     # (column, SQL type, nullable)
+
+# Rejected rows of accepted batches, per table, until a pipeline drains them
+_REJECTS: Dict[str, List[Dict[str, Any]]] = {}
+_REJECTS_LOCK = threading.Lock()
+
+
+class TableSchema:
+    """
+    Declared column layout of a target table.
+
+    Args:
+        table (str): Table name (for messages).
+        columns (list[tuple]): (column, SQL type, nullable) in table order,
+            e.g. ("urunadi", "NVARCHAR(510)", True).
+        required (list[str], optional): Keys that must be present in every
+            row, even when their value may be NULL.
+    """
+
+    def __init__(self, table: str, columns: Sequence[ColumnDef],
+                 required: Optional[Sequence[str]] = None):
+        self.table = table
+        self.columns = list(columns)
+        self.required = list(required or [])
+
+    @property
+    def column_names(self) -> List[str]:
+        return [name for name, _, _ in self.columns]
+
+
+# ------------------------------------------------------------
+# RECORD TYPES
+# ------------------------------------------------------------
+def make_record_type(schema: TableSchema) -> type:
+    """
+    Generate a compact, tuple-backed record class for a table schema.
+
+    Records have no per-row dict (one tuple of values, attribute access
+    by column name via `_fields`), and since they are tuples, `executemany`
+    sends them as-is.
+    """
+    name = "".join(part.capitalize() for part in re.split(r"[^0-9A-Za-z]+", schema.table) if part)
+    return namedtuple(f"{name or 'Table'}Record", schema.column_names)
+
+
+# ------------------------------------------------------------
+# COERCERS (value → DB-ready value, or _INVALID)
+# ------------------------------------------------------------
+def _make_int(low: int, high: int) -> Callable[[Any], Any]:
+    def coerce(value):
+        if type(value) is not int:
+            if isinstance(value, float):
+                value = int(value) if value.is_integer() else _INVALID
+            else:
+                converted = safe_int(value, _INVALID)
+                if converted is _INVALID:
+                    number = safe_float(value, None)
+                    converted = int(number) if number is not None and number.is_integer() else _INVALID
+                value = converted
+            if value is _INVALID:
+                return value
+        return value if low <= value <= high else _INVALID
+
+    return coerce
+
+
+def _coerce_float(value):
+    if type(value) is not float:
+        value = safe_float(value, _INVALID)
+        if value is _INVALID:
+            return value
+    # SQL Server FLOAT rejects NaN / ±inf
+    return value if math.isfinite(value) else _INVALID
+
+
+def _coerce_bit(value):
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, (int, float)):
+        return bool(value) if value in (0, 1) else _INVALID
+    text = str(value).strip().lower()
+    if text in ("1", "true", "t", "yes"):
+        return True
+    if text in ("0", "false", "f", "no"):
+        return False
+    return _INVALID
+
+
+def _coerce_datetime(value):
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, str):
+        normalized = normalize_date_string(value)
+        return _INVALID if normalized is None else normalized
+    return _INVALID
+
+
+def _make_text(max_length: Optional[int]) -> Callable[[Any], Any]:
+    def coerce(value):
+        if type(value) is not str:
+            if isinstance(value, (dict, list)):
+                return _INVALID
+            value = str(value)
+        if max_length is not None and len(value) > max_length:
+            return _INVALID
+        return value
+
+    return coerce
+
+
+def _compile_column(name: str, sql_type: str) -> Tuple[Callable[[Any], Any], bool]:
+    """Return (coercer, is_text) for a declared SQL type."""
+    match = _TYPE_PATTERN.match(sql_type.upper())
+    if not match:
+        raise ValueError(f"Unsupported SQL type for column '{name}': {sql_type}")
+    base, size = match.groups()
+
+    if base in _INT_RANGES:
+        return _make_int(*_INT_RANGES[base]), False
+    if base in ("FLOAT", "REAL", "DECIMAL", "NUMERIC"):
+        return _coerce_float, False
+    if base == "BIT":
+        return _coerce_bit, False
+    if base in ("DATETIME", "DATETIME2", "DATE", "SMALLDATETIME"):
+        return _coerce_datetime, False
+    if base in _TEXT_TYPES:
+        max_length = None if size in (None, "MAX") else int(size)
+        return _make_text(max_length), True
+
+    raise ValueError(f"Unsupported SQL type for column '{name}': {sql_type}")
+
+
+# ------------------------------------------------------------
+# REJECTS
+# ------------------------------------------------------------
+def record_rejects(entries: Iterable[Dict[str, Any]]):
+    """Add reject entries ({"table", "error", "row"}) to this process's registry."""
+    with _REJECTS_LOCK:
+        for entry in entries:
+            _REJECTS.setdefault(entry["table"], []).append(entry)
+
+
+def drain_rejects(table: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Remove and return the pending rejects of `table` (None → all tables)."""
+    with _REJECTS_LOCK:
+        if table is None:
+            entries = [entry for pending in _REJECTS.values() for entry in pending]
+            _REJECTS.clear()
+            return entries
+        return _REJECTS.pop(table, [])
+
+
+# ------------------------------------------------------------
+# COMPILED SCHEMA
+# ------------------------------------------------------------
+class CompiledSchema:
+    """Validator + coercer for one table schema (see `compile_schema`)."""
+
+    def __init__(self, schema: TableSchema):
+        self.schema = schema
+        self.columns = schema.column_names
+        self.record_type = make_record_type(schema)
+        self._specs = []
+        for name, sql_type, nullable in schema.columns:
+            coerce, is_text = _compile_column(name, sql_type)
+            self._specs.append((name, coerce, nullable, is_text, sql_type))
+        self._required = tuple(schema.required)
+
+    # -----------------------------
+    # PUBLIC API
+    # -----------------------------
+    def apply(self, rows: Iterable[Dict[str, Any]],
+              allow_empty: bool = False) -> Tuple[List[str], List[tuple]]:
+        """
+        Validate and coerce dict rows (any iterable, e.g. a lazy
+        `TransformPlan.iter_apply`).
+
+        Args:
+            rows (iterable[dict]): Transformed rows.
+            allow_empty (bool): Return no records instead of failing when
+                the batch is empty (e.g. a chunk of only empty rows).
+
+        Returns:
+            tuple[list[str], list[tuple]]: (columns, records) for the loader;
+            records are instances of `record_type`. Invalid rows are kept
+            for `drain_rejects`.
+
+        Raises:
+            ValueError: If the batch is empty.
+        """
+        required = self._required
+        names = self.columns
+
+        def extract(row):
+            for key in required:
+                if key not in row:
+                    return None, f"missing required field '{key}'"
+            get = row.get
+            return [get(name) for name in names], None
+
+        return self._run(rows, extract, self._specs, allow_empty, dict)
+
+    def apply_tuples(self, columns: Sequence[str], values: List[tuple],
+                     allow_empty: bool = False) -> Tuple[List[str], List[tuple]]:
+        """
+        Validate and coerce positional tuples laid out as `columns`
+        (e.g. the output of `to_tuples`), re-ordered to table order.
+
+        A required cell holding MISSING (key absent from the source row,
+        see `standard_transform_df`) rejects the row as a missing
+        required field, the same as `apply` does for dict rows.
+        """
+        if not values and allow_empty:
+            return list(self.columns), []
+
+        position = {name: i for i, name in enumerate(columns)}
+        missing = [key for key in self._required if key not in position]
+        if missing:
+            raise ValueError(f"Schema validation failed: missing required fields → {missing}")
+
+        picks = [position.get(name) for name, _, _, _, _ in self._specs]
+        required = [(key, position[key]) for key in self._required]
+
+        def extract(row):
+            for key, i in required:
+                if row[i] is MISSING:
+                    return None, f"missing required field '{key}'"
+            return [row[i] if i is not None else None for i in picks], None
+
+        def as_dict(row):
+            return {name: value for name, value in zip(columns, row) if value is not MISSING}
+
+        return self._run(values, extract, self._specs, allow_empty, as_dict)
+
+    def drain_rejects(self) -> List[Dict[str, Any]]:
+        """Remove and return the rejected rows of this table validated so far."""
+        return drain_rejects(self.schema.table)
+
+    # -----------------------------
+    # CORE LOOP
+    # -----------------------------
+    def _run(self, rows, extract, specs, allow_empty=False,
+             as_dict=dict) -> Tuple[List[str], List[tuple]]:
+        record_type = self.record_type
+        table = self.schema.table
+        new_record = tuple.__new__
+        out = []
+        append = out.append
+        rejects = []
+        samples = []
+        total = 0
+
+        for index, row in enumerate(rows):
+            total += 1
+            raw, error = extract(row)
+            if error is None:
+                coerced = []
+                for value, (name, coerce, nullable, is_text, sql_type) in zip(raw, specs):
+                    if value is None or (value == "" and not is_text):
+                        if not nullable:
+                            error = f"{name} is NULL (NOT NULL column)"
+                            break
+                        coerced.append(None)
+                        continue
+                    result = coerce(value)
+                    if result is _INVALID:
+                        error = f"{name}={value!r} is not a valid {sql_type}"
+                        break
+                    coerced.append(result)
+
+            if error is None:
+                append(new_record(record_type, coerced))
+            else:
+                rejects.append({"table": table, "error": error, "row": as_dict(row)})
+                if len(samples) < REJECT_SAMPLE_SIZE:
+                    samples.append(f"row {index}: {error}")
+
+        if not total:
+            if allow_empty:
+                return list(self.columns), out
+            raise ValueError("Schema validation failed: dataset is empty.")
+
+        if rejects:
+            record_rejects(rejects)
+            log(f"⚠️ Schema validation for {table}: set aside {len(rejects)}/{total} invalid rows "
+                f"for quarantine → {samples}", level="warning")
+
+        log(f"✔ Schema validated for {table}: {len(out)} rows ready.")
+        return list(self.columns), out
+
+
+def compile_schema(schema: TableSchema) -> CompiledSchema:
+    """Compile a declared table schema into a fast full-batch validator."""
+    return CompiledSchema(schema)
+
+
+def check_reject_ratio(table: str, rejected: int, total: int):
+    """
+    Fail a run whose share of invalid rows exceeds MAX_REJECT_RATIO.
+
+    The tolerance applies to the whole run: pipelines pass the totals
+    over all pages, chunks and shards (see `QuarantineWriter.validated`),
+    so one bad page of an otherwise clean run does not fail it.
+
+    Raises:
+        ValueError: If `rejected / total` is above MAX_REJECT_RATIO.
+    """
+    if total and rejected / total > MAX_REJECT_RATIO:
+        raise ValueError(
+            f"Schema validation failed for {table}: {rejected}/{total} rows invalid in this run "
+            f"(tolerance {MAX_REJECT_RATIO:.0%})"
+        )
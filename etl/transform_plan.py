@@ -0,0 +1,225 @@
+"""
+transform_plan.py
+=================
+
+Fused, single-pass transform plans.
+
+Pipelines used to run `clean_column_names` → `drop_empty_rows` →
+`normalize_dates` as three separate passes over the data, each one
+building a new list. A transform plan takes the same ordered list of
+steps and compiles it into one per-row function, so each row is
+renamed, filtered, date-normalized and defaulted in a single traversal.
+
+Output is identical to running the corresponding `common_transforms`
+functions in the declared order, with one exception: NORMALIZE_DATES
+without declared `columns` parses every string value of every row,
+while `normalize_dates(date_columns=None)` only parses the columns it
+infers from a head/tail sample of the batch. Both pipelines declare
+their date columns.
+
+Example:
+    plan = build_transform_plan([
+        (CLEAN_COLUMN_NAMES, {"source": "api1"}),
+        DROP_EMPTY_ROWS,
+        (NORMALIZE_DATES, {"columns": ["tarih"]}),
+        (NULL_TO_DEFAULT, {"defaults": {"odano": 0}}),
+    ])
+    cleaned = plan.apply(raw_data)
+
+"""
+
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from etl.common_transforms import normalize_date_string, record_date_drift
+from etl.schema_registry import get_schema_registry
+from utils.logger import log
+
+
+# ------------------------------------------------------------
+# STEP NAMES
+# ------------------------------------------------------------
+CLEAN_COLUMN_NAMES = "clean_column_names"
+DROP_EMPTY_ROWS = "drop_empty_rows"
+NORMALIZE_DATES = "normalize_dates"
+NULL_TO_DEFAULT = "null_to_default"
+
+Step = Union[str, Tuple[str, Dict[str, Any]]]
+RowOp = Callable[[Dict[str, Any]], Optional[Dict[str, Any]]]
+
+_EMPTY_VALUES = (None, "", [], {})
+
+
+# ------------------------------------------------------------
+# PER-ROW OPERATIONS (same semantics as common_transforms)
+# ------------------------------------------------------------
+def _make_clean_column_names(source: Optional[str] = None) -> RowOp:
+    return get_schema_registry(source).remap
+
+
+def _make_drop_empty_rows() -> RowOp:
+    def drop(row: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        for v in row.values():
+            if v not in _EMPTY_VALUES:
+                return row
+        return None
+
+    return drop
+
+
+class _NormalizeDates:
+    """
+    Per-row date normalization.
+
+    With declared `columns`, only those keys are parsed and per-column
+    drift is reported at the end of each batch. Without columns, every
+    string value is checked (legacy behaviour; unlike `normalize_dates`,
+    no columns are inferred from a sample, since rows are processed one
+    at a time). Both paths use the memoized parser from common_transforms.
+    """
+
+    def __init__(self, columns: Optional[Sequence[str]] = None):
+        self.columns = list(columns) if columns is not None else None
+        self._reset()
+
+    def _reset(self):
+        cols = self.columns or []
+        self._strings = dict.fromkeys(cols, 0)
+        self._failures = dict.fromkeys(cols, 0)
+
+    def __call__(self, row: Dict[str, Any]) -> Dict[str, Any]:
+        if self.columns is None:
+            for key, value in row.items():
+                if isinstance(value, str):
+                    normalized = normalize_date_string(value)
+                    if normalized is not None:
+                        row[key] = normalized
+            return row
+
+        for key in self.columns:
+            value = row.get(key)
+            if isinstance(value, str):
+                self._strings[key] += 1
+                normalized = normalize_date_string(value)
+                if normalized is None:
+                    self._failures[key] += 1
+                else:
+                    row[key] = normalized
+        return row
+
+    def finish(self):
+        if self.columns is not None:
+            record_date_drift(self._strings, self._failures)
+            self._reset()
+
+
+def _make_normalize_dates(columns: Optional[Sequence[str]] = None) -> RowOp:
+    return _NormalizeDates(columns)
+
+
+def _make_null_to_default(defaults: Dict[str, Any]) -> RowOp:
+    items = list(defaults.items())
+
+    def fill(row: Dict[str, Any]) -> Dict[str, Any]:
+        for col, default_val in items:
+            if col in row and (row[col] is None or row[col] == ""):
+                row[col] = default_val
+        return row
+
+    return fill
+
+
+_STEP_FACTORIES: Dict[str, Callable[..., RowOp]] = {
+    CLEAN_COLUMN_NAMES: _make_clean_column_names,
+    DROP_EMPTY_ROWS: _make_drop_empty_rows,
+    NORMALIZE_DATES: _make_normalize_dates,
+    NULL_TO_DEFAULT: _make_null_to_default,
+}
+
+
+# ------------------------------------------------------------
+# PLAN
+# ------------------------------------------------------------
+class TransformPlan:
+    """A compiled sequence of per-row operations applied in one pass."""
+
+    def __init__(self, step_names: List[str], ops: List[RowOp]):
+        self.step_names = step_names
+        self._ops = ops
+        self.row_fn = self._compile(ops)
+
+    @staticmethod
+    def _compile(ops: List[RowOp]) -> RowOp:
+        """Fuse the operations into a single per-row function."""
+        ops = tuple(ops)
+
+        def row_fn(row: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+            for op in ops:
+                row = op(row)
+                if row is None:
+                    return None
+            return row
+
+        return row_fn
+
+    def apply(self, data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Run the plan over a dataset in a single traversal.
+
+        Args:
+            data (list[dict]): Raw payload.
+
+        Returns:
+            list[dict]: Transformed rows (filtered rows removed).
+        """
+        return list(self.iter_apply(data))
+
+    def iter_apply(self, data: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily run the plan, yielding transformed rows one at a time, so a
+        consumer (e.g. the schema validator) never holds the whole
+        intermediate list[dict].
+        """
+        row_fn = self.row_fn
+        for row in data:
+            result = row_fn(row)
+            if result is not None:
+                yield result
+
+        for op in self._ops:
+            finish = getattr(op, "finish", None)
+            if finish is not None:
+                finish()
+
+    def __repr__(self) -> str:
+        return f"TransformPlan({' → '.join(self.step_names)})"
+
+
+def build_transform_plan(steps: Sequence[Step]) -> TransformPlan:
+    """
+    Compile an ordered list of steps into a fused TransformPlan.
+
+    Args:
+        steps (list): Step names (e.g. NORMALIZE_DATES) or
+            (name, kwargs) tuples for parameterized steps
+            (e.g. (NULL_TO_DEFAULT, {"defaults": {...}})).
+
+    Returns:
+        TransformPlan
+
+    Raises:
+        ValueError: If a step name is unknown.
+    """
+    names: List[str] = []
+    ops: List[RowOp] = []
+
+    for step in steps:
+        name, kwargs = (step, {}) if isinstance(step, str) else step
+        factory = _STEP_FACTORIES.get(name)
+        if factory is None:
+            raise ValueError(f"Unknown transform step: {name}")
+        names.append(name)
+        ops.append(factory(**kwargs))
+
+    plan = TransformPlan(names, ops)
+    log(f"🧩 Transform plan compiled: {plan}")
+    return plan
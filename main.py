@@ -6,9 +6,14 @@ Application entry point.
 
 New Behavior:
 - Default behavior: start daily scheduler (runs ETL at 22:00 every day)
-- Manual run:
-    python main.py p1   → run Pipeline 1 once for last 7 days
-    python main.py p2   → run Pipeline 2 once for last 7 days
+- Manual run (incremental from the pipeline's watermark):
+    python main.py p1          → run Pipeline 1 once
+    python main.py p2          → run Pipeline 2 once
+    python main.py p1 --full   → run Pipeline 1 once for last 7 days
+    python main.py p2 --from-landing <run_id>
+                               → replay a landed run (no API calls)
+    python main.py p1 --rebuild-fingerprints
+                               → rebuild change detection from the target table
 
 Author: Chef Seasons – Data Engineering Team
 """
@@ -18,13 +23,24 @@ import time
 
 from services.scheduler import (
     start_scheduler,
-    get_last_7_days_window,
+    run_pipeline_once,
 )
 from etl.etl_pipeline_1 import run_pipeline as run_p1
-from etl.etl_pipeline_1 import run_pipeline as run_p2
+from etl.etl_pipeline_1 import rebuild_fingerprint_store as rebuild_p1_fingerprints
+from etl.etl_pipeline_2 import run_pipeline as run_p2
+from etl.etl_pipeline_2 import rebuild_fingerprint_store as rebuild_p2_fingerprints
+from services.landing_zone import read_manifest
 from utils.logger import log
 
 
+def _replay_from_landing(source: str, run_id: str, run_fn):
+    """Replay a landed run through transform + load."""
+    manifest = read_manifest(source, run_id)
+    log(f" Replay → {source} run {run_id} "
+        f"({manifest['date_from']} → {manifest['date_to']}, {manifest['rows']} rows)")
+    run_fn(manifest["date_from"], manifest["date_to"], from_landing=run_id)
+
+
 def main():
     """
     Main entry point for the ETL system.
@@ -34,26 +50,56 @@ def main():
             → Starts the scheduler (daily at 22:00)
 
         python main.py p1
-            → Manually runs Pipeline 1 once for the last 7 days
+            → Manually runs Pipeline 1 once (watermark → today)
 
         python main.py p2
-            → Manually runs Pipeline 2 once for the last 7 days
+            → Manually runs Pipeline 2 once (watermark → today)
+
+        python main.py p1 --full | python main.py p2 --full
+            → Ignores the watermark and re-pulls the last 7 days
+
+        python main.py p1 --from-landing <run_id> | python main.py p2 --from-landing <run_id>
+            → Replays raw pages from the landing zone through transform
+              and load (no API calls, watermark unchanged)
+
+        python main.py p1 --rebuild-fingerprints | python main.py p2 --rebuild-fingerprints
+            → Rebuilds the row-fingerprint store (change detection)
+              from the pipeline's target table
     """
     log(" ETL Automation System Started")
 
     # Manual pipeline triggers
     if len(sys.argv) > 1:
         arg = sys.argv[1].lower()
-        date_from, date_to = get_last_7_days_window()
+        full_window = "--full" in sys.argv[2:]
+
+        landing_run = None
+        if "--from-landing" in sys.argv[2:]:
+            idx = sys.argv.index("--from-landing")
+            if idx + 1 >= len(sys.argv):
+                log(" --from-landing requires a run id", level="error")
+                return
+            landing_run = sys.argv[idx + 1]
+
+        if arg in ("p1", "p2") and "--rebuild-fingerprints" in sys.argv[2:]:
+            rebuild = rebuild_p1_fingerprints if arg == "p1" else rebuild_p2_fingerprints
+            log(f" Rebuilding fingerprint store → {arg}")
+            rebuild()
+            return
+
+        if arg in ("p1", "p2") and landing_run:
+            source, run_fn = ("api1", run_p1) if arg == "p1" else ("api2", run_p2)
+            _replay_from_landing(source, landing_run, run_fn)
+            return
 
         if arg == "p1":
-            log(f" Manual trigger → Pipeline 1 for {date_from} → {date_to}")
-            run_p1(date_from, date_to)
+            log(" Manual trigger → Pipeline 1")
+            run_pipeline_once("pipeline1", run_p1, full_window=full_window)
             return
 
         if arg == "p2":
-            log(f" Manual trigger → Pipeline 2 for {date_from} → {date_to}")
-            run_p2(date_from, date_to)
+            log(" Manual trigger → Pipeline 2")
+            run_pipeline_once("pipeline2", run_p2, full_window=full_window)
             return
 
         log(f" Unknown argument: {arg}. Starting scheduler instead...")
@@ -3,6 +3,7 @@ Services package initializer.
 
 This package includes:
 - API client modules
+- Shared pooled HTTP transport
 - Database connector
 - Scheduler services
 
@@ -5,10 +5,14 @@ api_client_1.py
 Production-grade API client for Source 1.
 
 This module handles:
-- Authenticated GET requests
+- Authenticated GET requests over a shared pooled session
 - Optional date range filtering (from / to)
-- Retry logic (network failures, 429 & 5xx responses)
+- Per-day (configurable) window splitting fetched in parallel, either
+  merged or streamed slice by slice (memory-bounded)
+- Retry logic (network failures, 429 & 5xx responses) via the shared
+  RetryPolicy (rate limiting, Retry-After, jittered backoff, circuit breaker)
 - Timeout control
+- On-disk response cache with ETag / Last-Modified revalidation
 - Response validation
 - JSON parsing safety
 - Error reporting with structured logging
@@ -17,9 +21,13 @@ Author: Chef Seasons – Data Engineering Team
 """
 
 import requests
-import time
-from typing import List, Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 from config.settings import API_1_URL, API_1_TOKEN
+from services.http_transport import get_session
+from services.response_cache import get_response_cache
+from services.retry_policy import CircuitOpenError, get_policy
 from utils.logger import log
 
 
@@ -28,7 +36,10 @@ from utils.logger import log
 # ------------------------------------------------------------
 TIMEOUT_SECONDS = 15
 MAX_RETRY = 3
-RETRY_DELAY_SECONDS = 2
+RETRY_DELAY_SECONDS = 2  # base delay for exponential backoff
+SPLIT_WINDOW_DAYS = 1     # days per sub-request (0 → single request)
+MAX_PARALLEL_SLICES = 4   # concurrent sub-requests
+SLICE_RETRY_ROUNDS = 1    # extra rounds for slices that still failed
 
 
 # ------------------------------------------------------------
@@ -49,66 +60,77 @@ def _build_headers() -> Dict[str, str]:
 
 
 # ------------------------------------------------------------
-# MAIN API CALL
+# SINGLE WINDOW REQUEST
 # ------------------------------------------------------------
-def fetch_api_1_data(date_from: Optional[str] = None,
-                     date_to: Optional[str] = None) -> List[Dict[str, Any]]:
+def _fetch_window(params: Dict[str, Any]) -> List[Dict[str, Any]]:
     """
-    Fetch data from API Source 1 with retry strategy and optional
-    date range filtering.
-
-    Date Filtering Contract:
-        - If both date_from and date_to are provided, they will be sent
-          as query parameters, typically:
-              ?from=YYYY-MM-DD&to=YYYY-MM-DD
-
-        - Example:
-            fetch_api_1_data("2025-12-01", "2025-12-07")
+    Perform one GET against API 1 for the given query parameters,
+    applying cache lookup and the shared retry policy.
 
     Args:
-        date_from (str, optional): Start date (YYYY-MM-DD)
-        date_to (str, optional): End date (YYYY-MM-DD)
+        params (dict): Query parameters (possibly empty or from/to).
 
     Returns:
         list[dict]: Parsed API response.
 
     Raises:
         RuntimeError: If maximum retry attempts fail.
+        CircuitOpenError: If the API 1 circuit breaker is open.
     """
-
     url = API_1_URL
-    headers = _build_headers()
+    session = get_session("api1", _build_headers())
+    policy = get_policy("api1", base_backoff=RETRY_DELAY_SECONDS)
 
-    params: Dict[str, Any] = {}
-    if date_from and date_to:
-        params["from"] = date_from
-        params["to"] = date_to
+    # ---- RESPONSE CACHE (fresh hit → no request at all) ----
+    cache = get_response_cache()
+    cached = cache.lookup("api1", url, params) if cache else None
+
+    if cached is not None and cached.fresh:
+        cache.record_fresh_hit(cached)
+        data = cached.json()
+        log(f"💽 [API1] Served {len(data)} records from response cache.")
+        return data
+
+    request_headers = cached.conditional_headers() if cached is not None else {}
 
     for attempt in range(1, MAX_RETRY + 1):
         try:
             log(f"🌐 [API1] Attempt {attempt}/{MAX_RETRY} → GET {url} with params {params}")
 
-            response = requests.get(
+            policy.before_request()
+
+            response = session.get(
                 url,
-                headers=headers,
                 params=params,
+                headers=request_headers,
                 timeout=TIMEOUT_SECONDS
             )
 
             # ---- STATUS CODE VALIDATION ----
+            if response.status_code == 304 and cached is not None:
+                policy.record_success()
+                cache.record_not_modified(cached, params)
+                data = cached.json()
+                log(f"💽 [API1] Not modified → served {len(data)} records from cache.")
+                return data
+
             if response.status_code == 200:
+                policy.record_success()
                 try:
                     data = response.json()
                 except Exception:
                     raise RuntimeError("API 1 returned non-JSON response.")
 
+                if cache is not None:
+                    cache.store("api1", url, params, response.content, response.headers)
+
                 log(f"📥 [API1] Successfully fetched {len(data)} records.")
                 return data
 
             # Handle throttling & retryable errors
             if response.status_code in (429, 500, 502, 503, 504):
                 log(f"⚠️ [API1] Retryable error {response.status_code}, waiting...")
-                time.sleep(RETRY_DELAY_SECONDS)
+                policy.retry_wait(attempt, response)
                 continue
 
             # Non-retryable errors
@@ -118,13 +140,227 @@ def fetch_api_1_data(date_from: Optional[str] = None,
 
         except requests.Timeout:
             log("⏳ [API1] Timeout occurred, retrying...")
-            time.sleep(RETRY_DELAY_SECONDS)
+            policy.retry_wait(attempt)
             continue
 
         except requests.RequestException as e:
             log(f"❌ [API1] Network error: {e}, retrying...")
-            time.sleep(RETRY_DELAY_SECONDS)
+            policy.retry_wait(attempt)
             continue
 
+        finally:
+            # never leave a half-open probe slot taken (e.g. after a 4xx)
+            policy.release_probe()
+
     # Final failure after all retries
-    raise RuntimeError("API 1: Maximum retry attempts exceeded.")
\ No newline at end of file
+    raise RuntimeError(f"API 1: Maximum retry attempts exceeded for params {params}.")
+
+
+# ------------------------------------------------------------
+# WINDOW SPLITTING
+# ------------------------------------------------------------
+def split_date_window(date_from: str, date_to: str,
+                      days_per_slice: int) -> List[Tuple[str, str]]:
+    """
+    Split an inclusive date range into consecutive sub-windows.
+
+    Example:
+        split_date_window("2025-12-01", "2025-12-05", 2)
+        → [("2025-12-01", "2025-12-02"),
+           ("2025-12-03", "2025-12-04"),
+           ("2025-12-05", "2025-12-05")]
+
+    Args:
+        date_from (str): Start date (YYYY-MM-DD), inclusive.
+        date_to (str): End date (YYYY-MM-DD), inclusive.
+        days_per_slice (int): Number of days per sub-window.
+
+    Returns:
+        list[tuple[str, str]]: Sub-windows in date order.
+    """
+    start = datetime.strptime(date_from, "%Y-%m-%d").date()
+    end = datetime.strptime(date_to, "%Y-%m-%d").date()
+
+    if end < start:
+        raise ValueError(f"Invalid date window: {date_from} → {date_to}")
+
+    slices = []
+    current = start
+    while current <= end:
+        slice_end = min(current + timedelta(days=days_per_slice - 1), end)
+        slices.append((current.strftime("%Y-%m-%d"), slice_end.strftime("%Y-%m-%d")))
+        current = slice_end + timedelta(days=1)
+
+    return slices
+
+
+def _fetch_split_window(date_from: str, date_to: str,
+                        days_per_slice: int,
+                        max_workers: int) -> List[Dict[str, Any]]:
+    """
+    Fetch a date range as parallel sub-window requests.
+
+    Each slice has its own retry loop. Slices that still fail are
+    retried again (only those slices) for up to SLICE_RETRY_ROUNDS extra
+    rounds. Results are merged in date order.
+    """
+    slices = split_date_window(date_from, date_to, days_per_slice)
+    results: Dict[int, List[Dict[str, Any]]] = {}
+    pending = list(range(len(slices)))
+
+    log(f"✂️ [API1] Window {date_from} → {date_to} split into {len(slices)} "
+        f"slice(s) of {days_per_slice} day(s), {max_workers} in parallel")
+
+    for round_no in range(SLICE_RETRY_ROUNDS + 1):
+        if round_no:
+            log(f"🔁 [API1] Retrying {len(pending)} failed slice(s), round {round_no}")
+
+        failed: Dict[int, Exception] = {}
+
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(pending)),
+                                thread_name_prefix="api1-slice") as pool:
+            futures = {
+                idx: pool.submit(_fetch_window, {"from": slices[idx][0], "to": slices[idx][1]})
+                for idx in pending
+            }
+            for idx, future in futures.items():
+                try:
+                    results[idx] = future.result()
+                except CircuitOpenError:
+                    raise
+                except RuntimeError as exc:
+                    log(f"⚠️ [API1] Slice {slices[idx][0]} → {slices[idx][1]} failed: {exc}",
+                        level="warning")
+                    failed[idx] = exc
+
+        if not failed:
+            break
+        pending = sorted(failed)
+    else:
+        failed_windows = [f"{slices[i][0]}→{slices[i][1]}" for i in pending]
+        raise RuntimeError(f"API 1: slices failed after retries: {failed_windows}")
+
+    merged: List[Dict[str, Any]] = []
+    for idx in range(len(slices)):
+        merged.extend(results[idx])
+
+    log(f"📥 [API1] Merged {len(merged)} records from {len(slices)} slice(s).")
+    return merged
+
+
+def iter_api_1_slices(date_from: Optional[str] = None,
+                      date_to: Optional[str] = None,
+                      days_per_slice: Optional[int] = None,
+                      max_workers: Optional[int] = None) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Stream a date range slice by slice, in date order.
+
+    At most `max_workers` slices are fetched ahead of the consumer, so
+    memory is bounded by a few slices regardless of the window length.
+    A failed slice is retried on its own for up to SLICE_RETRY_ROUNDS
+    extra attempts before the stream fails.
+
+    Yields:
+        list[dict]: Records of one slice.
+    """
+    if days_per_slice is None:
+        days_per_slice = SPLIT_WINDOW_DAYS
+    if max_workers is None:
+        max_workers = MAX_PARALLEL_SLICES
+
+    if not (date_from and date_to) or days_per_slice <= 0:
+        yield fetch_api_1_data(date_from, date_to, days_per_slice=0)
+        return
+
+    slices = split_date_window(date_from, date_to, days_per_slice)
+    max_workers = max(max_workers, 1)
+
+    log(f"✂️ [API1] Streaming {date_from} → {date_to} as {len(slices)} slice(s), "
+        f"{max_workers} fetched ahead")
+
+    def fetch(idx: int) -> List[Dict[str, Any]]:
+        return _fetch_window({"from": slices[idx][0], "to": slices[idx][1]})
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="api1-slice") as pool:
+        in_flight: Dict[int, Any] = {}
+        next_idx = 0
+        try:
+            for idx in range(len(slices)):
+                while next_idx < len(slices) and len(in_flight) < max_workers:
+                    in_flight[next_idx] = pool.submit(fetch, next_idx)
+                    next_idx += 1
+
+                future = in_flight.pop(idx)
+                for round_no in range(SLICE_RETRY_ROUNDS + 1):
+                    try:
+                        rows = future.result() if round_no == 0 else fetch(idx)
+                        break
+                    except CircuitOpenError:
+                        raise
+                    except RuntimeError as exc:
+                        log(f"⚠️ [API1] Slice {slices[idx][0]} → {slices[idx][1]} failed: {exc}",
+                            level="warning")
+                else:
+                    raise RuntimeError(
+                        f"API 1: slice {slices[idx][0]}→{slices[idx][1]} failed after retries"
+                    )
+
+                yield rows
+        finally:
+            for pending in in_flight.values():
+                pending.cancel()
+
+
+# ------------------------------------------------------------
+# MAIN API CALL
+# ------------------------------------------------------------
+def fetch_api_1_data(date_from: Optional[str] = None,
+                     date_to: Optional[str] = None,
+                     days_per_slice: Optional[int] = None,
+                     max_workers: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Fetch data from API Source 1 with retry strategy and optional
+    date range filtering.
+
+    Date Filtering Contract:
+        - If both date_from and date_to are provided, they will be sent
+          as query parameters, typically:
+              ?from=YYYY-MM-DD&to=YYYY-MM-DD
+
+        - Example:
+            fetch_api_1_data("2025-12-01", "2025-12-07")
+
+    Window Splitting:
+        - When a date range is given and `days_per_slice` > 0, the range
+          is split into sub-windows (default: one day each) that are
+          fetched concurrently and merged in date order. Only failed
+          slices are retried. Works for arbitrarily long backfills.
+        - `days_per_slice=0` sends the whole range as a single request.
+
+    Args:
+        date_from (str, optional): Start date (YYYY-MM-DD)
+        date_to (str, optional): End date (YYYY-MM-DD)
+        days_per_slice (int, optional): Days per sub-request.
+            Defaults to SPLIT_WINDOW_DAYS.
+        max_workers (int, optional): Parallel sub-requests.
+            Defaults to MAX_PARALLEL_SLICES.
+
+    Returns:
+        list[dict]: Parsed API response.
+
+    Raises:
+        RuntimeError: If maximum retry attempts fail.
+        CircuitOpenError: If the API 1 circuit breaker is open.
+    """
+    if not (date_from and date_to):
+        return _fetch_window({})
+
+    if days_per_slice is None:
+        days_per_slice = SPLIT_WINDOW_DAYS
+    if max_workers is None:
+        max_workers = MAX_PARALLEL_SLICES
+
+    if days_per_slice <= 0:
+        return _fetch_window({"from": date_from, "to": date_to})
+
+    return _fetch_split_window(date_from, date_to, days_per_slice, max(max_workers, 1))
@@ -6,9 +6,15 @@ Production-grade API client for Source 2.
 
 Features:
 - Pagination support (page=1,2,3...)
+- Shared pooled session (keep-alive, gzip) via http_transport
+- Bounded-concurrency page fetching (ordered results)
+- Streaming page iterator (iter_api_2_pages)
+- Adaptive pageSize (latency / payload / timeout driven, remembered per source)
 - Date range filtering: ?from=YYYY-MM-DD&to=YYYY-MM-DD
-- Retry mechanism for network/5xx errors
+- Retry mechanism for network/429/5xx errors via the shared RetryPolicy
+  (rate limiting, Retry-After, jittered backoff, circuit breaker)
 - Timeout protection
+- On-disk response cache with ETag / Last-Modified revalidation
 - Structured logging
 - JSON parsing validation
 
@@ -17,8 +23,13 @@ Author: Chef Seasons – Data Engineering Team
 
 import requests
 import time
-from typing import Dict, List, Any, Optional
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Any, Optional, Iterator
 from config.settings import API_2_URL, API_2_TOKEN
+from services.http_transport import get_session
+from services.page_size_controller import PageSizeController
+from services.response_cache import get_response_cache
+from services.retry_policy import get_policy
 from utils.logger import log
 
 
@@ -27,8 +38,12 @@ from utils.logger import log
 # -----------------------------
 TIMEOUT_SECONDS = 15
 MAX_RETRY = 3
-RETRY_DELAY_SECONDS = 2
-PAGE_SIZE = 200  # API limitine göre ayarlanabilir
+RETRY_DELAY_SECONDS = 2  # base delay for exponential backoff
+PAGE_SIZE = 200  # başlangıç değeri; adaptif modda öğrenilen değer kullanılır
+MIN_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 1000  # API'nin izin verdiği üst sınır
+ADAPTIVE_PAGE_SIZE = True
+MAX_PAGES_IN_FLIGHT = 4  # 1 → sıralı (eski) sayfalama
 
 
 # -----------------------------
@@ -42,10 +57,269 @@ def _build_headers() -> Dict[str, str]:
     }
 
 
+# -----------------------------
+# SINGLE PAGE FETCH (RETRY LOOP)
+# -----------------------------
+def _fetch_page(session: requests.Session,
+                params: Dict[str, Any],
+                page: int,
+                controller: Optional[PageSizeController] = None) -> List[Dict[str, Any]]:
+    """
+    Fetch a single page from API 2, applying the standard retry policy.
+
+    Args:
+        session (requests.Session): Shared pooled API 2 session.
+        params (dict): Base query parameters (date window, pageSize).
+        page (int): 1-based page number to request.
+        controller (PageSizeController, optional): Receives latency,
+            bytes and timeout observations.
+
+    Returns:
+        list[dict]: Records on the requested page (empty → no more data).
+
+    Raises:
+        RuntimeError: On non-retryable errors or exhausted retries.
+        CircuitOpenError: If the API 2 circuit breaker is open.
+    """
+    policy = get_policy("api2", base_backoff=RETRY_DELAY_SECONDS)
+    page_params = dict(params)
+    page_params["page"] = page
+
+    # RESPONSE CACHE (fresh hit → no request at all)
+    cache = get_response_cache()
+    cached = cache.lookup("api2", API_2_URL, page_params) if cache else None
+
+    if cached is not None and cached.fresh:
+        cache.record_fresh_hit(cached)
+        data = cached.json()
+        log(f"💽 [API2] Page {page} served from response cache ({len(data)} records).")
+        return data
+
+    request_headers = cached.conditional_headers() if cached is not None else {}
+
+    for attempt in range(1, MAX_RETRY + 1):
+        try:
+            log(f"🌐 [API2] Fetching page {page} with params {page_params}")
+
+            policy.before_request()
+
+            started = time.perf_counter()
+            response = session.get(
+                API_2_URL,
+                params=page_params,
+                headers=request_headers,
+                timeout=TIMEOUT_SECONDS
+            )
+            latency = time.perf_counter() - started
+
+            # NOT MODIFIED → serve from disk
+            if response.status_code == 304 and cached is not None:
+                policy.record_success()
+                cache.record_not_modified(cached, page_params)
+                data = cached.json()
+                log(f"💽 [API2] Page {page} not modified → served from cache ({len(data)} records).")
+                return data
+
+            # SUCCESS
+            if response.status_code == 200:
+                policy.record_success()
+                try:
+                    data = response.json()
+                except Exception:
+                    raise RuntimeError("API 2 returned invalid JSON")
+
+                if cache is not None:
+                    cache.store("api2", API_2_URL, page_params, response.content, response.headers)
+
+                if controller is not None:
+                    controller.observe(page_params["pageSize"], latency,
+                                       len(response.content), len(data))
+
+                log(f"📥 [API2] Page {page} returned {len(data)} records.")
+                return data
+
+            # RETRYABLE ERRORS
+            if response.status_code in (429, 500, 502, 503, 504):
+                log(f"⚠️ [API2] Retryable error {response.status_code}, waiting and retrying...")
+                policy.retry_wait(attempt, response)
+                continue
+
+            # NON-RETRYABLE
+            raise RuntimeError(f"API 2 failed with HTTP {response.status_code}: {response.text}")
+
+        except requests.Timeout:
+            log(f"⏳ [API2] Timeout on page {page}, retrying...")
+            if controller is not None:
+                controller.observe_timeout(page_params["pageSize"])
+            policy.retry_wait(attempt)
+            continue
+
+        except requests.RequestException as e:
+            log(f"❌ [API2] Network error: {e}, retrying...")
+            policy.retry_wait(attempt)
+            continue
+
+        finally:
+            # never leave a half-open probe slot taken (e.g. after a 4xx)
+            policy.release_probe()
+
+    # retry loop exhausted
+    raise RuntimeError(f"API 2: Maximum retry attempts exceeded on page {page}")
+
+
+# -----------------------------
+# PAGINATION STRATEGIES
+# -----------------------------
+def _iter_pages_sequential(session: requests.Session,
+                           params: Dict[str, Any],
+                           controller: Optional[PageSizeController] = None
+                           ) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Request pages one by one until the API returns an empty page,
+    yielding each non-empty page as soon as it arrives.
+
+    With a controller, `pageSize` may change between pages. The row
+    offset is tracked so that each request maps to the correct page
+    number for its size (sizes move along a doubling ladder).
+    """
+    offset = 0
+    page_size = params["pageSize"]
+
+    while True:
+        if controller is not None:
+            page_size = controller.size_for_offset(offset)
+
+        page_params = dict(params)
+        page_params["pageSize"] = page_size
+        page = offset // page_size + 1
+
+        data = _fetch_page(session, page_params, page, controller)
+
+        if not data:
+            log("📘 [API2] No more pages. Pagination completed.")
+            if controller is not None:
+                controller.save()
+            return
+
+        yield data
+        offset += page_size
+
+
+def _iter_pages_concurrent(session: requests.Session,
+                           params: Dict[str, Any],
+                           max_in_flight: int,
+                           controller: Optional[PageSizeController] = None
+                           ) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Request pages on a bounded worker pool, keeping at most
+    `max_in_flight` pages outstanding at any time.
+
+    Pages are yielded strictly in row-offset order, so the stream matches
+    the sequential strategy. As soon as an empty page is seen, no new
+    pages are scheduled and any speculative requests beyond it are
+    cancelled or discarded. Over-fetch is therefore bounded by
+    `max_in_flight - 1` pages. Closing the generator early cancels
+    outstanding requests.
+
+    With a controller, the size of every newly scheduled page is taken
+    from the controller at its row offset (same ladder alignment as the
+    sequential path), so `pageSize` adapts during the run; pages already
+    in flight keep the size they were requested with.
+    """
+    futures: Dict[int, Future] = {}
+    fixed_size = params["pageSize"]
+
+    with ThreadPoolExecutor(max_workers=max_in_flight,
+                            thread_name_prefix="api2-page") as pool:
+        next_offset = 0
+        submitted = 0
+
+        def submit():
+            nonlocal next_offset, submitted
+            page_size = controller.size_for_offset(next_offset) if controller is not None else fixed_size
+            page_params = dict(params)
+            page_params["pageSize"] = page_size
+            page_no = next_offset // page_size + 1
+            futures[submitted] = pool.submit(_fetch_page, session, page_params, page_no, controller)
+            next_offset += page_size
+            submitted += 1
+
+        for _ in range(max_in_flight):
+            submit()
+
+        seq = 0
+        try:
+            while True:
+                data = futures.pop(seq).result()
+
+                if not data:
+                    log("📘 [API2] No more pages. Pagination completed.")
+                    if controller is not None:
+                        controller.save()
+                    return
+
+                # keep the window full before handing the page downstream
+                submit()
+
+                yield data
+                seq += 1
+        finally:
+            for future in futures.values():
+                future.cancel()
+
+
+# -----------------------------
+# STREAMING API
+# -----------------------------
+def iter_api_2_pages(params: Optional[Dict[str, Any]] = None,
+                     max_in_flight: Optional[int] = None) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Stream API 2 data page by page.
+
+    Each decoded page is yielded as soon as it is available (in page
+    order), so callers can transform and load incrementally instead of
+    holding the whole window in memory.
+
+    Example:
+        for page in iter_api_2_pages({"from": "2025-12-01", "to": "2025-12-07"}):
+            process(page)
+
+    Args:
+        params (dict, optional): Query parameters (date window etc.).
+        max_in_flight (int, optional): Number of pages requested in
+            parallel. Defaults to MAX_PAGES_IN_FLIGHT; 1 → sequential.
+
+    Yields:
+        list[dict]: Records of one non-empty page.
+
+    Raises:
+        RuntimeError: On repeated failures.
+    """
+
+    session = get_session("api2", _build_headers())
+
+    controller = None
+    if ADAPTIVE_PAGE_SIZE:
+        controller = PageSizeController("api2", PAGE_SIZE, MIN_PAGE_SIZE, MAX_PAGE_SIZE)
+
+    params = params.copy() if params else {}
+    params["pageSize"] = controller.page_size if controller is not None else PAGE_SIZE
+
+    if max_in_flight is None:
+        max_in_flight = MAX_PAGES_IN_FLIGHT
+
+    if max_in_flight <= 1:
+        return _iter_pages_sequential(session, params, controller)
+
+    log(f"⚡ [API2] Concurrent pagination enabled → {max_in_flight} pages in flight")
+    return _iter_pages_concurrent(session, params, max_in_flight, controller)
+
+
 # -----------------------------
 # MAIN FETCH FUNCTION
 # -----------------------------
-def fetch_api_2_data(params: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+def fetch_api_2_data(params: Optional[Dict[str, Any]] = None,
+                     max_in_flight: Optional[int] = None) -> List[Dict[str, Any]]:
     """
     Fetch data from API 2 with pagination and date filtering.
 
@@ -58,6 +332,12 @@ def fetch_api_2_data(params: Optional[Dict[str, Any]] = None) -> List[Dict[str,
     Behavior:
         - Keeps requesting pages until API returns empty list.
         - Automatically merges all pages into a single dataset.
+        - Thin wrapper around `iter_api_2_pages`.
+
+    Args:
+        params (dict, optional): Query parameters (date window etc.).
+        max_in_flight (int, optional): Number of pages requested in
+            parallel. Defaults to MAX_PAGES_IN_FLIGHT; 1 → sequential.
 
     Returns:
         list[dict]: Combined data from all pages.
@@ -65,67 +345,9 @@ def fetch_api_2_data(params: Optional[Dict[str, Any]] = None) -> List[Dict[str,
     Raises:
         RuntimeError: On repeated failures.
     """
-
-    headers = _build_headers()
     all_data: List[Dict[str, Any]] = []
 
-    page = 1
-    params = params.copy() if params else {}
-    params["pageSize"] = PAGE_SIZE
-
-    while True:
-        params["page"] = page
-
-        for attempt in range(1, MAX_RETRY + 1):
-            try:
-                log(f"🌐 [API2] Fetching page {page} with params {params}")
-
-                response = requests.get(
-                    API_2_URL,
-                    headers=headers,
-                    params=params,
-                    timeout=TIMEOUT_SECONDS
-                )
-
-                # SUCCESS
-                if response.status_code == 200:
-                    try:
-                        data = response.json()
-                    except Exception:
-                        raise RuntimeError("API 2 returned invalid JSON")
-
-                    row_count = len(data)
-                    log(f"📥 [API2] Page {page} returned {row_count} records.")
-
-                    if row_count == 0:
-                        log("📘 [API2] No more pages. Pagination completed.")
-                        return all_data
-
-                    all_data.extend(data)
-                    break  # exit retry loop → go to next page
-
-                # RETRYABLE ERRORS
-                if response.status_code in (429, 500, 502, 503, 504):
-                    log(f"⚠️ [API2] Retryable error {response.status_code}, waiting and retrying...")
-                    time.sleep(RETRY_DELAY_SECONDS)
-                    continue
-
-                # NON-RETRYABLE
-                raise RuntimeError(f"API 2 failed with HTTP {response.status_code}: {response.text}")
-
-            except requests.Timeout:
-                log(f"⏳ [API2] Timeout on page {page}, retrying...")
-                time.sleep(RETRY_DELAY_SECONDS)
-                continue
-
-            except requests.RequestException as e:
-                log(f"❌ [API2] Network error: {e}, retrying...")
-                time.sleep(RETRY_DELAY_SECONDS)
-                continue
-
-        else:
-            # retry loop exhausted
-            raise RuntimeError(f"API 2: Maximum retry attempts exceeded on page {page}")
+    for page_data in iter_api_2_pages(params=params, max_in_flight=max_in_flight):
+        all_data.extend(page_data)
 
-        # next page
-        page += 1
+    return all_data
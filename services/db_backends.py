@@ -0,0 +1,479 @@
+"""
+db_backends.py
+==============
+
+Pluggable loader backends for the DB service.
+
+The loader (chunking, transactions, parallel workers, pooling) lives in
+`db_service`; this module owns everything driver-specific:
+
+- `pyodbc`  – ODBC driver, `fast_executemany` INSERT / #staging + MERGE,
+              with exact `setinputsizes` types from the cached target
+              column metadata (services/table_metadata.py)
+- `pymssql` – native TDS bulk copy (`Connection.bulk_copy`) into the
+              target or into #staging before the MERGE
+- `sqlite`  – local SQLite file standing in for SQL Server, so the load
+              path can be tested and benchmarked without a server
+              (tables are created on first load, MERGE becomes
+              `INSERT … ON CONFLICT DO UPDATE`)
+
+The backend is selected with DB_BACKEND; `get_backend(name)` returns a
+process-wide instance.
+
+Author: Chef Seasons – Data Engineering Team
+"""
+
+import os
+import sqlite3
+import threading
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from config.settings import (
+    DB_BACKEND, DB_ODBC_DRIVER, DB_SQLITE_PATH,
+    DB_SERVER, DB_DATABASE, DB_USERNAME, DB_PASSWORD
+)
+from services.table_metadata import TableMetadataCache, coerce_rows, input_sizes, ordered_columns
+
+
+# ------------------------------------------------------------
+# CONFIGURABLE PARAMETERS
+# ------------------------------------------------------------
+STAGING_TABLE = "#etl_staging"      # session temp table used by the MERGE loader
+BULK_COPY_BATCH_SIZE = 5000         # rows per TDS bulk-copy batch (pymssql)
+
+
+# ------------------------------------------------------------
+# SHARED T-SQL
+# ------------------------------------------------------------
+def _column_list(columns: Sequence[str], prefix: str = "") -> str:
+    return ", ".join([f"{prefix}[{c}]" for c in columns])
+
+
+def _create_staging_sql(table_name: str, columns: Sequence[str]) -> str:
+    """
+    #staging with the target's column types, in `columns` order.
+
+    A plain `SELECT … INTO` would copy the IDENTITY property of the key
+    column (rejecting the explicit ids we load); SELECT INTO does not
+    inherit IDENTITY from a UNION ALL, so the empty second branch strips it.
+    """
+    column_list = _column_list(columns)
+    return (
+        f"IF OBJECT_ID('tempdb..{STAGING_TABLE}') IS NOT NULL DROP TABLE {STAGING_TABLE}; "
+        f"SELECT {column_list} INTO {STAGING_TABLE} FROM {table_name} WHERE 1 = 0 "
+        f"UNION ALL SELECT {column_list} FROM {table_name} WHERE 1 = 0;"
+    )
+
+
+def _merge_sql(table_name: str, columns: Sequence[str], key_columns: Sequence[str],
+               load_time_column: Optional[str] = None) -> str:
+    """
+    MERGE #staging into the target; selects (inserted, updated) from OUTPUT $action.
+
+    With `load_time_column`, that column is set to SYSDATETIME() on insert
+    and on update (as in sql/upsert_pipeline1.sql).
+    """
+    on_clause = " AND ".join([f"T.[{k}] = S.[{k}]" for k in key_columns])
+    set_items = [f"T.[{c}] = S.[{c}]" for c in columns if c not in key_columns]
+    insert_columns = _column_list(columns)
+    insert_values = _column_list(columns, "S.")
+    if load_time_column:
+        set_items.append(f"T.[{load_time_column}] = SYSDATETIME()")
+        insert_columns += f", [{load_time_column}]"
+        insert_values += ", SYSDATETIME()"
+
+    matched_clause = ""
+    if set_items:
+        matched_clause = f"WHEN MATCHED THEN UPDATE SET {', '.join(set_items)}"
+
+    return f"""
+        SET NOCOUNT ON;
+        DECLARE @actions TABLE (action NVARCHAR(10));
+
+        MERGE {table_name} AS T
+        USING {STAGING_TABLE} AS S
+            ON {on_clause}
+        {matched_clause}
+        WHEN NOT MATCHED BY TARGET THEN
+            INSERT ({insert_columns}) VALUES ({insert_values})
+        OUTPUT $action INTO @actions;
+
+        SELECT
+            SUM(CASE WHEN action = 'INSERT' THEN 1 ELSE 0 END),
+            SUM(CASE WHEN action = 'UPDATE' THEN 1 ELSE 0 END)
+        FROM @actions;
+    """
+
+
+def _merge_counts(result: Optional[Sequence[Any]]) -> Dict[str, int]:
+    result = result or (0, 0)
+    return {"inserted": int(result[0] or 0), "updated": int(result[1] or 0)}
+
+
+# ------------------------------------------------------------
+# BACKEND INTERFACE
+# ------------------------------------------------------------
+class LoaderBackend:
+    """
+    Driver-specific part of the loader.
+
+    Connections come from `connect()` in autocommit mode (they are pooled);
+    `begin()` switches a connection to an explicit transaction and
+    `finish()` switches it back before it returns to the pool.
+    """
+
+    name = "base"
+
+    def connect(self) -> Any:
+        raise NotImplementedError
+
+    def table(self, table_name: str) -> str:
+        """Backend-side name of a target table."""
+        return table_name
+
+    def begin(self, conn: Any):
+        conn.autocommit = False
+
+    def commit(self, conn: Any):
+        conn.commit()
+
+    def rollback(self, conn: Any):
+        conn.rollback()
+
+    def finish(self, conn: Any):
+        conn.autocommit = True
+
+    def insert(self, conn: Any, table_name: str, columns: List[str], values: List[Any],
+               key_columns: Sequence[str]) -> Dict[str, int]:
+        raise NotImplementedError
+
+    def merge(self, conn: Any, table_name: str, columns: List[str], values: List[Any],
+              key_columns: Sequence[str], load_time_column: Optional[str] = None) -> Dict[str, int]:
+        """Upsert on `key_columns`; `load_time_column` is stamped on insert and update."""
+        raise NotImplementedError
+
+
+class PyodbcBackend(LoaderBackend):
+    """
+    ODBC driver with `fast_executemany` (the original load path).
+
+    Parameters are bound with exact types from the target table's cached
+    column metadata (`cursor.setinputsizes`), values are reordered and
+    coerced to match, and statement text is cached per (table, column set).
+    """
+
+    name = "pyodbc"
+
+    def __init__(self):
+        self.metadata = TableMetadataCache()
+        self._sql: Dict[Tuple[str, str, Tuple[str, ...]], str] = {}
+        self._lock = threading.Lock()
+
+    def connect(self) -> Any:
+        import pyodbc
+
+        connection_string = (
+            f"DRIVER={{{DB_ODBC_DRIVER}}};"
+            f"SERVER={DB_SERVER};"
+            f"DATABASE={DB_DATABASE};"
+            f"UID={DB_USERNAME};"
+            f"PWD={DB_PASSWORD};"
+            "TrustServerCertificate=yes;"
+        )
+        return pyodbc.connect(connection_string, autocommit=True)
+
+    def _statement(self, kind: str, table_name: str, columns: Sequence[str],
+                   build: Callable[[], str]) -> str:
+        key = (kind, table_name, tuple(columns))
+        sql = self._sql.get(key)
+        if sql is None:
+            sql = build()
+            with self._lock:
+                self._sql[key] = sql
+        return sql
+
+    def _bind(self, conn, table_name: str, columns: List[str],
+              values: List[Any]) -> Tuple[List[str], List[tuple], List[Tuple[int, int, int]]]:
+        """Target-ordered columns, coerced rows and setinputsizes hints."""
+        metadata = self.metadata.get(conn, table_name)
+        ordered = ordered_columns(metadata, table_name, columns)
+        rows = coerce_rows(metadata, table_name, columns, ordered, values)
+        return ordered, rows, input_sizes(metadata, ordered)
+
+    def _bulk_insert(self, cursor, target: str, columns: List[str],
+                     rows: List[tuple], sizes: List[Tuple[int, int, int]]):
+        sql = self._statement("insert", target, columns, lambda: (
+            f"INSERT INTO {target} ({_column_list(columns)}) "
+            f"VALUES ({', '.join(['?'] * len(columns))})"
+        ))
+
+        # Activate bulk optimization mode with exact parameter types
+        cursor.fast_executemany = True
+        cursor.setinputsizes(sizes)
+        cursor.executemany(sql, rows)
+
+    def insert(self, conn, table_name, columns, values, key_columns):
+        try:
+            columns, rows, sizes = self._bind(conn, table_name, columns, values)
+            cursor = conn.cursor()
+            self._bulk_insert(cursor, table_name, columns, rows, sizes)
+            cursor.close()
+        except Exception:
+            # the table may have changed → re-read its metadata next time
+            self.metadata.invalidate(table_name)
+            raise
+        return {"inserted": len(rows), "updated": 0}
+
+    def merge(self, conn, table_name, columns, values, key_columns, load_time_column=None):
+        try:
+            # #staging is created from the target → same types and ordinals
+            columns, rows, sizes = self._bind(conn, table_name, columns, values)
+            cursor = conn.cursor()
+            cursor.execute(self._statement("staging", table_name, columns,
+                                           lambda: _create_staging_sql(table_name, columns)))
+
+            self._bulk_insert(cursor, STAGING_TABLE, columns, rows, sizes)
+
+            cursor.execute(self._statement("merge", table_name, columns,
+                                           lambda: _merge_sql(table_name, columns, key_columns,
+                                                              load_time_column)))
+            counts = _merge_counts(cursor.fetchone())
+
+            cursor.execute(f"DROP TABLE {STAGING_TABLE};")
+            cursor.close()
+        except Exception:
+            self.metadata.invalidate(table_name)
+            raise
+        return counts
+
+
+class PymssqlBackend(LoaderBackend):
+    """
+    Native TDS bulk copy via pymssql (`Connection.bulk_copy`, pymssql 2.3+).
+
+    Bulk copy addresses columns by ordinal, so target ordinals are looked
+    up once per table; MERGE loads go through #staging, whose ordinals
+    follow the batch's column order. Bulk copy does no type conversion,
+    so values are coerced with the cached column metadata first (e.g.
+    DATETIME strings → datetime). Both caches of a table are dropped when
+    one of its loads fails.
+    """
+
+    name = "pymssql"
+
+    def __init__(self):
+        self.metadata = TableMetadataCache(placeholder="%s")
+        self._ordinals: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def connect(self) -> Any:
+        import pymssql
+
+        conn = pymssql.connect(server=DB_SERVER, user=DB_USERNAME, password=DB_PASSWORD,
+                               database=DB_DATABASE, autocommit=True)
+        if not hasattr(conn, "bulk_copy"):
+            conn.close()
+            raise RuntimeError("Installed pymssql has no bulk_copy support (requires pymssql >= 2.3)")
+        return conn
+
+    def begin(self, conn):
+        conn.autocommit(False)
+
+    def finish(self, conn):
+        conn.autocommit(True)
+
+    def _column_ids(self, conn, table_name: str, columns: Sequence[str]) -> List[int]:
+        with self._lock:
+            ordinals = self._ordinals.get(table_name)
+        if ordinals is None:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT LOWER(name), column_id FROM sys.columns WHERE object_id = OBJECT_ID(%s)",
+                (table_name,),
+            )
+            ordinals = {name: column_id for name, column_id in cursor.fetchall()}
+            cursor.close()
+            with self._lock:
+                self._ordinals[table_name] = ordinals
+
+        missing = [c for c in columns if c.lower() not in ordinals]
+        if missing:
+            raise RuntimeError(f"Columns not found in {table_name}: {missing}")
+        return [ordinals[c.lower()] for c in columns]
+
+    def _coerce(self, conn, table_name: str, columns: List[str], values: List[Any]) -> List[tuple]:
+        return coerce_rows(self.metadata.get(conn, table_name), table_name, columns, columns, values)
+
+    def _invalidate(self, table_name: str):
+        # the table may have changed → re-read ordinals and metadata next time
+        with self._lock:
+            self._ordinals.pop(table_name, None)
+        self.metadata.invalidate(table_name)
+
+    def insert(self, conn, table_name, columns, values, key_columns):
+        try:
+            rows = self._coerce(conn, table_name, columns, values)
+            conn.bulk_copy(table_name, rows,
+                           column_ids=self._column_ids(conn, table_name, columns),
+                           batch_size=BULK_COPY_BATCH_SIZE)
+        except Exception:
+            self._invalidate(table_name)
+            raise
+        return {"inserted": len(rows), "updated": 0}
+
+    def merge(self, conn, table_name, columns, values, key_columns, load_time_column=None):
+        try:
+            # #staging is created from the target → same types, ordinals in batch order
+            rows = self._coerce(conn, table_name, columns, values)
+            cursor = conn.cursor()
+            cursor.execute(_create_staging_sql(table_name, columns))
+
+            conn.bulk_copy(STAGING_TABLE, rows,
+                           column_ids=list(range(1, len(columns) + 1)),
+                           batch_size=BULK_COPY_BATCH_SIZE)
+
+            cursor.execute(_merge_sql(table_name, columns, key_columns, load_time_column))
+            counts = _merge_counts(cursor.fetchone())
+
+            cursor.execute(f"DROP TABLE {STAGING_TABLE};")
+            cursor.close()
+        except Exception:
+            self._invalidate(table_name)
+            raise
+        return counts
+
+
+class SqliteBackend(LoaderBackend):
+    """
+    Local SQLite stand-in for SQL Server (tests and benchmarks).
+
+    Three-part names are reduced to the table name
+    (`ChefsAI.dbo.Table1_ETL` → `Table1_ETL`), and missing tables are
+    created on first load with a primary key on the merge key. A load-time
+    column is added on the first merge that asks for it, also to a table
+    an earlier insert created.
+    """
+
+    name = "sqlite"
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or DB_SQLITE_PATH
+        self._columns: Dict[Tuple[str, str], set] = {}   # (path, table) → lower-case column names
+        self._lock = threading.Lock()
+
+    def connect(self) -> Any:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # isolation_level=None → autocommit; transactions are opened explicitly
+        return sqlite3.connect(self.path, timeout=60, isolation_level=None,
+                               check_same_thread=False)
+
+    def table(self, table_name: str) -> str:
+        return table_name.split(".")[-1]
+
+    def begin(self, conn):
+        conn.execute("BEGIN IMMEDIATE")
+
+    def commit(self, conn):
+        conn.execute("COMMIT")
+
+    def rollback(self, conn):
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+
+    def finish(self, conn):
+        pass
+
+    def _ensure_table(self, conn, table: str, columns: Sequence[str], key_columns: Sequence[str],
+                      load_time_column: Optional[str] = None):
+        with self._lock:
+            existing = self._columns.get((self.path, table))
+            if existing is None:
+                load_time = f"[{load_time_column}] TEXT DEFAULT CURRENT_TIMESTAMP, " if load_time_column else ""
+                conn.execute(
+                    f"CREATE TABLE IF NOT EXISTS [{table}] ({_column_list(columns)}, {load_time}"
+                    f"PRIMARY KEY ({_column_list(key_columns)}))"
+                )
+                existing = {row[1].lower() for row in conn.execute(f"PRAGMA table_info([{table}])")}
+                self._columns[(self.path, table)] = existing
+
+            if load_time_column and load_time_column.lower() not in existing:
+                # SQLite cannot add a column with a CURRENT_TIMESTAMP default; merge stamps it
+                conn.execute(f"ALTER TABLE [{table}] ADD COLUMN [{load_time_column}] TEXT")
+                existing.add(load_time_column.lower())
+
+    def insert(self, conn, table_name, columns, values, key_columns):
+        table = self.table(table_name)
+        self._ensure_table(conn, table, columns, key_columns)
+        placeholders = ", ".join(["?"] * len(columns))
+        conn.executemany(
+            f"INSERT INTO [{table}] ({_column_list(columns)}) VALUES ({placeholders})", values
+        )
+        return {"inserted": len(values), "updated": 0}
+
+    def merge(self, conn, table_name, columns, values, key_columns, load_time_column=None):
+        table = self.table(table_name)
+        self._ensure_table(conn, table, columns, key_columns, load_time_column)
+        placeholders = ", ".join(["?"] * len(columns))
+        column_list = _column_list(columns)
+
+        conn.execute("DROP TABLE IF EXISTS temp.etl_staging")
+        conn.execute(f"CREATE TEMP TABLE etl_staging AS SELECT {column_list} FROM [{table}] WHERE 0")
+        conn.executemany(f"INSERT INTO temp.etl_staging ({column_list}) VALUES ({placeholders})", values)
+
+        on_clause = " AND ".join([f"T.[{k}] = S.[{k}]" for k in key_columns])
+        updated = conn.execute(
+            f"SELECT COUNT(*) FROM temp.etl_staging AS S JOIN [{table}] AS T ON {on_clause}"
+        ).fetchone()[0]
+
+        set_items = [f"[{c}] = excluded.[{c}]" for c in columns if c not in key_columns]
+        target_list, select_list = column_list, column_list
+        if load_time_column:
+            # stamped on insert and update, like SYSDATETIME() in the SQL Server MERGE
+            set_items.append(f"[{load_time_column}] = CURRENT_TIMESTAMP")
+            target_list += f", [{load_time_column}]"
+            select_list += ", CURRENT_TIMESTAMP"
+        conflict = "DO UPDATE SET " + ", ".join(set_items) if set_items else "DO NOTHING"
+        # "WHERE true" disambiguates the upsert clause from a join constraint
+        conn.execute(
+            f"INSERT INTO [{table}] ({target_list}) "
+            f"SELECT {select_list} FROM temp.etl_staging WHERE true "
+            f"ON CONFLICT ({_column_list(key_columns)}) {conflict}"
+        )
+        conn.execute("DROP TABLE temp.etl_staging")
+        return {"inserted": len(values) - updated, "updated": updated}
+
+
+# ------------------------------------------------------------
+# BACKEND LOOKUP
+# ------------------------------------------------------------
+BACKENDS = {
+    PyodbcBackend.name: PyodbcBackend,
+    PymssqlBackend.name: PymssqlBackend,
+    SqliteBackend.name: SqliteBackend,
+}
+
+_INSTANCES: Dict[str, LoaderBackend] = {}
+_INSTANCES_LOCK = threading.Lock()
+
+
+def get_backend(name: Optional[str] = None) -> LoaderBackend:
+    """
+    Process-wide backend instance.
+
+    Args:
+        name (str, optional): "pyodbc", "pymssql" or "sqlite"
+            (default DB_BACKEND).
+
+    Raises:
+        ValueError: On an unknown backend name.
+    """
+    name = (name or DB_BACKEND).lower()
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown DB backend '{name}' (expected one of {sorted(BACKENDS)})")
+    with _INSTANCES_LOCK:
+        backend = _INSTANCES.get(name)
+        if backend is None:
+            backend = _INSTANCES[name] = BACKENDS[name]()
+        return backend
@@ -0,0 +1,324 @@
+"""
+db_pool.py
+==========
+
+Thread-safe, reusable connection pool for SQL Server (pyodbc).
+
+Opening a connection costs a full login handshake; chunked and parallel
+loads used to pay it once per batch, and the two pipelines never shared
+a connection. This pool:
+
+- Keeps between `min_size` and `max_size` connections
+- Validates a connection on checkout with a cheap ping (`SELECT 1`) and
+  replaces it transparently when the ping fails
+- Evicts connections idle longer than `idle_timeout` (never below
+  `min_size`)
+- Offers a context-manager API: `with pool.connection() as conn: …`;
+  a connection is discarded only after a driver error, other errors
+  roll it back and return it to the pool
+- Can be pre-warmed (e.g. by the scheduler before the nightly jobs)
+- Exposes metrics: connections created / reused / discarded / evicted,
+  checkout wait time
+
+Author: Chef Seasons – Data Engineering Team
+"""
+
+import importlib
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from utils.logger import log
+
+
+# ------------------------------------------------------------
+# CONFIGURABLE PARAMETERS
+# ------------------------------------------------------------
+PING_SQL = "SELECT 1"
+DRIVER_MODULES = ("pyodbc", "pymssql")   # their `Error` classes mark a connection as suspect
+
+_DRIVER_ERRORS: Optional[Tuple[type, ...]] = None
+
+
+def driver_errors() -> Tuple[type, ...]:
+    """DB-API `Error` base classes of sqlite3 and the installed SQL Server drivers."""
+    global _DRIVER_ERRORS
+    if _DRIVER_ERRORS is None:
+        errors = [sqlite3.Error]
+        for module in DRIVER_MODULES:
+            try:
+                errors.append(importlib.import_module(module).Error)
+            except ImportError:
+                continue
+        _DRIVER_ERRORS = tuple(errors)
+    return _DRIVER_ERRORS
+
+
+class PoolTimeoutError(RuntimeError):
+    """Raised when no connection becomes available within the checkout timeout."""
+
+
+class ConnectionPool:
+    """
+    Bounded pool of DB-API connections.
+
+    Args:
+        factory (callable): Opens a new connection.
+        min_size (int): Connections kept open (also the pre-warm target).
+        max_size (int): Upper bound of open connections.
+        idle_timeout (float): Seconds after which idle connections above
+            `min_size` are closed.
+        checkout_timeout (float): Max seconds to wait for a free connection.
+        name (str): Label for logs.
+    """
+
+    def __init__(self, factory: Callable[[], Any], min_size: int = 1, max_size: int = 8,
+                 idle_timeout: float = 600.0, checkout_timeout: float = 30.0,
+                 name: str = "db"):
+        if max_size < 1 or min_size < 0 or min_size > max_size:
+            raise ValueError(f"Invalid pool bounds: min={min_size}, max={max_size}")
+
+        self.factory = factory
+        self.min_size = min_size
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.checkout_timeout = checkout_timeout
+        self.name = name
+
+        self._cond = threading.Condition()
+        self._idle: List[Tuple[Any, float]] = []   # (connection, returned_at), LIFO
+        self._open = 0
+        self._closed = False
+        self._metrics = {
+            "created": 0,
+            "reused": 0,
+            "discarded": 0,
+            "evicted": 0,
+            "checkouts": 0,
+            "waits": 0,
+            "wait_seconds": 0.0,
+            "max_wait_seconds": 0.0,
+        }
+
+    # -----------------------------
+    # CHECKOUT / RETURN
+    # -----------------------------
+    @contextmanager
+    def connection(self) -> Iterator[Any]:
+        """
+        Borrow a validated connection.
+
+        The connection goes back to the pool when the block exits. If the
+        block raised a driver error (see `driver_errors`), the connection
+        may be broken and is discarded; any other exception (a bug in the
+        caller, GeneratorExit of a closed generator, ...) only rolls back
+        the open transaction and the connection is reused.
+        """
+        conn = self.acquire()
+        try:
+            yield conn
+        except driver_errors():
+            self.release(conn, discard=True)
+            raise
+        except BaseException:
+            self.release(conn, discard=not self._rollback(conn))
+            raise
+        else:
+            self.release(conn)
+
+    def acquire(self) -> Any:
+        """Check out a connection (prefer `connection()`)."""
+        started = time.monotonic()
+        waited = False
+
+        while True:
+            with self._cond:
+                if self._closed:
+                    raise RuntimeError(f"Connection pool '{self.name}' is closed")
+
+                self._evict_idle_locked()
+
+                if self._idle:
+                    conn, _ = self._idle.pop()
+                    reuse = True
+                elif self._open < self.max_size:
+                    self._open += 1
+                    conn, reuse = None, False
+                else:
+                    remaining = self.checkout_timeout - (time.monotonic() - started)
+                    if remaining <= 0:
+                        raise PoolTimeoutError(
+                            f"No DB connection available in pool '{self.name}' "
+                            f"after {self.checkout_timeout:g}s (max_size={self.max_size})"
+                        )
+                    waited = True
+                    self._cond.wait(remaining)
+                    continue
+
+            # connect / ping outside the lock
+            if reuse:
+                if self._ping(conn):
+                    self._record_checkout(started, waited, reused=True)
+                    return conn
+                self._close_quietly(conn)
+                with self._cond:
+                    self._metrics["discarded"] += 1
+                    self._open -= 1
+                    self._cond.notify()
+                continue
+
+            try:
+                conn = self.factory()
+            except Exception:
+                with self._cond:
+                    self._open -= 1
+                    self._cond.notify()
+                raise
+
+            with self._cond:
+                self._metrics["created"] += 1
+            self._record_checkout(started, waited, reused=False)
+            return conn
+
+    def release(self, conn: Any, discard: bool = False):
+        """Return a connection to the pool (or close it when `discard`)."""
+        with self._cond:
+            if discard or self._closed:
+                self._open -= 1
+                if discard:
+                    self._metrics["discarded"] += 1
+            else:
+                self._idle.append((conn, time.monotonic()))
+                conn = None
+            self._cond.notify()
+
+        if conn is not None:
+            self._close_quietly(conn)
+
+    # -----------------------------
+    # MAINTENANCE
+    # -----------------------------
+    def warm(self, count: Optional[int] = None) -> int:
+        """
+        Open connections ahead of time so the first batches skip the login.
+
+        Args:
+            count (int, optional): Target idle connections (default: min_size).
+
+        Returns:
+            int: Connections opened.
+        """
+        target = min(count if count is not None else self.min_size, self.max_size)
+        opened = 0
+
+        while True:
+            with self._cond:
+                if self._closed or len(self._idle) >= target or self._open >= self.max_size:
+                    break
+                self._open += 1
+            try:
+                conn = self.factory()
+            except Exception:
+                with self._cond:
+                    self._open -= 1
+                raise
+            with self._cond:
+                self._metrics["created"] += 1
+                self._idle.append((conn, time.monotonic()))
+                self._cond.notify()
+            opened += 1
+
+        log(f"🔌 [DB POOL] {self.name}: pre-warmed {opened} connection(s)")
+        return opened
+
+    def close(self):
+        """Close all idle connections and refuse new checkouts."""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._open -= len(idle)
+            self._cond.notify_all()
+        for conn, _ in idle:
+            self._close_quietly(conn)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            stats = dict(self._metrics)
+            stats.update({
+                "name": self.name,
+                "open": self._open,
+                "idle": len(self._idle),
+                "in_use": self._open - len(self._idle),
+                "min_size": self.min_size,
+                "max_size": self.max_size,
+            })
+        stats["wait_seconds"] = round(stats["wait_seconds"], 3)
+        stats["max_wait_seconds"] = round(stats["max_wait_seconds"], 3)
+        return stats
+
+    # -----------------------------
+    # INTERNALS
+    # -----------------------------
+    def _evict_idle_locked(self):
+        if not self.idle_timeout:
+            return
+        now = time.monotonic()
+        keep: List[Tuple[Any, float]] = []
+        expired: List[Any] = []
+        # oldest first; keep at least min_size open connections
+        for conn, returned_at in self._idle:
+            if now - returned_at > self.idle_timeout and self._open - len(expired) > self.min_size:
+                expired.append(conn)
+            else:
+                keep.append((conn, returned_at))
+        if expired:
+            self._idle = keep
+            self._open -= len(expired)
+            self._metrics["evicted"] += len(expired)
+            for conn in expired:
+                self._close_quietly(conn)
+
+    def _record_checkout(self, started: float, waited: bool, reused: bool):
+        wait = time.monotonic() - started
+        with self._cond:
+            m = self._metrics
+            m["checkouts"] += 1
+            if reused:
+                m["reused"] += 1
+            if waited:
+                m["waits"] += 1
+            m["wait_seconds"] += wait
+            m["max_wait_seconds"] = max(m["max_wait_seconds"], wait)
+
+    @staticmethod
+    def _ping(conn: Any) -> bool:
+        try:
+            cursor = conn.cursor()
+            try:
+                cursor.execute(PING_SQL)
+                cursor.fetchone()
+            finally:
+                cursor.close()
+            return True
+        except Exception as exc:
+            log(f"⚠️ [DB POOL] Connection failed validation, replacing it: {exc}", level="warning")
+            return False
+
+    @staticmethod
+    def _rollback(conn: Any) -> bool:
+        """Roll back a borrowed connection; False if that failed (discard it)."""
+        try:
+            conn.rollback()
+            return True
+        except Exception as exc:
+            log(f"⚠️ [DB POOL] Rollback failed, discarding connection: {exc}", level="warning")
+            return False
+
+    @staticmethod
+    def _close_quietly(conn: Any):
+        try:
+            conn.close()
+        except Exception:
+            pass
@@ -2,11 +2,19 @@
 db_service.py
 =============
 
-SQL Server database interaction layer using pyodbc.
+SQL Server database interaction layer.
 
 This module provides:
-- Robust SQL Server connection handling
+- Pluggable loader backends (pyodbc, pymssql bulk copy, SQLite stand-in)
+  selected with DB_BACKEND (see services/db_backends.py)
+- Robust SQL Server connection handling through a shared, validated
+  connection pool (pre-warmable, with wait/creation metrics)
 - Fast bulk insert operations with executemany()
+- Set-based upserts: bulk load into a #staging temp table + one MERGE
+  (inserted vs. updated counts from OUTPUT $action)
+- Chunked loading with one transaction per chunk, optionally on several
+  pooled connections in parallel (rows partitioned by key hash), with
+  per-chunk timing and throughput
 - Dynamic column-agnostic insert logic
 - Reliable error handling for ETL pipelines
 - Centralized DB service for all pipelines
@@ -14,58 +22,301 @@ This module provides:
 
 """
 
-import pyodbc
-from typing import List, Dict, Any
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from typing import List, Dict, Any, Iterator, Optional, Sequence, Tuple
 from config.settings import (
-    DB_SERVER, DB_DATABASE, DB_USERNAME, DB_PASSWORD
+    DB_POOL_MIN_SIZE, DB_POOL_MAX_SIZE, DB_POOL_IDLE_SECONDS, DB_POOL_CHECKOUT_TIMEOUT,
+    LOAD_MODE, LOAD_CHUNK_ROWS, LOAD_WORKERS
 )
+from services.db_backends import LoaderBackend, get_backend
+from services.db_pool import ConnectionPool
 from utils.logger import log
 
 
 # ------------------------------------------------------------
-# CONNECTION STRING (Trusted, Pooled, Fast)
+# TARGET TABLES
 # ------------------------------------------------------------
-CONNECTION_STRING = (
-    "DRIVER={ODBC Driver 17 for SQL Server};"
-    f"SERVER={DB_SERVER};"
-    f"DATABASE={DB_DATABASE};"
-    f"UID={DB_USERNAME};"
-    f"PWD={DB_PASSWORD};"
-    "TrustServerCertificate=yes;"
-)
+TABLE_1_NAME = "ChefsAI.dbo.Table1_ETL"
+TABLE_2_NAME = "ChefsAI.dbo.khenda_hygiene"
+
+# MERGE keys per target table (see sql/upsert_pipeline*.sql)
+TABLE_KEYS = {
+    TABLE_1_NAME: ("id",),
+    TABLE_2_NAME: ("id",),
+}
+# Audit column the MERGE sets to SYSDATETIME() on insert and update
+TABLE_LOAD_TIME_COLUMNS = {
+    TABLE_1_NAME: "LoadTime",
+}
+FETCH_BATCH_SIZE = 5000
 
 
 # ------------------------------------------------------------
 # CONNECTION MANAGEMENT
 # ------------------------------------------------------------
-def _get_connection():
+def _get_connection(backend: Optional[LoaderBackend] = None):
     """
-    Opens a SQL Server connection using pyodbc.
+    Opens a connection through the configured backend (DB_BACKEND).
 
     Returns:
-        pyodbc.Connection: Active connection object.
+        Connection: Active connection object (autocommit).
 
     Raises:
         RuntimeError: On connection failure.
     """
+    backend = backend or get_backend()
     try:
-        conn = pyodbc.connect(CONNECTION_STRING, autocommit=True)
-        return conn
+        return backend.connect()
     except Exception as exc:
-        raise RuntimeError(f"Database connection failed via pyodbc: {exc}")
+        raise RuntimeError(f"Database connection failed via {backend.name}: {exc}")
+
+
+_POOLS: Dict[str, ConnectionPool] = {}
+_POOL_LOCK = threading.Lock()
+
+
+def get_db_pool(backend: Optional[str] = None) -> ConnectionPool:
+    """Process-wide connection pool of a backend (created on first use)."""
+    loader = get_backend(backend)
+    with _POOL_LOCK:
+        pool = _POOLS.get(loader.name)
+        if pool is None:
+            pool = _POOLS[loader.name] = ConnectionPool(
+                lambda: _get_connection(loader),
+                min_size=DB_POOL_MIN_SIZE,
+                max_size=DB_POOL_MAX_SIZE,
+                idle_timeout=DB_POOL_IDLE_SECONDS,
+                checkout_timeout=DB_POOL_CHECKOUT_TIMEOUT,
+                name=loader.name,
+            )
+        return pool
+
+
+def close_db_pool(backend: Optional[str] = None):
+    """Close a backend's pool; the next checkout opens a fresh one."""
+    name = get_backend(backend).name
+    with _POOL_LOCK:
+        pool = _POOLS.pop(name, None)
+    if pool is not None:
+        pool.close()
+
+
+def warm_db_pool(count: Optional[int] = None) -> int:
+    """
+    Pre-open pooled connections (e.g. right before the nightly jobs).
+
+    Returns:
+        int: Connections opened.
+    """
+    return get_db_pool().warm(count)
+
+
+def get_db_pool_stats() -> Dict[str, Any]:
+    """Pool metrics: created/reused/discarded/evicted connections and wait times."""
+    return get_db_pool().stats()
+
+
+# ------------------------------------------------------------
+# ROW PREPARATION
+# ------------------------------------------------------------
+def _prepare_rows(rows: List[Any],
+                  columns: Optional[Sequence[str]] = None) -> Tuple[List[str], List[Any]]:
+    """
+    Resolve the column order and positional values of a batch.
+
+    Positional tuples (with `columns`) and schema records (columns from
+    their `_fields`) are passed through as-is; dict rows are converted.
+    """
+    if columns is None and hasattr(rows[0], "_fields"):
+        columns = rows[0]._fields
+
+    if columns is not None:
+        return list(columns), rows
+
+    columns = list(rows[0].keys())
+    return columns, [tuple(row[col] for col in columns) for row in rows]
 
 
 # ------------------------------------------------------------
-# GENERIC DYNAMIC INSERT
+# CHUNKED, TRANSACTIONAL LOADER
 # ------------------------------------------------------------
-def _insert_dynamic(table_name: str, rows: List[Dict[str, Any]]) -> int:
+def _load_chunk(backend: LoaderBackend, table_name: str, columns: List[str], values: List[Any],
+                mode: str, key_columns: Sequence[str],
+                load_time_column: Optional[str] = None) -> Dict[str, int]:
+    """
+    Load one chunk in its own transaction on a pooled connection.
+
+    The chunk is committed as a whole or rolled back as a whole; the
+    connection goes back to the pool in autocommit mode.
+    """
+    with get_db_pool(backend.name).connection() as conn:
+        backend.begin(conn)
+        try:
+            if mode == "merge":
+                counts = backend.merge(conn, table_name, columns, values, key_columns,
+                                       load_time_column)
+            else:
+                counts = backend.insert(conn, table_name, columns, values, key_columns)
+            backend.commit(conn)
+        except Exception:
+            try:
+                backend.rollback(conn)
+            except Exception:
+                pass
+            raise
+        finally:
+            backend.finish(conn)
+    return counts
+
+
+def _partition_by_key(values: List[Any], key_index: List[int], partitions: int) -> List[List[Any]]:
+    """Split rows into disjoint partitions by key hash (same key → same partition)."""
+    parts: List[List[Any]] = [[] for _ in range(partitions)]
+    if len(key_index) == 1:
+        k = key_index[0]
+        for row in values:
+            parts[hash(row[k]) % partitions].append(row)
+    else:
+        for row in values:
+            parts[hash(tuple(row[k] for k in key_index)) % partitions].append(row)
+    return parts
+
+
+def _load_dynamic(table_name: str,
+                  rows: List[Any],
+                  columns: Optional[Sequence[str]] = None,
+                  mode: Optional[str] = None,
+                  chunk_rows: Optional[int] = None,
+                  workers: Optional[int] = None,
+                  backend: Optional[str] = None) -> Dict[str, int]:
     """
-    Dynamically inserts rows into a SQL Server table via pyodbc.
-    Supports high-performance bulk insert with fast_executemany.
+    Load rows in fixed-size chunks, one transaction per chunk, optionally
+    on several pooled connections in parallel.
+
+    With `workers` > 1 the rows are partitioned by a hash of the table
+    key, and each worker loads the chunks of its own partition on its own
+    connection — no two connections ever touch the same key, which keeps
+    lock contention between workers low.
+
+    A failing chunk is rolled back and reported; the remaining chunks
+    still load. The call raises at the end if any chunk failed, so callers
+    never treat a partial load as complete (re-running is safe in MERGE
+    mode).
 
     Args:
         table_name (str): Fully qualified table name (schema.table).
-        rows (list[dict]): Array of record dictionaries.
+        rows (list[dict] | list[tuple]): Record dictionaries, positional
+            tuples when `columns` is given, or schema records (tuple-backed,
+            columns taken from their `_fields`).
+        columns (list[str], optional): Column order of positional tuples.
+        mode (str, optional): "merge" or "insert" (default LOAD_MODE).
+        chunk_rows (int, optional): Rows per transaction (default
+            LOAD_CHUNK_ROWS; 0 → the whole batch in one transaction).
+        workers (int, optional): Parallel connections (default LOAD_WORKERS).
+        backend (str, optional): Loader backend (default DB_BACKEND).
+
+    Returns:
+        dict: {"inserted": int, "updated": int}
+
+    Raises:
+        RuntimeError: If the mode is unknown or any chunk failed.
+    """
+    loader = get_backend(backend)
+    mode = (mode or LOAD_MODE).lower()
+    if mode not in ("merge", "insert"):
+        raise RuntimeError(f"Unknown load mode '{mode}' (expected 'merge' or 'insert')")
+
+    totals = {"inserted": 0, "updated": 0}
+    if not rows:
+        return totals
+
+    columns, values = _prepare_rows(rows, columns)
+    key_columns = TABLE_KEYS.get(table_name, ("id",))
+    missing = [k for k in key_columns if k not in columns]
+    if missing:
+        if mode == "merge":
+            raise RuntimeError(f"Upsert into {table_name} failed: key columns missing from batch → {missing}")
+        key_columns = (columns[0],)
+    load_time_column = TABLE_LOAD_TIME_COLUMNS.get(table_name)
+
+    chunk_rows = LOAD_CHUNK_ROWS if chunk_rows is None else chunk_rows
+    chunk_rows = chunk_rows if chunk_rows and chunk_rows > 0 else len(values)
+    workers = LOAD_WORKERS if workers is None else workers
+    workers = max(1, min(workers, get_db_pool(loader.name).max_size, -(-len(values) // chunk_rows)))
+
+    if workers > 1:
+        key_index = [columns.index(k) for k in key_columns]
+        partitions = _partition_by_key(values, key_index, workers)
+    else:
+        partitions = [values]
+
+    # (worker, chunk) work lists; each worker loads its partition sequentially
+    plans = [
+        [part[i:i + chunk_rows] for i in range(0, len(part), chunk_rows)]
+        for part in partitions
+    ]
+    chunk_total = sum(len(p) for p in plans)
+    lock = threading.Lock()
+    failures: List[str] = []
+    done = [0]
+
+    def _run_worker(worker_no: int, chunks: List[List[Any]]):
+        for chunk in chunks:
+            started = time.perf_counter()
+            try:
+                counts = _load_chunk(loader, table_name, columns, chunk, mode, key_columns,
+                                     load_time_column)
+            except Exception as exc:
+                with lock:
+                    done[0] += 1
+                    failures.append(f"chunk {done[0]}/{chunk_total} ({len(chunk)} rows): {exc}")
+                log(f"❌ [LOAD] {table_name} worker {worker_no}: chunk of {len(chunk)} rows "
+                    f"rolled back → {exc}", level="error")
+                continue
+
+            elapsed = time.perf_counter() - started
+            with lock:
+                done[0] += 1
+                chunk_no = done[0]
+                totals["inserted"] += counts["inserted"]
+                totals["updated"] += counts["updated"]
+            rate = len(chunk) / elapsed if elapsed > 0 else float("inf")
+            log(f"🧱 [LOAD] {table_name} chunk {chunk_no}/{chunk_total} (worker {worker_no}): "
+                f"{len(chunk)} rows in {elapsed:.2f}s → {rate:,.0f} rows/s "
+                f"({counts['inserted']} inserted, {counts['updated']} updated)")
+
+    started = time.perf_counter()
+    if workers > 1:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="db-load") as executor:
+            list(executor.map(_run_worker, range(1, workers + 1), plans))
+    else:
+        _run_worker(1, plans[0])
+    elapsed = time.perf_counter() - started
+
+    loaded = totals["inserted"] + totals["updated"]
+    rate = len(values) / elapsed if elapsed > 0 else float("inf")
+    if failures:
+        raise RuntimeError(
+            f"{mode.capitalize()} into {table_name} failed for {len(failures)}/{chunk_total} chunks "
+            f"({loaded} rows committed, the failed chunks were rolled back); "
+            f"first error → {failures[0]}"
+        )
+
+    log(f"💾 {mode.capitalize()} completed into {table_name} → {totals['inserted']} inserted, "
+        f"{totals['updated']} updated in {chunk_total} chunk(s) on {workers} {loader.name} connection(s), "
+        f"{elapsed:.2f}s ({rate:,.0f} rows/s)")
+    return totals
+
+
+def _insert_dynamic(table_name: str,
+                    rows: List[Any],
+                    columns: Optional[Sequence[str]] = None) -> int:
+    """
+    Dynamically inserts rows into a SQL Server table
+    (chunked INSERT, see `_load_dynamic`).
 
     Returns:
         int: Number of successfully inserted rows.
@@ -73,66 +324,109 @@ def _insert_dynamic(table_name: str, rows: List[Dict[str, Any]]) -> int:
     Raises:
         RuntimeError: If insert operation fails.
     """
+    return _load_dynamic(table_name, rows, columns, mode="insert")["inserted"]
 
-    if not rows:
-        return 0
 
-    columns = list(rows[0].keys())
-    column_list = ", ".join([f"[{c}]" for c in columns])
-    placeholders = ", ".join(["?"] * len(columns))
+def _upsert_dynamic(table_name: str,
+                    rows: List[Any],
+                    columns: Optional[Sequence[str]] = None) -> Dict[str, int]:
+    """
+    Upserts rows on the table key via #staging + MERGE (chunked, see
+    `_load_dynamic`).
 
-    sql = f"INSERT INTO {table_name} ({column_list}) VALUES ({placeholders})"
+    Returns:
+        dict: {"inserted": int, "updated": int}
+
+    Raises:
+        RuntimeError: If the upsert fails.
+    """
+    return _load_dynamic(table_name, rows, columns, mode="merge")
 
-    try:
-        conn = _get_connection()
-        cursor = conn.cursor()
 
-        # Activate bulk optimization mode
-        cursor.fast_executemany = True
+def _load(table_name: str, rows: List[Any], columns: Optional[Sequence[str]],
+          mode: Optional[str]) -> int:
+    """Load with `mode` (default LOAD_MODE) and return rows inserted + updated."""
+    counts = _load_dynamic(table_name, rows, columns, mode=mode)
+    return counts["inserted"] + counts["updated"]
 
-        values = [tuple(row[col] for col in columns) for row in rows]
 
-        cursor.executemany(sql, values)
+# ------------------------------------------------------------
+# STREAMING READ
+# ------------------------------------------------------------
+def iter_table_rows(table_name: str,
+                    columns: Sequence[str],
+                    batch_size: int = FETCH_BATCH_SIZE) -> Iterator[tuple]:
+    """
+    Stream rows of a table as positional tuples in `columns` order.
+
+    Args:
+        table_name (str): Fully qualified table name (schema.table).
+        columns (list[str]): Columns to select.
+        batch_size (int): Rows fetched per round trip.
 
-        log(f"💾 Insert completed into {table_name} → {len(rows)} rows")
+    Yields:
+        tuple: One row.
 
-        cursor.close()
-        conn.close()
+    Raises:
+        RuntimeError: If the query fails.
+    """
+    column_list = ", ".join([f"[{c}]" for c in columns])
+    sql = f"SELECT {column_list} FROM {get_backend().table(table_name)}"
 
-        return len(rows)
+    try:
+        with get_db_pool().connection() as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.execute(sql)
+
+                while True:
+                    batch = cursor.fetchmany(batch_size)
+                    if not batch:
+                        break
+                    for row in batch:
+                        yield tuple(row)
+            finally:
+                # also when the caller stops early: the connection is reused
+                cursor.close()
 
     except Exception as exc:
         raise RuntimeError(
-            f"Insert operation failed for table {table_name} via pyodbc: {exc}"
+            f"Read operation failed for table {table_name} via {get_backend().name}: {exc}"
         )
 
 
 # ------------------------------------------------------------
 # TABLE-SPECIFIC ENTRY POINTS
 # ------------------------------------------------------------
-def insert_into_table_1(rows: List[Dict[str, Any]]) -> int:
+def insert_into_table_1(rows: List[Any], columns: Optional[Sequence[str]] = None,
+                        mode: Optional[str] = None) -> int:
     """
-    Inserts data from ETL Pipeline 1 into SQL Table 1.
+    Loads data from ETL Pipeline 1 into SQL Table 1.
 
     Args:
-        rows (list[dict])
+        rows (list[dict] | list[tuple])
+        columns (list[str], optional): Column order for tuple rows.
+        mode (str, optional): "merge" (upsert on id) or "insert".
+            Defaults to LOAD_MODE.
 
     Returns:
-        int: Number of rows inserted.
+        int: Number of rows inserted or updated.
     """
-    TABLE_NAME = "ChefsAI.dbo.Table1_ETL"
-    return _insert_dynamic(TABLE_NAME, rows)
+    return _load(TABLE_1_NAME, rows, columns, mode)
 
 
-def insert_into_table_2(rows: List[Dict[str, Any]]) -> int:
+def insert_into_table_2(rows: List[Any], columns: Optional[Sequence[str]] = None,
+                        mode: Optional[str] = None) -> int:
     """
-    Inserts data from ETL Pipeline 2 into khenda_hygiene table.
+    Loads data from ETL Pipeline 2 into khenda_hygiene table.
 
     Args:
-        rows (list[dict])
+        rows (list[dict] | list[tuple])
+        columns (list[str], optional): Column order for tuple rows.
+        mode (str, optional): "merge" (upsert on id) or "insert".
+            Defaults to LOAD_MODE.
 
     Returns:
-        int: Number of rows inserted.
+        int: Number of rows inserted or updated.
     """
-    TABLE_NAME = "ChefsAI.dbo.khenda_hygiene"
-    return _insert_dynamic(TABLE_NAME, rows)
+    return _load(TABLE_2_NAME, rows, columns, mode)
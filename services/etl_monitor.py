@@ -6,7 +6,7 @@ ETL monitoring and health reporting module.
 
 This module:
 - Tracks start/end timestamps for each pipeline
-- Captures success row counts or error messages
+- Captures success row counts, quarantined reject counts or error messages
 - Builds a consolidated ETL report
 - Sends daily e-mail summary using MailLogger
 
@@ -27,17 +27,20 @@ class PipelineStatus:
         self.end_time: datetime = None
         self.success: bool = False
         self.rows: int = 0
+        self.rejected: int = 0
         self.error: str = ""
 
     def start(self):
         self.start_time = datetime.now()
         log(f"🔸 [{self.name}] Started at {self.start_time}")
 
-    def finish_success(self, rows: int):
+    def finish_success(self, rows: int, rejected: int = 0):
         self.end_time = datetime.now()
         self.success = True
         self.rows = rows
-        log(f"🟢 [{self.name}] Completed successfully → {rows} rows processed.")
+        self.rejected = rejected
+        log(f"🟢 [{self.name}] Completed successfully → {rows} rows processed, "
+            f"{rejected} rejected rows quarantined.")
 
     def finish_failure(self, error_message: str):
         self.end_time = datetime.now()
@@ -77,6 +80,7 @@ class ETLMonitor:
                     <td><b>{p.name}</b></td>
                     <td>{status}</td>
                     <td>{p.rows if p.success else '-'}</td>
+                    <td>{p.rejected if p.success else '-'}</td>
                     <td>{duration}</td>
                     <td>{p.error if not p.success else "-"}</td>
                 </tr>
@@ -91,6 +95,7 @@ class ETLMonitor:
                 <th>Pipeline</th>
                 <th>Status</th>
                 <th>Rows Processed</th>
+                <th>Rows Quarantined</th>
                 <th>Duration</th>
                 <th>Error</th>
             </tr>
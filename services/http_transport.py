@@ -0,0 +1,185 @@
+"""
+http_transport.py
+=================
+
+Shared, pooled HTTP transport for all API clients.
+
+This module provides:
+- One long-lived `requests.Session` per API source
+- Tuned `HTTPAdapter` connection pool with keep-alive
+- gzip/deflate content negotiation
+- Headers built once per session (not per request)
+- Connection counters (opened vs. reused) for monitoring
+
+Usage:
+    session = get_session("api1", _build_headers())
+    response = session.get(url, params=params, timeout=TIMEOUT_SECONDS)
+
+Author: Chef Seasons – Data Engineering Team
+"""
+
+import threading
+from typing import Dict, Any
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from utils.logger import log
+
+
+# ------------------------------------------------------------
+# CONFIGURABLE PARAMETERS
+# ------------------------------------------------------------
+POOL_CONNECTIONS = 4   # number of distinct hosts cached per session
+POOL_MAXSIZE = 16      # max keep-alive connections per host
+POOL_BLOCK = False     # do not block when the pool is exhausted
+
+
+# ------------------------------------------------------------
+# CONNECTION COUNTERS
+# ------------------------------------------------------------
+class TransportStats:
+    """Thread-safe counters for a single source's HTTP transport."""
+
+    def __init__(self, source: str):
+        self.source = source
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.connections_opened = 0
+
+    def record_connection(self):
+        with self._lock:
+            self.connections_opened += 1
+
+    def record_request(self):
+        with self._lock:
+            self.requests += 1
+
+    @property
+    def connections_reused(self) -> int:
+        return max(self.requests - self.connections_opened, 0)
+
+    def as_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "source": self.source,
+                "requests": self.requests,
+                "connections_opened": self.connections_opened,
+                "connections_reused": max(self.requests - self.connections_opened, 0),
+            }
+
+
+def _counting_pool_class(base_cls, stats: TransportStats):
+    """
+    Build a urllib3 connection-pool subclass that reports every new
+    (non-reused) connection to `stats`.
+    """
+
+    class CountingPool(base_cls):
+        def _new_conn(self):
+            stats.record_connection()
+            return super()._new_conn()
+
+    return CountingPool
+
+
+class _PooledAdapter(HTTPAdapter):
+    """HTTPAdapter whose connection pools report opened connections."""
+
+    def __init__(self, stats: TransportStats, **kwargs):
+        self._stats = stats
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _counting_pool_class(HTTPConnectionPool, self._stats),
+            "https": _counting_pool_class(HTTPSConnectionPool, self._stats),
+        }
+
+
+# ------------------------------------------------------------
+# SESSION REGISTRY
+# ------------------------------------------------------------
+_SESSIONS: Dict[str, requests.Session] = {}
+_STATS: Dict[str, TransportStats] = {}
+_REGISTRY_LOCK = threading.Lock()
+
+
+def _create_session(source: str, headers: Dict[str, str]) -> requests.Session:
+    """
+    Create a tuned session for a single API source.
+
+    Retries are handled by the API clients themselves, so the adapter
+    is configured with `max_retries=0`.
+    """
+    stats = TransportStats(source)
+
+    session = requests.Session()
+    session.headers.update(headers)
+    session.headers["Accept-Encoding"] = "gzip, deflate"
+    session.headers["Connection"] = "keep-alive"
+
+    adapter = _PooledAdapter(
+        stats,
+        pool_connections=POOL_CONNECTIONS,
+        pool_maxsize=POOL_MAXSIZE,
+        pool_block=POOL_BLOCK,
+        max_retries=0,
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+
+    session.hooks["response"].append(lambda response, *a, **kw: stats.record_request())
+
+    _STATS[source] = stats
+    log(f"🔌 [HTTP] Session created for {source} (pool_maxsize={POOL_MAXSIZE})")
+    return session
+
+
+def get_session(source: str, headers: Dict[str, str]) -> requests.Session:
+    """
+    Return the shared session for `source`, creating it on first use.
+
+    Args:
+        source (str): Logical source name (e.g. "api1", "api2").
+        headers (dict): Default headers, applied only when the session
+            is first created.
+
+    Returns:
+        requests.Session: Long-lived pooled session.
+    """
+    session = _SESSIONS.get(source)
+    if session is not None:
+        return session
+
+    with _REGISTRY_LOCK:
+        session = _SESSIONS.get(source)
+        if session is None:
+            session = _create_session(source, headers)
+            _SESSIONS[source] = session
+        return session
+
+
+def get_transport_stats(source: str) -> Dict[str, Any]:
+    """
+    Return connection counters for a source.
+
+    Returns:
+        dict: requests, connections_opened, connections_reused.
+    """
+    stats = _STATS.get(source)
+    if stats is None:
+        return {"source": source, "requests": 0,
+                "connections_opened": 0, "connections_reused": 0}
+    return stats.as_dict()
+
+
+def close_sessions():
+    """Close all pooled sessions (e.g. at process shutdown)."""
+    with _REGISTRY_LOCK:
+        for source, session in _SESSIONS.items():
+            log(f"🔌 [HTTP] Closing session for {source} → {get_transport_stats(source)}")
+            session.close()
+        _SESSIONS.clear()
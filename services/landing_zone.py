@@ -0,0 +1,380 @@
+"""
+landing_zone.py
+===============
+
+Raw landing zone for extracted API pages.
+
+Every page pulled from an API is persisted as gzip-compressed NDJSON
+before it is transformed, so a failed transform/load can be replayed
+from disk without touching the network.
+
+Layout:
+    <LANDING_DIR>/<source>/<YYYY-MM-DD>/<run_id>/
+        manifest.json
+        page-00001.ndjson.gz
+        page-00002.ndjson.gz
+        ...
+
+Features:
+- Partitioning by source, run date and run id
+- Streaming writer (one file per page) and streaming replay reader
+- Run manifest (window, pages, rows, status)
+- Retention policy: delete runs older than N days / beyond a size budget
+  (run once per scheduler cycle via `apply_retention_all`)
+- Compaction: merge page files of older runs into a single file
+
+Replay:
+    python main.py p2 --from-landing <run_id>
+
+Author: Chef Seasons – Data Engineering Team
+"""
+
+import glob
+import gzip
+import json
+import os
+import shutil
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+from config.settings import (
+    LANDING_DIR, LANDING_RETENTION_DAYS, LANDING_MAX_BYTES,
+    LANDING_DRAIN_ON_FAILURE, LANDING_DRAIN_MAX_PAGES
+)
+from utils.logger import log
+
+
+# ------------------------------------------------------------
+# CONFIGURABLE PARAMETERS
+# ------------------------------------------------------------
+COMPACT_AFTER_DAYS = 2          # merge page files of runs older than this
+REPLAY_CHUNK_ROWS = 5000        # rows per yielded chunk for compacted runs
+COMPACTED_FILE = "pages.ndjson.gz"
+MANIFEST_FILE = "manifest.json"
+
+
+# ------------------------------------------------------------
+# PATH HELPERS
+# ------------------------------------------------------------
+def new_run_id() -> str:
+    """Return a sortable run identifier (local time)."""
+    return datetime.now().strftime("%Y%m%dT%H%M%S%f")
+
+
+def _run_dir(source: str, run_id: str) -> Optional[str]:
+    """Locate the directory of an existing run."""
+    matches = glob.glob(os.path.join(LANDING_DIR, source, "*", run_id))
+    return matches[0] if matches else None
+
+
+def _write_manifest(run_dir: str, manifest: Dict[str, Any]):
+    tmp = os.path.join(run_dir, MANIFEST_FILE + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp, os.path.join(run_dir, MANIFEST_FILE))
+
+
+def read_manifest(source: str, run_id: str) -> Dict[str, Any]:
+    """
+    Read the manifest of a landed run.
+
+    Raises:
+        FileNotFoundError: If the run does not exist.
+    """
+    run_dir = _run_dir(source, run_id)
+    if run_dir is None:
+        raise FileNotFoundError(f"Landing run '{run_id}' not found for source {source}")
+    with open(os.path.join(run_dir, MANIFEST_FILE), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def list_runs(source: str) -> List[Dict[str, Any]]:
+    """Return manifests of all landed runs for a source (oldest first)."""
+    runs = []
+    for path in sorted(glob.glob(os.path.join(LANDING_DIR, source, "*", "*", MANIFEST_FILE))):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                runs.append(json.load(f))
+        except (OSError, ValueError):
+            continue
+    return sorted(runs, key=lambda m: m["run_id"])
+
+
+# ------------------------------------------------------------
+# WRITER
+# ------------------------------------------------------------
+class LandingWriter:
+    """
+    Streams extracted pages into a new landing run.
+
+    Usage:
+        writer = LandingWriter("api2", date_from, date_to)
+        for page in pages:
+            writer.write_page(page)
+        writer.close()              # or writer.close(status="failed")
+    """
+
+    def __init__(self, source: str, date_from: Optional[str], date_to: Optional[str],
+                 run_id: Optional[str] = None):
+        self.source = source
+        self.run_id = run_id or new_run_id()
+        self.run_dir = os.path.join(LANDING_DIR, source,
+                                    datetime.now().strftime("%Y-%m-%d"), self.run_id)
+        os.makedirs(self.run_dir, exist_ok=True)
+
+        self.manifest: Dict[str, Any] = {
+            "source": source,
+            "run_id": self.run_id,
+            "date_from": date_from,
+            "date_to": date_to,
+            "started_at": datetime.now().isoformat(timespec="seconds"),
+            "finished_at": None,
+            "status": "extracting",
+            "pages": 0,
+            "rows": 0,
+            "bytes": 0,
+            "compacted": False,
+        }
+        _write_manifest(self.run_dir, self.manifest)
+        log(f"🛬 [LANDING] {source} run {self.run_id} → {self.run_dir}")
+
+    def write_page(self, rows: List[Dict[str, Any]]):
+        """Persist one page as gzip NDJSON."""
+        self.manifest["pages"] += 1
+        path = os.path.join(self.run_dir, f"page-{self.manifest['pages']:05d}.ndjson.gz")
+
+        with gzip.open(path, "wt", encoding="utf-8", compresslevel=5) as f:
+            for row in rows:
+                f.write(json.dumps(row, ensure_ascii=False, separators=(",", ":"), default=str))
+                f.write("\n")
+
+        self.manifest["rows"] += len(rows)
+        self.manifest["bytes"] += os.path.getsize(path)
+
+    @property
+    def closed(self) -> bool:
+        return self.manifest["status"] != "extracting"
+
+    def write_rows(self, rows: List[Dict[str, Any]], rows_per_page: int = REPLAY_CHUNK_ROWS):
+        """Persist an already-merged payload as pages of `rows_per_page` rows."""
+        for start in range(0, len(rows), rows_per_page):
+            self.write_page(rows[start:start + rows_per_page])
+
+    def close(self, status: str = "complete"):
+        """Finalize the manifest (retention runs separately, see `apply_retention_all`)."""
+        self.manifest["status"] = status
+        self.manifest["finished_at"] = datetime.now().isoformat(timespec="seconds")
+        _write_manifest(self.run_dir, self.manifest)
+        log(f"🛬 [LANDING] {self.source} run {self.run_id} {status}: "
+            f"{self.manifest['pages']} pages, {self.manifest['rows']} rows, "
+            f"{self.manifest['bytes']} bytes")
+
+
+# ------------------------------------------------------------
+# STREAMING HELPERS
+# ------------------------------------------------------------
+def land_pages(pages: Iterator[List[Dict[str, Any]]],
+               writer: LandingWriter) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Pass-through generator that persists every page before yielding it.
+
+    The run is closed as "complete" when the source is exhausted and as
+    "failed" if extraction raises.
+    """
+    try:
+        for page in pages:
+            writer.write_page(page)
+            yield page
+    except GeneratorExit:
+        raise
+    except Exception:
+        writer.close(status="failed")
+        raise
+    writer.close()
+
+
+def drain_to_landing(landed: Iterator[List[Dict[str, Any]]], writer: LandingWriter,
+                     enabled: Optional[bool] = None, max_pages: Optional[int] = None):
+    """
+    Finalize a landing run after a transform/load failure.
+
+    With LANDING_DRAIN_ON_FAILURE, the remaining pages are extracted into
+    the landing zone first (at most LANDING_DRAIN_MAX_PAGES more pages),
+    so the full window can be replayed from disk. Otherwise, or when the
+    cap is hit, extraction stops and the run is closed as "failed" with
+    the pages landed so far.
+    """
+    if writer.closed:
+        return
+
+    enabled = LANDING_DRAIN_ON_FAILURE if enabled is None else enabled
+    max_pages = LANDING_DRAIN_MAX_PAGES if max_pages is None else max_pages
+
+    if enabled:
+        try:
+            for drained, _ in enumerate(landed, start=1):
+                if drained >= max_pages:
+                    log(f"⚠️ [LANDING] Drain cap of {max_pages} pages reached for run "
+                        f"{writer.run_id}", level="warning")
+                    break
+            else:
+                log(f"🛬 [LANDING] Remaining pages landed; replay with --from-landing {writer.run_id}")
+        except Exception as exc:
+            log(f"⚠️ [LANDING] Could not land remaining pages for run {writer.run_id}: {exc}",
+                level="warning")
+
+    if not writer.closed:
+        # stop the extraction (cancels in-flight requests) and keep what was landed
+        close = getattr(landed, "close", None)
+        if close is not None:
+            close()
+        writer.close(status="failed")
+
+
+# ------------------------------------------------------------
+# REPLAY READER
+# ------------------------------------------------------------
+def _read_ndjson(path: str) -> Iterator[Dict[str, Any]]:
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def iter_landing_pages(source: str, run_id: str) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Stream the pages of a landed run back, in original order.
+
+    Compacted runs are yielded in chunks of REPLAY_CHUNK_ROWS rows.
+
+    Raises:
+        FileNotFoundError: If the run does not exist.
+    """
+    run_dir = _run_dir(source, run_id)
+    if run_dir is None:
+        raise FileNotFoundError(f"Landing run '{run_id}' not found for source {source}")
+
+    manifest = read_manifest(source, run_id)
+    if manifest.get("status") != "complete":
+        log(f"⚠️ [LANDING] Replaying run {run_id} with status '{manifest.get('status')}'",
+            level="warning")
+
+    compacted = os.path.join(run_dir, COMPACTED_FILE)
+    if os.path.exists(compacted):
+        chunk: List[Dict[str, Any]] = []
+        for row in _read_ndjson(compacted):
+            chunk.append(row)
+            if len(chunk) >= REPLAY_CHUNK_ROWS:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+        return
+
+    for path in sorted(glob.glob(os.path.join(run_dir, "page-*.ndjson.gz"))):
+        yield list(_read_ndjson(path))
+
+
+# ------------------------------------------------------------
+# RETENTION / COMPACTION
+# ------------------------------------------------------------
+def _dir_size(path: str) -> int:
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
+
+
+def compact_run(run_dir: str):
+    """Merge a run's page files into a single compressed NDJSON file."""
+    pages = sorted(glob.glob(os.path.join(run_dir, "page-*.ndjson.gz")))
+    if not pages:
+        return
+
+    target = os.path.join(run_dir, COMPACTED_FILE)
+    tmp = target + ".tmp"
+    with gzip.open(tmp, "wt", encoding="utf-8", compresslevel=9) as out:
+        for path in pages:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                shutil.copyfileobj(f, out)
+    os.replace(tmp, target)
+
+    for path in pages:
+        os.remove(path)
+
+    with open(os.path.join(run_dir, MANIFEST_FILE), "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    manifest["compacted"] = True
+    manifest["bytes"] = os.path.getsize(target)
+    _write_manifest(run_dir, manifest)
+
+
+def apply_retention_all(sources: Sequence[str] = ("api1", "api2")):
+    """Apply the retention policy to every source (once per scheduler cycle)."""
+    for source in sources:
+        try:
+            apply_retention(source)
+        except Exception as exc:
+            log(f"⚠️ [LANDING] Retention failed for {source}: {exc}", level="warning")
+
+
+def apply_retention(source: str,
+                    retention_days: Optional[int] = None,
+                    max_bytes: Optional[int] = None):
+    """
+    Keep the landing zone bounded for a source:
+        1. delete runs older than `retention_days`
+        2. compact remaining runs older than COMPACT_AFTER_DAYS
+        3. delete oldest runs while total size exceeds `max_bytes`
+    """
+    retention_days = LANDING_RETENTION_DAYS if retention_days is None else retention_days
+    max_bytes = LANDING_MAX_BYTES if max_bytes is None else max_bytes
+
+    today = datetime.now().date()
+    runs = []  # (run_id, run_dir, partition_date)
+
+    for run_dir in glob.glob(os.path.join(LANDING_DIR, source, "*", "*")):
+        if not os.path.isdir(run_dir):
+            continue
+        try:
+            partition = datetime.strptime(os.path.basename(os.path.dirname(run_dir)), "%Y-%m-%d").date()
+        except ValueError:
+            continue
+        runs.append((os.path.basename(run_dir), run_dir, partition))
+
+    runs.sort()
+    kept = []
+    removed = compacted = 0
+
+    for run_id, run_dir, partition in runs:
+        if partition < today - timedelta(days=retention_days):
+            shutil.rmtree(run_dir, ignore_errors=True)
+            removed += 1
+            continue
+        if (partition < today - timedelta(days=COMPACT_AFTER_DAYS)
+                and not os.path.exists(os.path.join(run_dir, COMPACTED_FILE))):
+            compact_run(run_dir)
+            compacted += 1
+        kept.append((run_id, run_dir))
+
+    sizes = {run_dir: _dir_size(run_dir) for _, run_dir in kept}
+    total = sum(sizes.values())
+    for _, run_dir in kept[:-1]:  # never delete the newest run
+        if total <= max_bytes:
+            break
+        shutil.rmtree(run_dir, ignore_errors=True)
+        total -= sizes[run_dir]
+        removed += 1
+
+    # drop empty date partitions
+    for partition_dir in glob.glob(os.path.join(LANDING_DIR, source, "*")):
+        if os.path.isdir(partition_dir) and not os.listdir(partition_dir):
+            os.rmdir(partition_dir)
+
+    if removed or compacted:
+        log(f"🧹 [LANDING] {source}: removed {removed} run(s), compacted {compacted}, "
+            f"{total} bytes retained")
@@ -0,0 +1,198 @@
+"""
+page_size_controller.py
+=======================
+
+Adaptive page-size controller for paginated API sources.
+
+A hard-coded page size is either too small on quiet days (the run is
+dominated by round trips) or too large when the upstream slows down
+and requests start to time out. This controller:
+
+- Starts from the best size remembered for the source (or a default)
+- Grows / shrinks within server-allowed bounds based on per-page
+  latency, payload bytes and timeout history
+- Moves along a doubling ladder (…, S/2, S, 2S, …) so page offsets stay
+  aligned when the size changes mid-stream
+- Remembers the best observed size (highest rows/s without timeouts)
+  per source across runs in a small JSON state file
+- Logs every adjustment
+
+Author: Chef Seasons – Data Engineering Team
+"""
+
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from config.settings import PAGE_SIZE_STATE_PATH
+from utils.logger import log
+
+
+# ------------------------------------------------------------
+# CONFIGURABLE PARAMETERS
+# ------------------------------------------------------------
+TARGET_PAGE_LATENCY_SECONDS = 2.0     # grow below half of this, shrink above it
+MAX_PAGE_BYTES = 8 * 1024 * 1024      # never grow past ~8 MB responses
+OBSERVATION_WINDOW = 3                # pages observed per decision
+
+_STATE_LOCK = threading.Lock()
+
+
+class PageSizeController:
+    """Thread-safe adaptive page-size controller for a single source."""
+
+    def __init__(self, source: str, initial: int, min_size: int, max_size: int):
+        self.source = source
+        self.min_size = min_size
+        self.max_size = max_size
+        self._lock = threading.Lock()
+
+        # doubling ladder through `initial` → offsets stay aligned
+        ladder = [initial]
+        while ladder[0] // 2 >= min_size:
+            ladder.insert(0, ladder[0] // 2)
+        while ladder[-1] * 2 <= max_size:
+            ladder.append(ladder[-1] * 2)
+        self.ladder: List[int] = ladder
+
+        remembered = _load_state().get(source, {}).get("page_size")
+        self._index = ladder.index(remembered) if remembered in ladder else ladder.index(initial)
+
+        self._window: List[Dict[str, Any]] = []
+        self._per_size: Dict[int, Dict[str, float]] = {}
+        self.adjustments = 0
+
+    # -----------------------------
+    # STATE
+    # -----------------------------
+    @property
+    def page_size(self) -> int:
+        with self._lock:
+            return self.ladder[self._index]
+
+    def _size_stats(self, size: int) -> Dict[str, float]:
+        return self._per_size.setdefault(size, {"rows": 0, "seconds": 0.0, "pages": 0, "timeouts": 0})
+
+    def _move(self, step: int, reason: str):
+        new_index = min(max(self._index + step, 0), len(self.ladder) - 1)
+        if new_index == self._index:
+            return
+        old = self.ladder[self._index]
+        self._index = new_index
+        self._window.clear()
+        self.adjustments += 1
+        log(f"📐 [{self.source}] pageSize {old} → {self.ladder[new_index]} ({reason})")
+
+    # -----------------------------
+    # OBSERVATIONS
+    # -----------------------------
+    def observe(self, page_size: int, latency: float, nbytes: int, rows: int):
+        """Record a successful page fetch."""
+        with self._lock:
+            stats = self._size_stats(page_size)
+            stats["rows"] += rows
+            stats["seconds"] += latency
+            stats["pages"] += 1
+
+            # only pages at the current size drive decisions
+            if page_size != self.ladder[self._index]:
+                return
+
+            self._window.append({"latency": latency, "bytes": nbytes, "full": rows >= page_size})
+            if len(self._window) < OBSERVATION_WINDOW:
+                return
+
+            mean_latency = sum(o["latency"] for o in self._window) / len(self._window)
+            max_bytes = max(o["bytes"] for o in self._window)
+            all_full = all(o["full"] for o in self._window)
+
+            if mean_latency > TARGET_PAGE_LATENCY_SECONDS:
+                self._move(-1, f"slow pages, mean {mean_latency:.2f}s")
+            elif (all_full
+                  and mean_latency < TARGET_PAGE_LATENCY_SECONDS / 2
+                  and max_bytes * 2 <= MAX_PAGE_BYTES):
+                self._move(+1, f"fast pages, mean {mean_latency:.2f}s, {max_bytes} bytes")
+            else:
+                self._window.clear()
+
+    def observe_timeout(self, page_size: int):
+        """Record a timed-out page request → shrink immediately."""
+        with self._lock:
+            self._size_stats(page_size)["timeouts"] += 1
+            if page_size == self.ladder[self._index]:
+                self._move(-1, "timeout")
+
+    def size_for_offset(self, offset: int) -> int:
+        """
+        Return the largest usable size for a page starting at `offset`.
+
+        The target size is used when `offset` is a multiple of it;
+        otherwise the next smaller ladder size that aligns is used.
+        """
+        with self._lock:
+            for idx in range(self._index, -1, -1):
+                if offset % self.ladder[idx] == 0:
+                    return self.ladder[idx]
+            return self.ladder[0]
+
+    # -----------------------------
+    # PERSISTENCE
+    # -----------------------------
+    def best_size(self) -> Optional[int]:
+        """
+        Size to use next run: the highest rows/s size without timeouts.
+
+        If the controller moved to a size it could not measure in this
+        run (e.g. the move happened on the last pages) and no timeouts
+        occurred, that target is returned so it gets explored next run.
+        """
+        with self._lock:
+            target = self.ladder[self._index]
+            any_timeouts = any(s["timeouts"] for s in self._per_size.values())
+            if target not in self._per_size and not any_timeouts:
+                return target
+
+            candidates = [
+                (s["rows"] / s["seconds"], size)
+                for size, s in self._per_size.items()
+                if s["seconds"] > 0 and not s["timeouts"] and s["pages"] >= OBSERVATION_WINDOW
+            ]
+            if candidates:
+                return max(candidates)[1]
+            return target
+
+    def save(self):
+        """Persist the best size for the next run."""
+        best = self.best_size()
+        with _STATE_LOCK:
+            state = _load_state()
+            state[self.source] = {
+                "page_size": best,
+                "updated_at": datetime.now().isoformat(timespec="seconds"),
+            }
+            _save_state(state)
+        log(f"📐 [{self.source}] Remembered pageSize {best} for next run "
+            f"({self.adjustments} adjustment(s) this run)")
+
+
+# ------------------------------------------------------------
+# STATE FILE
+# ------------------------------------------------------------
+def _load_state() -> Dict[str, Any]:
+    try:
+        with open(PAGE_SIZE_STATE_PATH, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_state(state: Dict[str, Any]):
+    directory = os.path.dirname(PAGE_SIZE_STATE_PATH)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp = PAGE_SIZE_STATE_PATH + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp, PAGE_SIZE_STATE_PATH)
@@ -0,0 +1,104 @@
+"""
+reject_quarantine.py
+====================
+
+Replayable quarantine for rows rejected by schema validation.
+
+Schema validation tolerates a small share of invalid rows per run
+(etl/schema_validation.py: MAX_REJECT_RATIO, checked with
+`check_reject_ratio` over `QuarantineWriter.validated`) so one bad record
+does not fail a whole night's load. Since the watermark still advances
+after such a run, the rejected rows are written here instead of being
+dropped:
+
+Layout:
+    <QUARANTINE_DIR>/<pipeline>/<YYYY-MM-DD>/<run_id>.ndjson.gz
+
+Each line holds one rejected row:
+    {"table": "#P1_Staging", "error": "id is NULL (NOT NULL column)", "row": {...}}
+
+The file is only created when a run actually rejects rows. After fixing
+the data (or the schema), the rows can be fed back through the
+pipeline's schema and loader:
+
+    rows = [entry["row"] for entry in iter_quarantine(path)]
+    columns, records = TABLE_SCHEMA.apply(rows)
+
+Author: Chef Seasons – Data Engineering Team
+"""
+
+import gzip
+import json
+import os
+from collections import namedtuple
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+from config.settings import QUARANTINE_DIR
+from utils.logger import log
+
+
+# Outcome of one pipeline run: rows loaded, rows quarantined, quarantine file (or None)
+PipelineResult = namedtuple("PipelineResult", "rows rejected quarantine")
+
+
+# ------------------------------------------------------------
+# WRITER
+# ------------------------------------------------------------
+class QuarantineWriter:
+    """
+    Appends rejected rows of one pipeline run to a gzip NDJSON file.
+
+    Also counts every validated row of the run (`validated`), so the
+    reject tolerance can be checked over the whole run.
+
+    Usage:
+        quarantine = QuarantineWriter("pipeline1")
+        quarantine.write(TABLE_SCHEMA.drain_rejects(), accepted=len(values))
+        quarantine.close()
+        quarantine.count, quarantine.validated, quarantine.path
+    """
+
+    def __init__(self, pipeline: str, run_id: Optional[str] = None):
+        self.pipeline = pipeline
+        self.run_id = run_id or datetime.now().strftime("%Y%m%dT%H%M%S%f")
+        self.path = os.path.join(QUARANTINE_DIR, pipeline, datetime.now().strftime("%Y-%m-%d"),
+                                 f"{self.run_id}.ndjson.gz")
+        self.count = 0
+        self.validated = 0
+        self._file = None
+
+    def write(self, entries: Iterable[Dict[str, Any]], accepted: int = 0):
+        """Append rejected entries; `accepted` valid rows of the same batch are counted."""
+        self.validated += accepted
+        for entry in entries:
+            if self._file is None:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                self._file = gzip.open(self.path, "at", encoding="utf-8")
+            # values are post-transform (str / number / None); anything else → str
+            self._file.write(json.dumps(entry, ensure_ascii=False, default=str))
+            self._file.write("\n")
+            self.count += 1
+            self.validated += 1
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            log(f"🚧 [QUARANTINE] {self.pipeline}: {self.count} rejected rows → {self.path}",
+                level="warning")
+
+    def result(self, rows: int) -> PipelineResult:
+        """Pipeline result for `rows` loaded rows and this run's rejects."""
+        return PipelineResult(rows, self.count, self.path if self.count else None)
+
+
+# ------------------------------------------------------------
+# REPLAY READER
+# ------------------------------------------------------------
+def iter_quarantine(path: str) -> Iterator[Dict[str, Any]]:
+    """Yield the entries ({"table", "error", "row"}) of a quarantine file."""
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
@@ -0,0 +1,321 @@
+"""
+response_cache.py
+=================
+
+On-disk HTTP response cache with conditional revalidation.
+
+The nightly jobs re-request overlapping date windows, so most payloads
+were already downloaded on a previous run. This cache stores response
+bodies together with their validators and lets the API clients:
+
+- Serve fresh entries straight from disk (no network)
+- Revalidate stale entries with If-None-Match / If-Modified-Since
+- Serve 304 Not Modified responses from disk
+
+Features:
+- Cache key: (source, endpoint, params incl. page)
+- TTL derived from the age of the requested date window
+  (today's data is always revalidated, old data is effectively immutable)
+- Size-bounded LRU eviction (least recently used entries removed first),
+  driven by an in-memory index built once per process
+- Hit / miss / revalidation / bytes-saved statistics
+
+Author: Chef Seasons – Data Engineering Team
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional
+
+from config.settings import HTTP_CACHE_DIR, HTTP_CACHE_ENABLED
+from utils.logger import log
+
+
+# ------------------------------------------------------------
+# CONFIGURABLE PARAMETERS
+# ------------------------------------------------------------
+MAX_CACHE_BYTES = 512 * 1024 * 1024  # 512 MB
+
+# (max age of window end in days, TTL seconds) – first match wins
+TTL_BY_DATE_AGE = [
+    (0, 0),                # window touches today → always revalidate
+    (1, 60 * 60),          # yesterday → 1 hour
+    (6, 12 * 60 * 60),     # within the 7-day window → 12 hours
+]
+TTL_OLD_DATA_SECONDS = 30 * 24 * 60 * 60  # older data → 30 days
+TTL_UNDATED_SECONDS = 0                   # no date filter → always revalidate
+
+
+# ------------------------------------------------------------
+# CACHE ENTRY
+# ------------------------------------------------------------
+class CacheEntry:
+    """A cached response body plus its validators."""
+
+    def __init__(self, key: str, body_path: str, meta: Dict[str, Any]):
+        self.key = key
+        self.body_path = body_path
+        self.meta = meta
+
+    @property
+    def fresh(self) -> bool:
+        return time.time() - self.meta["stored_at"] < self.meta["ttl"]
+
+    @property
+    def size(self) -> int:
+        return self.meta.get("size", 0)
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """Headers for a conditional revalidation request."""
+        headers = {}
+        if self.meta.get("etag"):
+            headers["If-None-Match"] = self.meta["etag"]
+        if self.meta.get("last_modified"):
+            headers["If-Modified-Since"] = self.meta["last_modified"]
+        return headers
+
+    def read_body(self) -> bytes:
+        with open(self.body_path, "rb") as f:
+            return f.read()
+
+    def json(self) -> Any:
+        return json.loads(self.read_body())
+
+
+# ------------------------------------------------------------
+# CACHE
+# ------------------------------------------------------------
+class ResponseCache:
+    """Size-bounded on-disk LRU cache for API responses."""
+
+    def __init__(self, cache_dir: str, max_bytes: int = MAX_CACHE_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+
+        # LRU index: key → body size, least recently used first
+        self._index: "OrderedDict[str, int]" = OrderedDict()
+        self._total_bytes = 0
+        self._load_index()
+
+        # statistics
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self.bytes_saved = 0
+        self.evictions = 0
+
+    # -----------------------------
+    # KEYS / PATHS
+    # -----------------------------
+    @staticmethod
+    def make_key(source: str, endpoint: str, params: Optional[Dict[str, Any]]) -> str:
+        raw = json.dumps([source, endpoint, sorted((params or {}).items())],
+                         default=str, separators=(",", ":"))
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _paths(self, key: str):
+        base = os.path.join(self.cache_dir, key[:2], key)
+        return base + ".body", base + ".meta.json"
+
+    @staticmethod
+    def ttl_for_params(params: Optional[Dict[str, Any]]) -> int:
+        """
+        Derive a TTL from how old the requested window is.
+
+        Uses the `to` query parameter (YYYY-MM-DD) as the window end.
+        """
+        date_to = (params or {}).get("to")
+        if not date_to:
+            return TTL_UNDATED_SECONDS
+
+        try:
+            window_end = datetime.strptime(str(date_to)[:10], "%Y-%m-%d").date()
+        except ValueError:
+            return TTL_UNDATED_SECONDS
+
+        age_days = (date.today() - window_end).days
+        for max_age, ttl in TTL_BY_DATE_AGE:
+            if age_days <= max_age:
+                return ttl
+        return TTL_OLD_DATA_SECONDS
+
+    # -----------------------------
+    # LOOKUP / STORE
+    # -----------------------------
+    def lookup(self, source: str, endpoint: str,
+               params: Optional[Dict[str, Any]]) -> Optional[CacheEntry]:
+        """
+        Find a cached entry. Touches the entry for LRU bookkeeping.
+
+        Returns:
+            CacheEntry | None
+        """
+        key = self.make_key(source, endpoint, params)
+        body_path, meta_path = self._paths(key)
+
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            os.utime(body_path)  # mark as recently used (survives restarts)
+        except (OSError, ValueError):
+            return None
+
+        with self._lock:
+            if key in self._index:
+                self._index.move_to_end(key)
+
+        return CacheEntry(key, body_path, meta)
+
+    def store(self, source: str, endpoint: str, params: Optional[Dict[str, Any]],
+              body: bytes, headers) -> CacheEntry:
+        """
+        Persist a 200 response body and its validators.
+
+        Args:
+            headers: Response headers (case-insensitive mapping).
+        """
+        key = self.make_key(source, endpoint, params)
+        body_path, meta_path = self._paths(key)
+        os.makedirs(os.path.dirname(body_path), exist_ok=True)
+
+        meta = {
+            "source": source,
+            "endpoint": endpoint,
+            "params": {k: str(v) for k, v in (params or {}).items()},
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+            "stored_at": time.time(),
+            "ttl": self.ttl_for_params(params),
+            "size": len(body),
+        }
+
+        tmp_body = body_path + ".tmp"
+        with open(tmp_body, "wb") as f:
+            f.write(body)
+        os.replace(tmp_body, body_path)
+
+        self._write_meta(meta_path, meta)
+
+        with self._lock:
+            self.misses += 1
+            self._total_bytes += len(body) - self._index.pop(key, 0)
+            self._index[key] = len(body)
+
+        self._evict_if_needed()
+        return CacheEntry(key, body_path, meta)
+
+    @staticmethod
+    def _write_meta(meta_path: str, meta: Dict[str, Any]):
+        tmp_meta = meta_path + ".tmp"
+        with open(tmp_meta, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(tmp_meta, meta_path)
+
+    def record_fresh_hit(self, entry: CacheEntry):
+        """Count a response served from disk without any request."""
+        with self._lock:
+            self.hits += 1
+            self.bytes_saved += entry.size
+
+    def record_not_modified(self, entry: CacheEntry, params: Optional[Dict[str, Any]]):
+        """Count a 304 revalidation and renew the entry's freshness."""
+        entry.meta["stored_at"] = time.time()
+        entry.meta["ttl"] = self.ttl_for_params(params)
+        _, meta_path = self._paths(entry.key)
+        try:
+            self._write_meta(meta_path, entry.meta)
+        except OSError as exc:
+            log(f"⚠️ [CACHE] Could not refresh metadata for {entry.key}: {exc}", level="warning")
+
+        with self._lock:
+            self.revalidated += 1
+            self.bytes_saved += entry.size
+
+    # -----------------------------
+    # EVICTION
+    # -----------------------------
+    def _load_index(self):
+        """Build the LRU index from disk once (file mtime = last use)."""
+        entries = []
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if not name.endswith(".body"):
+                    continue
+                try:
+                    st = os.stat(os.path.join(root, name))
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, name[:-len(".body")], st.st_size))
+
+        entries.sort()  # oldest access first
+        for _, key, size in entries:
+            self._index[key] = size
+            self._total_bytes += size
+
+    def _evict_if_needed(self):
+        """Delete least recently used entries until under `max_bytes`."""
+        victims: List[str] = []
+        with self._lock:
+            while self._total_bytes > self.max_bytes and len(self._index) > 1:
+                key, size = self._index.popitem(last=False)
+                self._total_bytes -= size
+                self.evictions += 1
+                victims.append(key)
+            total = self._total_bytes
+
+        if not victims:
+            return
+
+        for key in victims:
+            for p in self._paths(key):
+                try:
+                    os.remove(p)
+                except OSError:
+                    pass
+
+        log(f"🧹 [CACHE] LRU eviction of {len(victims)} entries → {total} bytes in cache")
+
+    # -----------------------------
+    # STATISTICS
+    # -----------------------------
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.revalidated + self.misses
+            return {
+                "hits": self.hits,
+                "revalidated": self.revalidated,
+                "misses": self.misses,
+                "hit_rate": round((self.hits + self.revalidated) / lookups, 3) if lookups else 0.0,
+                "bytes_saved": self.bytes_saved,
+                "evictions": self.evictions,
+            }
+
+
+# ------------------------------------------------------------
+# SHARED INSTANCE
+# ------------------------------------------------------------
+_CACHE: Optional[ResponseCache] = None
+_CACHE_LOCK = threading.Lock()
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """
+    Return the shared response cache, or None when caching is disabled
+    via HTTP_CACHE_ENABLED.
+    """
+    global _CACHE
+
+    if not HTTP_CACHE_ENABLED:
+        return None
+
+    with _CACHE_LOCK:
+        if _CACHE is None:
+            _CACHE = ResponseCache(HTTP_CACHE_DIR)
+        return _CACHE
@@ -0,0 +1,349 @@
+"""
+retry_policy.py
+===============
+
+Reusable retry / throttle policy shared by all API clients.
+
+This module provides:
+- Token-bucket request rate limiting, engaged only once the upstream
+  throttles (AIMD: halves on 429, recovers slowly, released at the ceiling)
+- `Retry-After` header support (delta-seconds and HTTP-date forms)
+- Exponential backoff with full jitter
+- Circuit breaker that fails fast once an upstream is clearly down
+- Runtime state snapshot for monitoring (rate, circuit state, sleep time)
+
+Usage:
+    policy = get_policy("api1")
+    policy.before_request()            # may raise CircuitOpenError
+    ...
+    policy.record_success()            # on 2xx
+    policy.retry_wait(attempt, response)  # on 429 / 5xx / network error
+
+Author: Chef Seasons – Data Engineering Team
+"""
+
+import random
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Optional
+
+from utils.logger import log
+
+
+# ------------------------------------------------------------
+# CONFIGURABLE PARAMETERS
+# ------------------------------------------------------------
+INITIAL_RATE_PER_SEC = 10.0    # rate on first 429 if the observed rate is unknown
+MIN_RATE_PER_SEC = 0.5         # floor after repeated throttling
+MAX_RATE_PER_SEC = 50.0        # reaching this during recovery releases the limiter
+RATE_SAMPLE_SIZE = 20          # recent requests used to estimate the observed rate
+RATE_DECREASE_FACTOR = 0.5     # multiplicative decrease on 429
+RATE_INCREASE_STEP = 0.5       # additive increase per success
+BURST_CAPACITY = 5             # token bucket size
+
+BASE_BACKOFF_SECONDS = 2.0     # first retry delay (before jitter)
+MAX_BACKOFF_SECONDS = 60.0     # cap for exponential backoff / Retry-After
+
+FAILURE_THRESHOLD = 5          # consecutive failures before opening circuit
+CIRCUIT_COOLDOWN_SECONDS = 60  # how long the circuit stays open
+PROBE_WAIT_SECONDS = 60        # max wait for an in-flight half-open probe
+
+CIRCUIT_CLOSED = "closed"
+CIRCUIT_OPEN = "open"
+CIRCUIT_HALF_OPEN = "half-open"
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised when a request is attempted while the circuit is open."""
+
+
+# ------------------------------------------------------------
+# HELPERS
+# ------------------------------------------------------------
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a `Retry-After` header value.
+
+    Args:
+        value (str): Either delta-seconds ("30") or an HTTP-date.
+
+    Returns:
+        float | None: Seconds to wait, or None if absent/unparseable.
+    """
+    if not value:
+        return None
+
+    value = value.strip()
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max((when - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+# ------------------------------------------------------------
+# POLICY
+# ------------------------------------------------------------
+class RetryPolicy:
+    """
+    Thread-safe rate limiter + backoff + circuit breaker for one source.
+
+    All sleeping happens outside the internal lock, so concurrent
+    workers (e.g. API 2 page fetchers) never block each other on it.
+    """
+
+    def __init__(self,
+                 name: str,
+                 rate: Optional[float] = None,
+                 base_backoff: float = BASE_BACKOFF_SECONDS):
+        self.name = name
+        self.base_backoff = base_backoff
+        self._lock = threading.Lock()
+        self._probe_done = threading.Condition(self._lock)
+
+        # token bucket (rate None → unlimited until the upstream throttles)
+        self._rate = rate
+        self._recent_requests = deque(maxlen=RATE_SAMPLE_SIZE)
+        self._tokens = float(BURST_CAPACITY)
+        self._last_refill = time.monotonic()
+
+        # circuit breaker
+        self._state = CIRCUIT_CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._half_open_probe = False
+        self._probe_owner: Optional[int] = None
+
+        # metrics
+        self.total_sleep_seconds = 0.0
+        self.throttled_responses = 0
+        self.failures = 0
+        self.successes = 0
+        self.circuit_trips = 0
+
+    # -----------------------------
+    # INTERNALS
+    # -----------------------------
+    def _sleep(self, seconds: float):
+        if seconds <= 0:
+            return
+        time.sleep(seconds)
+        with self._lock:
+            self.total_sleep_seconds += seconds
+
+    def _observed_rate(self, now: float) -> float:
+        if len(self._recent_requests) < 2 or now <= self._recent_requests[0]:
+            return INITIAL_RATE_PER_SEC
+        return len(self._recent_requests) / (now - self._recent_requests[0])
+
+    def _refill(self, now: float):
+        elapsed = now - self._last_refill
+        self._tokens = min(BURST_CAPACITY, self._tokens + elapsed * self._rate)
+        self._last_refill = now
+
+    def _check_circuit(self, now: float):
+        # called with the lock held; may wait for an in-flight probe
+        deadline = now + PROBE_WAIT_SECONDS
+        while True:
+            if self._state == CIRCUIT_OPEN:
+                if now - self._opened_at < CIRCUIT_COOLDOWN_SECONDS:
+                    raise CircuitOpenError(
+                        f"{self.name}: circuit open, upstream considered down "
+                        f"(retry in {CIRCUIT_COOLDOWN_SECONDS - (now - self._opened_at):.0f}s)"
+                    )
+                self._state = CIRCUIT_HALF_OPEN
+                self._half_open_probe = False
+                log(f"🟡 [{self.name}] Circuit half-open, sending probe request")
+
+            if self._state != CIRCUIT_HALF_OPEN:
+                return
+
+            if not self._half_open_probe:
+                self._half_open_probe = True
+                self._probe_owner = threading.get_ident()
+                return
+
+            # another worker is probing → wait for its outcome instead of failing
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise CircuitOpenError(f"{self.name}: circuit half-open, probe still in progress")
+            self._probe_done.wait(remaining)
+            now = time.monotonic()
+
+    def _clear_probe(self):
+        self._half_open_probe = False
+        self._probe_owner = None
+        self._probe_done.notify_all()
+
+    # -----------------------------
+    # PUBLIC API
+    # -----------------------------
+    def before_request(self):
+        """
+        Gate a request: fail fast if the circuit is open, otherwise wait
+        for a token from the rate limiter.
+
+        Raises:
+            CircuitOpenError: If the circuit breaker is open.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._check_circuit(now)
+            self._recent_requests.append(now)
+
+            if self._rate is None:
+                return
+
+            self._refill(now)
+            self._tokens -= 1.0
+            wait = -self._tokens / self._rate if self._tokens < 0 else 0.0
+
+        self._sleep(wait)
+
+    def record_success(self):
+        """Register a successful response (closes circuit, recovers rate)."""
+        with self._lock:
+            self.successes += 1
+            self._consecutive_failures = 0
+            if self._state != CIRCUIT_CLOSED:
+                log(f"🟢 [{self.name}] Circuit closed again")
+            self._state = CIRCUIT_CLOSED
+            self._clear_probe()
+            if self._rate is not None:
+                self._rate += RATE_INCREASE_STEP
+                if self._rate >= MAX_RATE_PER_SEC:
+                    self._rate = None
+                    log(f"🐇 [{self.name}] Rate recovered → limiter released")
+
+    def record_failure(self, throttled: bool = False):
+        """
+        Register a retryable failure (429, 5xx, timeout, network error).
+
+        Args:
+            throttled (bool): True for HTTP 429 → rate is reduced.
+        """
+        with self._lock:
+            self.failures += 1
+            self._consecutive_failures += 1
+
+            if throttled:
+                self.throttled_responses += 1
+                now = time.monotonic()
+                if self._rate is None:
+                    # engage the bucket just below the rate that got throttled
+                    self._rate = self._observed_rate(now)
+                    self._tokens = 0.0
+                    self._last_refill = now
+                self._rate = max(MIN_RATE_PER_SEC, self._rate * RATE_DECREASE_FACTOR)
+                log(f"🐢 [{self.name}] Throttled → rate reduced to {self._rate:.2f} req/s",
+                    level="warning")
+
+            if (self._state == CIRCUIT_HALF_OPEN
+                    or self._consecutive_failures >= FAILURE_THRESHOLD):
+                if self._state != CIRCUIT_OPEN:
+                    self.circuit_trips += 1
+                    log(f"🔴 [{self.name}] Circuit opened after "
+                        f"{self._consecutive_failures} consecutive failures", level="error")
+                self._state = CIRCUIT_OPEN
+                self._opened_at = time.monotonic()
+                self._clear_probe()
+
+    def release_probe(self):
+        """
+        Release the half-open probe held by the calling thread, if any.
+
+        Call it in a `finally` around each request: responses that are
+        neither a success nor a retryable failure (e.g. a 4xx) would
+        otherwise keep the probe slot taken forever.
+        """
+        with self._lock:
+            if self._half_open_probe and self._probe_owner == threading.get_ident():
+                self._clear_probe()
+
+    def backoff_delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """
+        Compute the delay before the next retry.
+
+        `Retry-After` wins when present; otherwise exponential backoff
+        with full jitter: uniform(0, base * 2^(attempt-1)).
+        """
+        if retry_after is not None:
+            return min(retry_after, MAX_BACKOFF_SECONDS)
+
+        ceiling = min(MAX_BACKOFF_SECONDS, self.base_backoff * (2 ** (attempt - 1)))
+        return random.uniform(0, ceiling)
+
+    def retry_wait(self, attempt: int, response=None):
+        """
+        Record a retryable failure and sleep before the next attempt.
+
+        Args:
+            attempt (int): 1-based attempt number that just failed.
+            response: Optional HTTP response (used for status/Retry-After).
+        """
+        status = getattr(response, "status_code", None)
+        retry_after = None
+        if response is not None:
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+
+        self.record_failure(throttled=(status == 429))
+        self._sleep(self.backoff_delay(attempt, retry_after))
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return current policy state for monitoring."""
+        with self._lock:
+            return {
+                "source": self.name,
+                "rate_per_sec": "unlimited" if self._rate is None else round(self._rate, 3),
+                "circuit_state": self._state,
+                "consecutive_failures": self._consecutive_failures,
+                "total_sleep_seconds": round(self.total_sleep_seconds, 3),
+                "throttled_responses": self.throttled_responses,
+                "failures": self.failures,
+                "successes": self.successes,
+                "circuit_trips": self.circuit_trips,
+            }
+
+
+# ------------------------------------------------------------
+# POLICY REGISTRY
+# ------------------------------------------------------------
+_POLICIES: Dict[str, RetryPolicy] = {}
+_REGISTRY_LOCK = threading.Lock()
+
+
+def get_policy(source: str, base_backoff: float = BASE_BACKOFF_SECONDS) -> RetryPolicy:
+    """
+    Return the shared policy for `source`, creating it on first use.
+
+    Args:
+        source (str): Logical source name (e.g. "api1", "api2").
+        base_backoff (float): First retry delay, used on creation only.
+
+    Returns:
+        RetryPolicy
+    """
+    with _REGISTRY_LOCK:
+        policy = _POLICIES.get(source)
+        if policy is None:
+            policy = RetryPolicy(source, base_backoff=base_backoff)
+            _POLICIES[source] = policy
+        return policy
+
+
+def get_policy_stats() -> Dict[str, Dict[str, Any]]:
+    """Return state snapshots for all registered policies."""
+    with _REGISTRY_LOCK:
+        policies = list(_POLICIES.values())
+    return {p.name: p.snapshot() for p in policies}
@@ -6,9 +6,13 @@ Centralized scheduling system for periodic ETL execution.
 
 New Requirements:
 - Run ETL once per day at 22:00
-- For each run, only fetch data for the last 7 calendar days including today.
+- Each run extracts incrementally from the pipeline's watermark
+  (last successful load − safety lookback, rounded down to a calendar
+  day) up to today; in steady state that is yesterday → today.
+- Without a watermark (first run) or with `full_window=True`, fetch the
+  last 7 calendar days including today.
   Example:
-      If today is 2025-12-07, date window = 2025-12-01 → 2025-12-07
+      If today is 2025-12-07, full window = 2025-12-01 → 2025-12-07
 
 
 """
@@ -18,13 +22,24 @@ from datetime import datetime, timedelta
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.cron import CronTrigger
 
+from config.settings import LANDING_ENABLED
 from etl.etl_pipeline_1 import run_pipeline as run_pipeline_1
-from etl.etl_pipeline_1 import run_pipeline as run_pipeline_2
+from etl.etl_pipeline_2 import run_pipeline as run_pipeline_2
 from utils.logger import log
+from services.db_service import get_db_pool_stats, warm_db_pool
 from services.etl_monitor import ETLMonitor
+from services.landing_zone import apply_retention_all
+from services.watermark_store import (
+    compute_incremental_window,
+    set_watermark,
+    watermark_after_run
+)
 
 monitor = ETLMonitor()
 
+WARMUP_CONNECTIONS = 2   # one per pipeline running at 22:00
+
+
 def get_last_7_days_window() -> tuple[str, str]:
     """
     Calculate the date window for the last 7 days including today.
@@ -45,24 +60,85 @@ def get_last_7_days_window() -> tuple[str, str]:
     )
 
 
+def run_pipeline_once(pipeline_key: str, run_fn, full_window: bool = False):
+    """
+    Run a pipeline once over its incremental window and advance its
+    watermark on success.
+
+    Args:
+        pipeline_key (str): Watermark key ("pipeline1" / "pipeline2").
+        run_fn (callable): Pipeline entry point run_pipeline(date_from, date_to).
+        full_window (bool): Ignore the watermark and use the last 7 days.
+
+    Returns:
+        PipelineResult: Rows loaded and rows quarantined by the pipeline.
+    """
+    started_at = datetime.now()
+
+    if full_window:
+        date_from, date_to = get_last_7_days_window()
+    else:
+        date_from, date_to = compute_incremental_window(pipeline_key, now=started_at)
+
+    log(f" [{pipeline_key}] Extraction window {date_from} → {date_to}")
+
+    result = run_fn(date_from, date_to)
+
+    # Extraction start time is the new watermark: records arriving while
+    # the run was in progress are picked up by the next run. A window
+    # clamped to MAX_WINDOW_DAYS only advances it to the window end.
+    # Rejected rows are not lost with it: they stay replayable in the
+    # quarantine file.
+    set_watermark(pipeline_key, watermark_after_run(date_to, started_at),
+                  rows_loaded=result.rows)
+    if result.rejected:
+        log(f"🚧 [{pipeline_key}] {result.rejected} rejected rows quarantined → {result.quarantine}",
+            level="warning")
+    return result
+
+
+def warm_up_job():
+    """Open pooled DB connections ahead of the 22:00 jobs."""
+    try:
+        warm_db_pool(WARMUP_CONNECTIONS)
+    except Exception as exc:
+        # not fatal: the jobs open connections on demand
+        log(f"⚠️ DB pool warm-up failed: {exc}", level="warning")
+
+
+def landing_retention_job():
+    """Expire and compact landing runs once per cycle, before the jobs."""
+    if LANDING_ENABLED:
+        apply_retention_all()
+
+
+def _log_pool_stats():
+    stats = get_db_pool_stats()
+    log(f"🔌 [DB POOL] created={stats['created']} reused={stats['reused']} "
+        f"discarded={stats['discarded']} evicted={stats['evicted']} "
+        f"waits={stats['waits']} wait_s={stats['wait_seconds']} max_wait_s={stats['max_wait_seconds']}")
+
+
 def run_pipeline_1_job():
-    date_from, date_to = get_last_7_days_window()
     monitor.pipeline1.start()
     try:
-        rows = run_pipeline_1(date_from, date_to)
-        monitor.pipeline1.finish_success(rows)
+        result = run_pipeline_once("pipeline1", run_pipeline_1)
+        monitor.pipeline1.finish_success(result.rows, rejected=result.rejected)
     except Exception as exc:
         monitor.pipeline1.finish_failure(str(exc))
+    finally:
+        _log_pool_stats()
 
 
 def run_pipeline_2_job():
-    date_from, date_to = get_last_7_days_window()
     monitor.pipeline2.start()
     try:
-        rows = run_pipeline_2(date_from, date_to)
-        monitor.pipeline2.finish_success(rows)
+        result = run_pipeline_once("pipeline2", run_pipeline_2)
+        monitor.pipeline2.finish_success(result.rows, rejected=result.rejected)
     except Exception as exc:
         monitor.pipeline2.finish_failure(str(exc))
+    finally:
+        _log_pool_stats()
 
 
 def start_scheduler():
@@ -70,6 +146,8 @@ def start_scheduler():
     Initialize and start the ETL job scheduler.
 
     Scheduled Jobs:
+        - Landing   → Retention / compaction at 21:55
+        - DB pool   → Pre-warm at 21:58
         - Pipeline 1 → Every day at 22:00
         - Pipeline 2 → Every day at 22:00
 
@@ -81,12 +159,30 @@ def start_scheduler():
 
     scheduler = BackgroundScheduler()
 
+    # ---- Landing zone retention: once per cycle, before the jobs ----
+    scheduler.add_job(
+        landing_retention_job,
+        CronTrigger(hour=21, minute=55),
+        id="landing_retention",
+        name="Landing zone retention / compaction",
+        replace_existing=True,
+    )
+
+    # ---- DB connection warm-up: shortly before the jobs ----
+    scheduler.add_job(
+        warm_up_job,
+        CronTrigger(hour=21, minute=58),
+        id="db_pool_warmup",
+        name="DB connection pool warm-up",
+        replace_existing=True,
+    )
+
     # ---- Pipeline 1: every day at 22:00 ----
     scheduler.add_job(
         run_pipeline_1_job,
         CronTrigger(hour=22, minute=0),
         id="pipeline1_daily",
-        name="Pipeline 1 - Daily ETL Run (last 7 days)",
+        name="Pipeline 1 - Daily ETL Run (incremental)",
         replace_existing=True,
     )
 
@@ -95,7 +191,7 @@ def start_scheduler():
         run_pipeline_2_job,
         CronTrigger(hour=22, minute=0),
         id="pipeline2_daily",
-        name="Pipeline 2 - Daily ETL Run (last 7 days)",
+        name="Pipeline 2 - Daily ETL Run (incremental)",
         replace_existing=True,
     )
 
@@ -0,0 +1,277 @@
+"""
+table_metadata.py
+=================
+
+Target-table column metadata cache for the SQL Server loaders (pyodbc,
+pymssql).
+
+With `fast_executemany` and no parameter type hints, pyodbc guesses the
+parameter types from the first row — NVARCHAR lengths, FLOAT vs. string
+dates and NULL-only columns then cause slow fallbacks or truncation
+errors. This module:
+
+- Reads a target table's `INFORMATION_SCHEMA.COLUMNS` once (same query
+  as sql/schema_validation.sql) and caches it per table with a TTL
+- Reorders a batch's columns into the table's ordinal order and rejects
+  columns the table does not have before anything is sent
+- Builds exact `cursor.setinputsizes` hints (SQL type, size, scale)
+- Coerces values to the bound types (e.g. 'YYYY-MM-DD HH:MM:SS' strings
+  → datetime for DATETIME columns)
+
+Author: Chef Seasons – Data Engineering Team
+"""
+
+import threading
+import time
+from collections import namedtuple
+from datetime import date, datetime
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from config.settings import TABLE_METADATA_TTL_SECONDS
+from utils.logger import log
+
+
+ColumnInfo = namedtuple(
+    "ColumnInfo", "name data_type max_length precision scale nullable ordinal"
+)
+
+
+# ------------------------------------------------------------
+# METADATA QUERY
+# ------------------------------------------------------------
+def _metadata_sql(table_name: str, placeholder: str = "?") -> Tuple[str, Tuple[str, str]]:
+    """
+    INFORMATION_SCHEMA query (+ params) for a one-, two- or three-part name.
+
+    `placeholder` is the driver's parameter marker ("?" for pyodbc, "%s"
+    for pymssql).
+    """
+    parts = table_name.replace("[", "").replace("]", "").split(".")
+    table = parts[-1]
+    schema = parts[-2] if len(parts) >= 2 else "dbo"
+    catalog = f"{parts[-3]}." if len(parts) >= 3 else ""
+
+    sql = (
+        "SELECT COLUMN_NAME, DATA_TYPE, CHARACTER_MAXIMUM_LENGTH, NUMERIC_PRECISION, "
+        "NUMERIC_SCALE, IS_NULLABLE, ORDINAL_POSITION "
+        f"FROM {catalog}INFORMATION_SCHEMA.COLUMNS "
+        f"WHERE TABLE_SCHEMA = {placeholder} AND TABLE_NAME = {placeholder} "
+        "ORDER BY ORDINAL_POSITION"
+    )
+    return sql, (schema, table)
+
+
+def _fetch_columns(conn: Any, table_name: str, placeholder: str = "?") -> Dict[str, ColumnInfo]:
+    sql, params = _metadata_sql(table_name, placeholder)
+    cursor = conn.cursor()
+    try:
+        cursor.execute(sql, params)
+        rows = cursor.fetchall()
+    finally:
+        cursor.close()
+
+    if not rows:
+        raise RuntimeError(f"No column metadata found for table {table_name}")
+
+    return {
+        str(name).lower(): ColumnInfo(
+            name=str(name),
+            data_type=str(data_type).lower(),
+            max_length=max_length,
+            precision=precision,
+            scale=scale,
+            nullable=str(nullable).upper() == "YES",
+            ordinal=int(ordinal),
+        )
+        for name, data_type, max_length, precision, scale, nullable, ordinal in rows
+    }
+
+
+# ------------------------------------------------------------
+# CACHE
+# ------------------------------------------------------------
+class TableMetadataCache:
+    """
+    Per-table column metadata with a TTL.
+
+    Args:
+        ttl (float, optional): Seconds before metadata is re-read
+            (default TABLE_METADATA_TTL_SECONDS; 0 → never expires).
+        placeholder (str): Parameter marker of the driver ("?" or "%s").
+    """
+
+    def __init__(self, ttl: Optional[float] = None, placeholder: str = "?"):
+        self.ttl = TABLE_METADATA_TTL_SECONDS if ttl is None else ttl
+        self.placeholder = placeholder
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Tuple[float, Dict[str, ColumnInfo]]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, conn: Any, table_name: str) -> Dict[str, ColumnInfo]:
+        """Column metadata of `table_name` (lower-case name → ColumnInfo)."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(table_name)
+            if entry is not None and (not self.ttl or now - entry[0] < self.ttl):
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        columns = _fetch_columns(conn, table_name, self.placeholder)
+        with self._lock:
+            self._entries[table_name] = (now, columns)
+        log(f"📐 [METADATA] Cached {len(columns)} column definitions for {table_name}")
+        return columns
+
+    def invalidate(self, table_name: Optional[str] = None):
+        """Forget one table (or all tables), e.g. after a failed load."""
+        with self._lock:
+            if table_name is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(table_name, None)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"tables": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+# ------------------------------------------------------------
+# COLUMN ORDER
+# ------------------------------------------------------------
+def ordered_columns(metadata: Dict[str, ColumnInfo], table_name: str,
+                    columns: Sequence[str]) -> List[str]:
+    """
+    Batch columns in the table's ordinal order.
+
+    Raises:
+        RuntimeError: If the batch has columns the table does not.
+    """
+    unknown = [c for c in columns if c.lower() not in metadata]
+    if unknown:
+        raise RuntimeError(f"Columns not found in {table_name}: {unknown}")
+    return sorted(columns, key=lambda c: metadata[c.lower()].ordinal)
+
+
+# ------------------------------------------------------------
+# INPUT SIZES (pyodbc)
+# ------------------------------------------------------------
+def input_sizes(metadata: Dict[str, ColumnInfo], columns: Sequence[str]) -> List[Tuple[int, int, int]]:
+    """`cursor.setinputsizes` hints — (SQL type, size, decimal digits) per column."""
+    import pyodbc
+
+    sizes = []
+    for column in columns:
+        info = metadata[column.lower()]
+        t = info.data_type
+        length = info.max_length
+
+        if t in ("nvarchar", "nchar", "ntext", "varchar", "char", "text"):
+            wide = t.startswith("n")
+            sql_type = pyodbc.SQL_WVARCHAR if wide else pyodbc.SQL_VARCHAR
+            # (n)varchar(max) is reported as -1 → size 0 streams the value
+            sizes.append((sql_type, 0 if length is None or length < 0 else int(length), 0))
+        elif t == "bigint":
+            sizes.append((pyodbc.SQL_BIGINT, 19, 0))
+        elif t == "int":
+            sizes.append((pyodbc.SQL_INTEGER, 10, 0))
+        elif t == "smallint":
+            sizes.append((pyodbc.SQL_SMALLINT, 5, 0))
+        elif t == "tinyint":
+            sizes.append((pyodbc.SQL_TINYINT, 3, 0))
+        elif t == "bit":
+            sizes.append((pyodbc.SQL_BIT, 1, 0))
+        elif t == "float":
+            sizes.append((pyodbc.SQL_DOUBLE, 53, 0))
+        elif t == "real":
+            sizes.append((pyodbc.SQL_REAL, 24, 0))
+        elif t in ("decimal", "numeric", "money", "smallmoney"):
+            sizes.append((pyodbc.SQL_DECIMAL, int(info.precision or 18), int(info.scale or 0)))
+        elif t == "date":
+            sizes.append((pyodbc.SQL_TYPE_DATE, 10, 0))
+        elif t in ("datetime", "smalldatetime"):
+            sizes.append((pyodbc.SQL_TYPE_TIMESTAMP, 23, 3))
+        elif t == "datetime2":
+            sizes.append((pyodbc.SQL_TYPE_TIMESTAMP, 27, 7))
+        else:
+            # unknown types: let the driver describe the parameter
+            sizes.append((pyodbc.SQL_WVARCHAR, 0, 0))
+    return sizes
+
+
+# ------------------------------------------------------------
+# VALUE COERCION
+# ------------------------------------------------------------
+def _to_datetime(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, date):
+        return datetime(value.year, value.month, value.day)
+    return datetime.fromisoformat(str(value))
+
+
+def _to_date(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
+
+def _to_int(value: Any) -> Any:
+    return value if type(value) is int else int(value)
+
+
+def _to_float(value: Any) -> Any:
+    return value if type(value) is float else float(value)
+
+
+def _to_bool(value: Any) -> Any:
+    return value if type(value) is bool else bool(int(value))
+
+
+def _to_str(value: Any) -> Any:
+    return value if type(value) is str else str(value)
+
+
+_COERCERS: Dict[str, Callable[[Any], Any]] = {
+    "bigint": _to_int, "int": _to_int, "smallint": _to_int, "tinyint": _to_int,
+    "bit": _to_bool,
+    "float": _to_float, "real": _to_float,
+    "date": _to_date,
+    "datetime": _to_datetime, "smalldatetime": _to_datetime, "datetime2": _to_datetime,
+    "nvarchar": _to_str, "nchar": _to_str, "ntext": _to_str,
+    "varchar": _to_str, "char": _to_str, "text": _to_str,
+}
+
+
+def coerce_rows(metadata: Dict[str, ColumnInfo], table_name: str,
+                source_columns: Sequence[str], target_columns: Sequence[str],
+                values: List[Any]) -> List[tuple]:
+    """
+    Reorder rows from `source_columns` to `target_columns` order and
+    coerce every non-NULL value to its column's bound type.
+
+    Raises:
+        RuntimeError: If a value cannot be converted (column + row index).
+    """
+    index = [list(source_columns).index(c) for c in target_columns]
+    coercers = [_COERCERS.get(metadata[c.lower()].data_type) for c in target_columns]
+    plan = list(zip(index, coercers, target_columns))
+
+    out = []
+    for row_no, row in enumerate(values):
+        converted = []
+        for i, coerce, column in plan:
+            value = row[i]
+            if value is not None and coerce is not None:
+                try:
+                    value = coerce(value)
+                except (TypeError, ValueError) as exc:
+                    raise RuntimeError(
+                        f"Cannot bind {column}={value!r} (row {row_no}) for {table_name}: {exc}"
+                    )
+            converted.append(value)
+        out.append(tuple(converted))
+    return out
@@ -0,0 +1,199 @@
+"""
+watermark_store.py
+==================
+
+Persistent watermark store for incremental extraction.
+
+Each pipeline records the timestamp of its last successful load in a
+local SQLite file. The next run only re-extracts data from that point
+onwards, minus a configurable safety lookback for late-arriving
+records, instead of re-pulling a fixed 7-day window every night.
+
+The APIs filter by calendar date, so the window start is rounded down
+to a whole day. Steady state (nightly 22:00 runs, 2 h lookback):
+    watermark 22:00 yesterday − 2 h → 20:00 yesterday
+    window = yesterday → today   (2 calendar days instead of 7)
+
+Author: Chef Seasons – Data Engineering Team
+"""
+
+import os
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional, Tuple
+
+from config.settings import WATERMARK_DB_PATH, WATERMARK_LOOKBACK_HOURS
+from utils.logger import log
+
+
+# ------------------------------------------------------------
+# CONFIGURABLE PARAMETERS
+# ------------------------------------------------------------
+MAX_WINDOW_DAYS = 90          # guard against huge catch-up windows
+DEFAULT_WINDOW_DAYS = 7       # used when no watermark exists yet
+DATE_FORMAT = "%Y-%m-%d"
+
+_LOCK = threading.Lock()
+
+
+# ------------------------------------------------------------
+# STORAGE
+# ------------------------------------------------------------
+def _connect() -> sqlite3.Connection:
+    """Open the watermark database, creating it on first use."""
+    directory = os.path.dirname(WATERMARK_DB_PATH)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    conn = sqlite3.connect(WATERMARK_DB_PATH)
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS watermarks (
+            pipeline        TEXT PRIMARY KEY,
+            last_loaded_at  TEXT NOT NULL,
+            rows_loaded     INTEGER NULL,
+            updated_at      TEXT NOT NULL
+        )
+        """
+    )
+    return conn
+
+
+def get_watermark(pipeline: str) -> Optional[Dict[str, Any]]:
+    """
+    Return the stored watermark for a pipeline.
+
+    Returns:
+        dict | None: {"last_loaded_at": datetime, "rows_loaded": int | None}
+                     or None if never loaded.
+    """
+    with _LOCK:
+        conn = _connect()
+        try:
+            row = conn.execute(
+                "SELECT last_loaded_at, rows_loaded FROM watermarks WHERE pipeline = ?",
+                (pipeline,),
+            ).fetchone()
+        finally:
+            conn.close()
+
+    if row is None:
+        return None
+
+    return {
+        "last_loaded_at": datetime.fromisoformat(row[0]),
+        "rows_loaded": row[1],
+    }
+
+
+def set_watermark(pipeline: str,
+                  last_loaded_at: datetime,
+                  rows_loaded: Optional[int] = None):
+    """
+    Record a successful load for a pipeline.
+
+    Args:
+        pipeline (str): Pipeline key (e.g. "pipeline1").
+        last_loaded_at (datetime): Point in time up to which data is
+            considered loaded (typically the extraction start time).
+        rows_loaded (int, optional): Rows loaded by the run.
+    """
+    with _LOCK:
+        conn = _connect()
+        try:
+            with conn:
+                conn.execute(
+                    """
+                    INSERT INTO watermarks (pipeline, last_loaded_at, rows_loaded, updated_at)
+                    VALUES (?, ?, ?, ?)
+                    ON CONFLICT(pipeline) DO UPDATE SET
+                        last_loaded_at = excluded.last_loaded_at,
+                        rows_loaded    = excluded.rows_loaded,
+                        updated_at     = excluded.updated_at
+                    """,
+                    (
+                        pipeline,
+                        last_loaded_at.isoformat(timespec="seconds"),
+                        rows_loaded,
+                        datetime.now().isoformat(timespec="seconds"),
+                    ),
+                )
+        finally:
+            conn.close()
+
+    log(f"🔖 [WATERMARK] {pipeline} → {last_loaded_at.isoformat(timespec='seconds')}")
+
+
+# ------------------------------------------------------------
+# WINDOW COMPUTATION
+# ------------------------------------------------------------
+def compute_incremental_window(pipeline: str,
+                               lookback_hours: Optional[float] = None,
+                               now: Optional[datetime] = None) -> Tuple[str, str]:
+    """
+    Compute the minimal extraction window for a pipeline.
+
+    window start = (watermark - lookback).date()
+    window end   = today
+
+    The start is rounded down to a calendar day, so a nightly run with a
+    lookback that crosses midnight covers yesterday and today (2 days).
+
+    Falls back to the last DEFAULT_WINDOW_DAYS days (including today)
+    when no watermark exists, and never exceeds MAX_WINDOW_DAYS: a longer
+    catch-up is cut to its first MAX_WINDOW_DAYS days (window end before
+    today), and `watermark_after_run` then only advances the watermark to
+    that end, so the following runs continue the catch-up.
+
+    Args:
+        pipeline (str): Pipeline key.
+        lookback_hours (float, optional): Safety lookback for
+            late-arriving records. Defaults to WATERMARK_LOOKBACK_HOURS.
+        now (datetime, optional): Reference time (for testing).
+
+    Returns:
+        tuple[str, str]: (date_from, date_to) in 'YYYY-MM-DD' format.
+    """
+    now = now or datetime.now()
+    today = now.date()
+
+    if lookback_hours is None:
+        lookback_hours = WATERMARK_LOOKBACK_HOURS
+
+    watermark = get_watermark(pipeline)
+
+    if watermark is None:
+        start = today - timedelta(days=DEFAULT_WINDOW_DAYS - 1)
+        log(f"🔖 [WATERMARK] No watermark for {pipeline}; using full {DEFAULT_WINDOW_DAYS}-day window")
+    else:
+        start = (watermark["last_loaded_at"] - timedelta(hours=lookback_hours)).date()
+        start = min(start, today)
+
+        end = start + timedelta(days=MAX_WINDOW_DAYS - 1)
+        if end < today:
+            log(f"⚠️ [WATERMARK] {pipeline} is {(today - start).days + 1} days behind; "
+                f"clamping to {MAX_WINDOW_DAYS} days ({start} → {end}), "
+                f"later runs continue the catch-up", level="warning")
+            return start.strftime(DATE_FORMAT), end.strftime(DATE_FORMAT)
+
+    return start.strftime(DATE_FORMAT), today.strftime(DATE_FORMAT)
+
+
+def watermark_after_run(date_to: str, started_at: datetime) -> datetime:
+    """
+    Watermark to record after a successful run over a window ending on `date_to`.
+
+    Normally the extraction start time. For a window clamped to
+    MAX_WINDOW_DAYS (ending before today) only data up to the end of
+    `date_to` was extracted, so the watermark stops there.
+
+    Args:
+        date_to (str): Window end (YYYY-MM-DD), inclusive.
+        started_at (datetime): Extraction start time of the run.
+
+    Returns:
+        datetime: Value for `set_watermark`.
+    """
+    window_end = datetime.strptime(date_to, DATE_FORMAT) + timedelta(days=1)
+    return min(started_at, window_end)
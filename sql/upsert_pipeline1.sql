@@ -1,5 +1,5 @@
 /* ===================================================================
-   UPSERT Script for Pipeline 1 → Target Table: Khenda_Uretim_Cevrim
+   UPSERT Script for Pipeline 1 → Target Table: Table1_ETL
    Author: Chef Seasons – Data Engineering Team
    =================================================================== */
 
@@ -47,7 +47,7 @@ VALUES (...), (...), ...
 --------------------------------------------------------------
 -- MERGE INTO TARGET TABLE
 --------------------------------------------------------------
-MERGE ChefsAI.dbo.Khenda_Uretim_Cevrim AS TARGET
+MERGE ChefsAI.dbo.Table1_ETL AS TARGET
 USING #P1_Staging AS SOURCE
     ON TARGET.Id = SOURCE.Id   -- Primary key eşleşmesi
 
@@ -0,0 +1,51 @@
+"""
+Shared pytest setup: makes the repository root importable and keeps
+every on-disk state file of the test run out of the working tree.
+"""
+
+import os
+import sys
+import tempfile
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# config.settings reads these once at import time, so they must be set
+# before any repository module is imported.
+_STATE_DIR = tempfile.mkdtemp(prefix="etl-tests-")
+os.environ.update({
+    "DB_BACKEND": "sqlite",
+    "DB_SQLITE_PATH": os.path.join(_STATE_DIR, "standin.sqlite"),
+    "HTTP_CACHE_ENABLED": "false",
+    "HTTP_CACHE_DIR": os.path.join(_STATE_DIR, "http"),
+    "WATERMARK_DB_PATH": os.path.join(_STATE_DIR, "watermarks.sqlite"),
+    "PAGE_SIZE_STATE_PATH": os.path.join(_STATE_DIR, "page_size.json"),
+    "LANDING_DIR": os.path.join(_STATE_DIR, "landing"),
+    "QUARANTINE_DIR": os.path.join(_STATE_DIR, "quarantine"),
+    "SCHEMA_REGISTRY_PATH": os.path.join(_STATE_DIR, "schemas.json"),
+    "FINGERPRINT_DB_PATH": os.path.join(_STATE_DIR, "fingerprints.sqlite"),
+})
+
+
+@pytest.fixture(autouse=True)
+def _isolated_state(tmp_path, monkeypatch):
+    import services.fingerprint_store as fingerprint_store
+
+    monkeypatch.setattr(fingerprint_store, "FINGERPRINT_DB_PATH",
+                        str(tmp_path / "fingerprints.sqlite"))
+
+
+@pytest.fixture
+def stub_api(monkeypatch):
+    """Local stub of API 1 / API 2; the clients are pointed at it."""
+    from benchmarks.stub_api_server import StubConfig, start_stub_server
+    import services.api_client_1 as api_client_1
+    import services.api_client_2 as api_client_2
+
+    server = start_stub_server(StubConfig(api1_per_day=20, api2_per_day=50))
+    monkeypatch.setattr(api_client_1, "API_1_URL", server.base_url + "/api1")
+    monkeypatch.setattr(api_client_2, "API_2_URL", server.base_url + "/api2")
+    yield server
+    server.shutdown()
+    server.server_close()
@@ -0,0 +1,56 @@
+"""Window splitting of services/api_client_1.py."""
+
+import pytest
+
+import services.api_client_1 as api_client_1
+from services.api_client_1 import split_date_window
+
+
+def test_split_date_window_covers_range_inclusively():
+    assert split_date_window("2025-12-01", "2025-12-05", 2) == [
+        ("2025-12-01", "2025-12-02"),
+        ("2025-12-03", "2025-12-04"),
+        ("2025-12-05", "2025-12-05"),
+    ]
+    assert split_date_window("2025-12-31", "2026-01-01", 1) == [
+        ("2025-12-31", "2025-12-31"),
+        ("2026-01-01", "2026-01-01"),
+    ]
+
+
+def test_split_date_window_rejects_reversed_range():
+    with pytest.raises(ValueError):
+        split_date_window("2025-12-05", "2025-12-01", 1)
+
+
+def test_split_fetch_matches_single_request(stub_api):
+    single = api_client_1.fetch_api_1_data("2025-12-01", "2025-12-04", days_per_slice=0)
+    split = api_client_1.fetch_api_1_data("2025-12-01", "2025-12-04",
+                                          days_per_slice=1, max_workers=3)
+
+    assert [r["Id"] for r in split] == [r["Id"] for r in single]
+    assert len(split) == 4 * 20
+
+
+def test_slices_stream_in_date_order(stub_api):
+    slices = list(api_client_1.iter_api_1_slices("2025-12-01", "2025-12-03",
+                                                 days_per_slice=1, max_workers=2))
+
+    assert [len(s) for s in slices] == [20, 20, 20]
+    assert [s[0]["Tarih"][:10] for s in slices] == ["2025-12-01", "2025-12-02", "2025-12-03"]
+
+
+def test_failed_slice_is_retried_alone(monkeypatch):
+    calls = []
+
+    def flaky(params):
+        calls.append(params["from"])
+        if params["from"] == "2025-12-02" and calls.count("2025-12-02") == 1:
+            raise RuntimeError("boom")
+        return [{"day": params["from"]}]
+
+    monkeypatch.setattr(api_client_1, "_fetch_window", flaky)
+    rows = api_client_1.fetch_api_1_data("2025-12-01", "2025-12-03", days_per_slice=1)
+
+    assert [r["day"] for r in rows] == ["2025-12-01", "2025-12-02", "2025-12-03"]
+    assert sorted(calls) == ["2025-12-01", "2025-12-02", "2025-12-02", "2025-12-03"]
@@ -0,0 +1,48 @@
+"""Pagination strategies of services/api_client_2.py against the local stub."""
+
+import pytest
+
+import services.api_client_2 as api_client_2
+
+WINDOW = {"from": "2025-12-01", "to": "2025-12-03"}   # 3 days × 50 rows
+
+
+@pytest.fixture
+def fixed_pages(monkeypatch):
+    monkeypatch.setattr(api_client_2, "ADAPTIVE_PAGE_SIZE", False)
+    monkeypatch.setattr(api_client_2, "PAGE_SIZE", 20)
+
+
+def _ids(pages):
+    return [row["id"] for page in pages for row in page]
+
+
+def test_concurrent_pages_match_sequential_order(stub_api, fixed_pages):
+    sequential = list(api_client_2.iter_api_2_pages(WINDOW, max_in_flight=1))
+    concurrent = list(api_client_2.iter_api_2_pages(WINDOW, max_in_flight=4))
+
+    assert [len(p) for p in sequential] == [20] * 7 + [10]
+    assert _ids(concurrent) == _ids(sequential)
+    assert len(set(_ids(concurrent))) == 150
+
+
+def test_concurrent_overfetch_is_bounded(stub_api, fixed_pages):
+    list(api_client_2.iter_api_2_pages(WINDOW, max_in_flight=4))
+
+    # 8 data pages + 1 empty terminator + at most max_in_flight - 1 speculative pages
+    requests_sent = sum(stub_api.status_counts.values())
+    assert 9 <= requests_sent <= 12
+
+
+def test_fetch_merges_all_pages(stub_api, fixed_pages):
+    rows = api_client_2.fetch_api_2_data(WINDOW, max_in_flight=3)
+    assert len(rows) == 150
+
+
+def test_closing_early_stops_paging(stub_api, fixed_pages):
+    pages = api_client_2.iter_api_2_pages(WINDOW, max_in_flight=2)
+    first = next(pages)
+    pages.close()
+
+    assert len(first) == 20
+    assert sum(stub_api.status_counts.values()) <= 4
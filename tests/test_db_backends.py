@@ -0,0 +1,197 @@
+"""SQL builders and loader backends of services/db_backends.py."""
+
+import re
+from datetime import datetime
+
+import pytest
+
+from services.db_backends import (
+    STAGING_TABLE,
+    PymssqlBackend,
+    SqliteBackend,
+    _create_staging_sql,
+    _merge_sql
+)
+
+
+def _squash(sql):
+    return re.sub(r"\s+", " ", sql).strip()
+
+
+# ------------------------------------------------------------
+# MERGE BUILDER
+# ------------------------------------------------------------
+def test_merge_updates_non_key_columns_and_inserts_all():
+    sql = _squash(_merge_sql("dbo.T", ["id", "a", "b"], ["id"]))
+
+    assert f"MERGE dbo.T AS T USING {STAGING_TABLE} AS S ON T.[id] = S.[id]" in sql
+    assert "WHEN MATCHED THEN UPDATE SET T.[a] = S.[a], T.[b] = S.[b] " in sql
+    assert "INSERT ([id], [a], [b]) VALUES (S.[id], S.[a], S.[b])" in sql
+    assert "OUTPUT $action INTO @actions" in sql
+    assert "LoadTime" not in sql
+
+
+def test_merge_stamps_the_load_time_column_on_insert_and_update():
+    sql = _squash(_merge_sql("dbo.T", ["id", "a"], ["id"], load_time_column="LoadTime"))
+
+    assert "UPDATE SET T.[a] = S.[a], T.[LoadTime] = SYSDATETIME()" in sql
+    assert "INSERT ([id], [a], [LoadTime]) VALUES (S.[id], S.[a], SYSDATETIME())" in sql
+
+
+def test_merge_with_only_key_columns_has_no_update_clause():
+    sql = _squash(_merge_sql("dbo.T", ["id"], ["id"]))
+    assert "WHEN MATCHED" not in sql
+
+    sql = _squash(_merge_sql("dbo.T", ["id"], ["id"], load_time_column="LoadTime"))
+    assert "WHEN MATCHED THEN UPDATE SET T.[LoadTime] = SYSDATETIME()" in sql
+
+
+def test_merge_on_composite_key():
+    sql = _squash(_merge_sql("dbo.T", ["a", "b", "c"], ["a", "b"]))
+
+    assert "ON T.[a] = S.[a] AND T.[b] = S.[b]" in sql
+    assert "UPDATE SET T.[c] = S.[c] " in sql
+
+
+def test_staging_table_does_not_inherit_identity():
+    sql = _squash(_create_staging_sql("dbo.T", ["id", "a"]))
+
+    # SELECT INTO keeps IDENTITY for a plain select, but not across UNION ALL
+    assert f"SELECT [id], [a] INTO {STAGING_TABLE} FROM dbo.T WHERE 1 = 0 " \
+           f"UNION ALL SELECT [id], [a] FROM dbo.T WHERE 1 = 0;" in sql
+    assert "TOP 0" not in sql
+
+
+# ------------------------------------------------------------
+# SQLITE STAND-IN
+# ------------------------------------------------------------
+@pytest.fixture
+def sqlite_backend(tmp_path):
+    backend = SqliteBackend(str(tmp_path / "standin.sqlite"))
+    conn = backend.connect()
+    yield backend, conn
+    conn.close()
+
+
+def test_sqlite_merge_counts_inserts_and_updates(sqlite_backend):
+    backend, conn = sqlite_backend
+    columns = ["id", "a"]
+
+    assert backend.merge(conn, "db.dbo.T", columns, [(1, "x"), (2, "y")], ["id"], "LoadTime") == \
+        {"inserted": 2, "updated": 0}
+    assert backend.merge(conn, "db.dbo.T", columns, [(2, "z"), (3, "w")], ["id"], "LoadTime") == \
+        {"inserted": 1, "updated": 1}
+
+    rows = conn.execute("SELECT id, a, LoadTime IS NOT NULL FROM T ORDER BY id").fetchall()
+    assert rows == [(1, "x", 1), (2, "z", 1), (3, "w", 1)]
+
+
+def test_sqlite_merge_adds_load_time_to_a_table_created_by_insert(sqlite_backend):
+    backend, conn = sqlite_backend
+    backend.insert(conn, "db.dbo.T", ["id", "a"], [(1, "x")], ["id"])
+
+    assert backend.merge(conn, "db.dbo.T", ["id", "a"], [(1, "y"), (2, "z")], ["id"], "LoadTime") == \
+        {"inserted": 1, "updated": 1}
+
+    rows = conn.execute("SELECT id, a, LoadTime IS NOT NULL FROM T ORDER BY id").fetchall()
+    assert rows == [(1, "y", 1), (2, "z", 1)]
+
+
+def test_sqlite_merge_on_an_existing_file_without_load_time(tmp_path):
+    path = str(tmp_path / "standin.sqlite")
+    first = SqliteBackend(path)
+    conn = first.connect()
+    first.insert(conn, "T", ["id"], [(1,)], ["id"])
+    conn.close()
+
+    backend = SqliteBackend(path)                  # fresh process: nothing cached
+    conn = backend.connect()
+    backend.merge(conn, "T", ["id"], [(1,)], ["id"], "LoadTime")
+
+    assert conn.execute("SELECT LoadTime IS NOT NULL FROM T").fetchall() == [(1,)]
+    conn.close()
+
+
+# ------------------------------------------------------------
+# PYMSSQL BULK COPY
+# ------------------------------------------------------------
+class _FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+        self.result = []
+
+    def execute(self, sql, params=None):
+        self.conn.executed.append(sql)
+        if "INFORMATION_SCHEMA.COLUMNS" in sql:
+            assert "%s" in sql and params == ("dbo", "T")
+            self.conn.metadata_reads += 1
+            self.result = [("id", "int", None, 10, 0, "NO", 1),
+                           ("seen_at", "datetime", None, None, None, "YES", 2)]
+        elif "sys.columns" in sql:
+            self.conn.ordinal_reads += 1
+            self.result = [("id", 1), ("seen_at", 2)]
+        elif "@actions" in sql:
+            self.result = [(1, 0)]
+
+    def fetchall(self):
+        return self.result
+
+    def fetchone(self):
+        return self.result[0]
+
+    def close(self):
+        pass
+
+
+class _FakePymssqlConnection:
+    def __init__(self):
+        self.executed = []
+        self.copied = []
+        self.metadata_reads = 0
+        self.ordinal_reads = 0
+        self.fail = False
+
+    def cursor(self):
+        return _FakeCursor(self)
+
+    def bulk_copy(self, table, rows, column_ids, batch_size):
+        if self.fail:
+            raise RuntimeError("bulk copy failed")
+        self.copied.append((table, list(rows), column_ids))
+
+
+@pytest.fixture
+def pymssql_backend():
+    return PymssqlBackend(), _FakePymssqlConnection()
+
+
+def test_pymssql_values_are_coerced_before_bulk_copy(pymssql_backend):
+    backend, conn = pymssql_backend
+
+    backend.insert(conn, "dbo.T", ["seen_at", "id"], [("2025-12-01 08:30:00", "7")], ["id"])
+    backend.merge(conn, "dbo.T", ["id", "seen_at"], [(8, "2025-12-02 09:00:00")], ["id"])
+
+    assert conn.copied[0] == ("dbo.T", [(datetime(2025, 12, 1, 8, 30), 7)], [2, 1])
+    assert conn.copied[1] == (STAGING_TABLE, [(8, datetime(2025, 12, 2, 9, 0))], [1, 2])
+    assert (conn.metadata_reads, conn.ordinal_reads) == (1, 1)
+
+
+def test_pymssql_failed_load_drops_cached_ordinals_and_metadata(pymssql_backend):
+    backend, conn = pymssql_backend
+    backend.insert(conn, "dbo.T", ["id"], [(1,)], ["id"])
+
+    conn.fail = True
+    with pytest.raises(RuntimeError):
+        backend.insert(conn, "dbo.T", ["id"], [(2,)], ["id"])
+    conn.fail = False
+    backend.insert(conn, "dbo.T", ["id"], [(3,)], ["id"])
+
+    assert (conn.metadata_reads, conn.ordinal_reads) == (2, 2)
+
+
+def test_pymssql_unconvertible_value_fails_before_bulk_copy(pymssql_backend):
+    backend, conn = pymssql_backend
+
+    with pytest.raises(RuntimeError, match="Cannot bind seen_at"):
+        backend.insert(conn, "dbo.T", ["id", "seen_at"], [(1, "not a date")], ["id"])
+    assert conn.copied == []
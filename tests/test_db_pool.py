@@ -0,0 +1,101 @@
+"""Connection pool (services/db_pool.py) on in-memory SQLite connections."""
+
+import sqlite3
+import threading
+
+import pytest
+
+from services.db_pool import ConnectionPool, PoolTimeoutError
+
+
+def _factory():
+    conn = sqlite3.connect(":memory:", check_same_thread=False)
+    conn.execute("CREATE TABLE t (id INTEGER)")
+    conn.commit()
+    return conn
+
+
+@pytest.fixture
+def pool():
+    pool = ConnectionPool(_factory, min_size=0, max_size=2, idle_timeout=0,
+                          checkout_timeout=0.2, name="test")
+    yield pool
+    pool.close()
+
+
+def test_connections_are_reused(pool):
+    with pool.connection() as first:
+        pass
+    with pool.connection() as second:
+        pass
+
+    assert second is first
+    assert (pool.stats()["created"], pool.stats()["reused"]) == (1, 1)
+
+
+def test_driver_error_discards_the_connection(pool):
+    with pytest.raises(sqlite3.OperationalError):
+        with pool.connection() as conn:
+            conn.execute("SELECT * FROM missing_table")
+
+    stats = pool.stats()
+    assert (stats["discarded"], stats["open"]) == (1, 0)
+
+
+def test_other_errors_roll_back_and_keep_the_connection(pool):
+    with pytest.raises(RuntimeError):
+        with pool.connection() as conn:
+            conn.execute("INSERT INTO t VALUES (1)")
+            raise RuntimeError("coercion failed")
+
+    with pool.connection() as again:
+        assert again is conn
+        assert again.execute("SELECT COUNT(*) FROM t").fetchone() == (0,)
+    assert pool.stats()["discarded"] == 0
+
+
+def test_closed_generator_returns_its_connection(pool):
+    def rows():
+        with pool.connection() as conn:
+            yield from conn.execute("SELECT 1 UNION ALL SELECT 2")
+
+    stream = rows()
+    next(stream)
+    stream.close()
+
+    assert pool.stats()["idle"] == 1
+    assert pool.stats()["discarded"] == 0
+
+
+def test_broken_idle_connection_is_replaced_on_checkout(pool):
+    with pool.connection() as conn:
+        pass
+    conn.close()
+
+    with pool.connection() as fresh:
+        assert fresh is not conn
+    assert pool.stats()["discarded"] == 1
+
+
+def test_checkout_times_out_when_exhausted(pool):
+    held = [pool.acquire(), pool.acquire()]
+    with pytest.raises(PoolTimeoutError):
+        pool.acquire()
+
+    released = threading.Timer(0.05, pool.release, args=(held.pop(),))
+    released.start()
+    assert pool.acquire() is not None
+    assert pool.stats()["waits"] == 1
+
+
+def test_warm_and_idle_eviction():
+    pool = ConnectionPool(_factory, min_size=1, max_size=3, idle_timeout=0.01)
+    assert pool.warm(3) == 3
+
+    threading.Event().wait(0.05)
+    with pool.connection():
+        pass
+
+    assert pool.stats()["evicted"] == 2
+    assert pool.stats()["open"] == 1
+    pool.close()
@@ -0,0 +1,68 @@
+import pytest
+
+from etl.deduplication import KEEP_FIRST, KEEP_LAST, NEWEST, Deduplicator, deduplicate_rows
+
+
+COLUMNS = ["id", "value", "ts"]
+BATCH = [(1, "a", 5), (2, "b", 1), (1, "c", 3)]
+LATER = [(1, "d", 4), (2, "e", 2), (3, "f", 1)]
+
+
+def test_keep_first():
+    assert deduplicate_rows(COLUMNS, BATCH, policy=KEEP_FIRST) == [(1, "a", 5), (2, "b", 1)]
+
+
+def test_keep_last_keeps_input_order_of_survivors():
+    assert deduplicate_rows(COLUMNS, BATCH, policy=KEEP_LAST) == [(2, "b", 1), (1, "c", 3)]
+
+
+def test_newest_by_order_column():
+    kept = deduplicate_rows(COLUMNS, BATCH, policy=NEWEST, order_by="ts")
+    assert sorted(kept) == [(1, "a", 5), (2, "b", 1)]
+
+
+def test_newest_treats_null_as_oldest():
+    kept = deduplicate_rows(COLUMNS, [(1, "a", None), (1, "b", 1)], policy=NEWEST, order_by="ts")
+    assert kept == [(1, "b", 1)]
+
+
+def test_dropped_counter():
+    dedup = Deduplicator(COLUMNS, policy=KEEP_FIRST)
+    dedup.apply(BATCH)
+    dedup.apply(BATCH)
+    assert dedup.dropped == 2
+
+
+def test_invalid_configuration():
+    with pytest.raises(ValueError):
+        Deduplicator(COLUMNS, policy="random")
+    with pytest.raises(ValueError):
+        Deduplicator(COLUMNS, policy=NEWEST)
+
+
+# ------------------------------------------------------------
+# ACROSS BATCHES
+# ------------------------------------------------------------
+def test_across_batches_keep_first_drops_keys_already_emitted():
+    dedup = Deduplicator(COLUMNS, policy=KEEP_FIRST, across_batches=True)
+    dedup.apply(BATCH)
+    assert dedup.apply(LATER) == [(3, "f", 1)]
+
+
+def test_across_batches_keep_last_lets_later_copies_through():
+    dedup = Deduplicator(COLUMNS, policy=KEEP_LAST, across_batches=True)
+    dedup.apply(BATCH)
+    assert dedup.apply(LATER) == LATER
+
+
+def test_across_batches_newest_drops_only_older_copies():
+    dedup = Deduplicator(COLUMNS, policy=NEWEST, order_by="ts", across_batches=True)
+    dedup.apply(BATCH)
+    # id 1: ts 4 < emitted 5 → dropped; id 2: ts 2 > emitted 1 → supersedes
+    assert dedup.apply(LATER) == [(2, "e", 2), (3, "f", 1)]
+
+
+def test_without_across_batches_every_batch_is_independent():
+    dedup = Deduplicator(COLUMNS, policy=KEEP_FIRST)
+    dedup.apply(BATCH)
+    assert dedup.apply(LATER) == LATER
@@ -0,0 +1,72 @@
+"""Whole-window and chunked execution of etl/etl_pipeline_1.py (API and DB replaced by fakes)."""
+
+from datetime import datetime
+
+import pytest
+
+import etl.etl_pipeline_1 as etl_pipeline_1
+import services.fingerprint_store as fingerprint_store
+from benchmarks.stub_api_server import make_api1_record
+from etl.common_transforms import rechunk
+
+DAY = datetime(2025, 12, 1)
+
+
+def _slices():
+    slices = [[make_api1_record(DAY, n, 100) for n in range(start, start + 10)]
+              for start in (0, 10, 20)]
+    # the same id extracted again in a later slice, with a newer value
+    slices[2].append(dict(slices[0][3], Musteri="Updated"))
+    return slices
+
+
+@pytest.fixture
+def loads(monkeypatch):
+    loads = []
+
+    def fake_insert(values, columns=None):
+        loads.append([dict(zip(columns, v)) for v in values])
+        return len(values)
+
+    monkeypatch.setattr(etl_pipeline_1, "iter_api_1_slices", lambda date_from, date_to: iter(_slices()))
+    monkeypatch.setattr(etl_pipeline_1, "fetch_api_1_data",
+                        lambda date_from, date_to: [r for s in _slices() for r in s])
+    monkeypatch.setattr(etl_pipeline_1, "insert_into_table_1", fake_insert)
+    monkeypatch.setattr(etl_pipeline_1, "LANDING_ENABLED", False)
+    return loads
+
+
+def _final_table(loads):
+    table = {}
+    for batch in loads:                 # MERGE: later loads overwrite earlier ones
+        for row in batch:
+            table[row["id"]] = row
+    return table
+
+
+def test_rechunk_regroups_without_losing_rows():
+    chunks = list(rechunk(iter([[1, 2, 3], [], [4], [5, 6, 7, 8]]), 3))
+    assert chunks == [[1, 2, 3], [4, 5, 6], [7, 8]]
+
+    with pytest.raises(ValueError):
+        list(rechunk(iter([[1]]), 0))
+
+
+def test_chunked_run_loads_bounded_chunks(loads):
+    etl_pipeline_1.run_pipeline("2025-12-01", "2025-12-01", chunk_rows=8)
+
+    assert [len(batch) for batch in loads] == [8, 8, 8, 7]
+
+
+def test_chunked_run_matches_whole_window(loads, tmp_path, monkeypatch):
+    etl_pipeline_1.run_pipeline("2025-12-01", "2025-12-01", chunk_rows=0)
+    whole = _final_table(loads)
+
+    loads.clear()
+    monkeypatch.setattr(fingerprint_store, "FINGERPRINT_DB_PATH", str(tmp_path / "other.sqlite"))
+    etl_pipeline_1.run_pipeline("2025-12-01", "2025-12-01", chunk_rows=8)
+    chunked = _final_table(loads)
+
+    assert chunked == whole
+    assert len(whole) == 30
+    assert [r["musteri"] for r in whole.values() if r["id"] == _slices()[0][3]["Id"]] == ["Updated"]
@@ -0,0 +1,81 @@
+"""Page-by-page streaming of etl/etl_pipeline_2.py (API and DB replaced by fakes)."""
+
+from datetime import datetime
+
+import pytest
+
+import etl.etl_pipeline_2 as etl_pipeline_2
+import services.reject_quarantine as reject_quarantine
+from benchmarks.stub_api_server import make_api2_record
+from services.reject_quarantine import iter_quarantine
+
+DAY = datetime(2025, 12, 1)
+
+
+def _page(start, size):
+    return [make_api2_record(DAY, n, 1000) for n in range(start, start + size)]
+
+
+def _bad(row):
+    return dict(row, valid="maybe")
+
+
+@pytest.fixture
+def pages():
+    return [_page(page_no * 10, 10) for page_no in range(3)]
+
+
+@pytest.fixture
+def events(pages, tmp_path, monkeypatch):
+    events = []
+
+    def fake_pages(params=None):
+        for page_no, page in enumerate(pages):
+            events.append(("fetch", page_no))
+            yield page
+
+    def fake_insert(values, columns=None):
+        events.append(("load", len(values)))
+        return len(values)
+
+    monkeypatch.setattr(etl_pipeline_2, "iter_api_2_pages", fake_pages)
+    monkeypatch.setattr(etl_pipeline_2, "insert_into_table_2", fake_insert)
+    monkeypatch.setattr(etl_pipeline_2, "LANDING_ENABLED", False)
+    monkeypatch.setattr(reject_quarantine, "QUARANTINE_DIR", str(tmp_path / "quarantine"))
+    return events
+
+
+def test_pages_are_loaded_as_they_arrive(events):
+    result = etl_pipeline_2.run_pipeline("2025-12-01", "2025-12-01", chunk_rows=0)
+
+    assert events == [("fetch", 0), ("load", 10),
+                      ("fetch", 1), ("load", 10),
+                      ("fetch", 2), ("load", 10)]
+    assert result.rows == 30
+
+
+def test_reject_tolerance_applies_to_the_whole_run(pages, events):
+    pages.extend(_page(n, 10) for n in range(30, 100, 10))     # 100 rows in 10 pages
+    pages[0][:3] = [_bad(row) for row in pages[0][:3]]         # 30% of page 1, 3% of the run
+
+    result = etl_pipeline_2.run_pipeline("2025-12-01", "2025-12-01", chunk_rows=0)
+
+    assert (result.rows, result.rejected) == (97, 3)
+    assert [e["row"]["valid"] for e in iter_quarantine(result.quarantine)] == ["maybe"] * 3
+
+
+def test_run_above_reject_tolerance_fails_after_quarantining(pages, events, tmp_path):
+    pages[1][:] = [_bad(row) for row in pages[1]]
+
+    with pytest.raises(RuntimeError, match="10/30 rows invalid"):
+        etl_pipeline_2.run_pipeline("2025-12-01", "2025-12-01", chunk_rows=0)
+
+    [path] = list((tmp_path / "quarantine").rglob("*.ndjson.gz"))
+    assert len(list(iter_quarantine(str(path)))) == 10
+
+
+def test_chunking_regroups_streamed_pages(events):
+    result = etl_pipeline_2.run_pipeline("2025-12-01", "2025-12-01", chunk_rows=25)
+
+    assert [e for e in events if e[0] == "load"] == [("load", 25), ("load", 5)]
+    assert result.rows == 30
@@ -0,0 +1,65 @@
+from datetime import date, datetime
+
+from services.fingerprint_store import (
+    ChangeDetector,
+    get_fingerprint_count,
+    rebuild_fingerprints,
+    row_digest
+)
+
+
+COLUMNS = ["id", "name", "amount"]
+ROWS = [(1, "a", 1.0), (2, "b", 2.0)]
+
+
+def test_digest_is_type_stable_for_dates_and_bits():
+    assert row_digest((datetime(2025, 1, 5, 12, 33),)) == row_digest(("2025-01-05 12:33:00",))
+    assert row_digest((date(2025, 1, 5),)) == row_digest(("2025-01-05 00:00:00",))
+    assert row_digest((True,)) == row_digest(("1",))
+    assert row_digest((1, "a")) != row_digest((1, "b"))
+
+
+def test_unchanged_rows_are_skipped_after_commit():
+    first = ChangeDetector("p", COLUMNS, enabled=True)
+    assert first.filter_changed(ROWS) == ROWS
+    first.commit()
+
+    second = ChangeDetector("p", COLUMNS, enabled=True)
+    changed = second.filter_changed([(1, "a", 1.0), (2, "b", 2.5), (3, "c", 3.0)])
+
+    assert changed == [(2, "b", 2.5), (3, "c", 3.0)]
+    assert second.stats()["skipped"] == 1
+
+
+def test_nothing_is_recorded_without_commit():
+    ChangeDetector("p", COLUMNS, enabled=True).filter_changed(ROWS)
+
+    assert ChangeDetector("p", COLUMNS, enabled=True).filter_changed(ROWS) == ROWS
+    assert get_fingerprint_count("p") == 0
+
+
+def test_pipelines_are_isolated():
+    detector = ChangeDetector("p1", COLUMNS, enabled=True)
+    detector.filter_changed(ROWS)
+    detector.commit()
+
+    assert ChangeDetector("p2", COLUMNS, enabled=True).filter_changed(ROWS) == ROWS
+
+
+def test_disabled_detector_passes_everything_but_still_records():
+    detector = ChangeDetector("p", COLUMNS, enabled=False)
+    detector.filter_changed(ROWS)
+    detector.commit()
+    assert detector.filter_changed(ROWS) == ROWS
+
+    assert ChangeDetector("p", COLUMNS, enabled=True).filter_changed(ROWS) == []
+
+
+def test_rebuild_replaces_the_pipeline_store():
+    detector = ChangeDetector("p", COLUMNS, enabled=True)
+    detector.filter_changed([(9, "z", 0.0)])
+    detector.commit()
+
+    assert rebuild_fingerprints("p", COLUMNS, iter(ROWS)) == 2
+    assert get_fingerprint_count("p") == 2
+    assert ChangeDetector("p", COLUMNS, enabled=True).filter_changed(ROWS + [(9, "z", 0.0)]) == [(9, "z", 0.0)]
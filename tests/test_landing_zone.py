@@ -0,0 +1,105 @@
+"""Raw landing zone (services/landing_zone.py): write, replay, drain, retention."""
+
+import os
+import shutil
+from datetime import datetime, timedelta
+
+import pytest
+
+import services.landing_zone as landing_zone
+from services.landing_zone import (
+    LandingWriter,
+    apply_retention,
+    compact_run,
+    drain_to_landing,
+    iter_landing_pages,
+    land_pages,
+    read_manifest
+)
+
+PAGES = [[{"id": 1}, {"id": 2}], [{"id": 3}], [{"id": 4}, {"id": 5}]]
+
+
+@pytest.fixture(autouse=True)
+def _landing_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(landing_zone, "LANDING_DIR", str(tmp_path / "landing"))
+
+
+def test_landed_pages_replay_in_order():
+    writer = LandingWriter("api2", "2025-12-01", "2025-12-07")
+    assert list(land_pages(iter(PAGES), writer)) == PAGES
+
+    manifest = read_manifest("api2", writer.run_id)
+    assert (manifest["status"], manifest["pages"], manifest["rows"]) == ("complete", 3, 5)
+    assert list(iter_landing_pages("api2", writer.run_id)) == PAGES
+
+
+def test_extraction_error_closes_run_as_failed():
+    def broken():
+        yield PAGES[0]
+        raise RuntimeError("API down")
+
+    writer = LandingWriter("api2", None, None)
+    with pytest.raises(RuntimeError):
+        list(land_pages(broken(), writer))
+
+    assert read_manifest("api2", writer.run_id)["status"] == "failed"
+    assert list(iter_landing_pages("api2", writer.run_id)) == [PAGES[0]]
+
+
+@pytest.mark.parametrize("enabled, max_pages, status, landed", [
+    (False, 200, "failed", 1),       # stop extracting, keep what was landed
+    (True, 200, "complete", 3),      # land the rest for a full replay
+    (True, 1, "failed", 2),          # drain cap reached
+])
+def test_drain_after_load_failure(enabled, max_pages, status, landed):
+    writer = LandingWriter("api2", None, None)
+    pages = land_pages(iter(PAGES), writer)
+    next(pages)                      # transform/load of page 1 failed here
+
+    drain_to_landing(pages, writer, enabled=enabled, max_pages=max_pages)
+
+    manifest = read_manifest("api2", writer.run_id)
+    assert (manifest["status"], manifest["pages"]) == (status, landed)
+
+
+def test_compacted_run_replays_in_chunks(monkeypatch):
+    writer = LandingWriter("api2", None, None)
+    list(land_pages(iter(PAGES), writer))
+    compact_run(writer.run_dir)
+    monkeypatch.setattr(landing_zone, "REPLAY_CHUNK_ROWS", 2)
+
+    assert read_manifest("api2", writer.run_id)["compacted"] is True
+    assert list(iter_landing_pages("api2", writer.run_id)) == [
+        [{"id": 1}, {"id": 2}], [{"id": 3}, {"id": 4}], [{"id": 5}]]
+
+
+def _backdate(writer, days):
+    partition = (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")
+    target = os.path.join(os.path.dirname(os.path.dirname(writer.run_dir)), partition)
+    os.makedirs(target, exist_ok=True)
+    shutil.move(writer.run_dir, target)
+    return os.path.join(target, writer.run_id)
+
+
+def test_retention_deletes_expired_and_compacts_older_runs():
+    runs = {}
+    for age in (30, 5, 0):
+        writer = LandingWriter("api2", None, None, run_id=f"run-{age}")
+        list(land_pages(iter(PAGES), writer))
+        runs[age] = _backdate(writer, age) if age else writer.run_dir
+
+    apply_retention("api2", retention_days=14, max_bytes=10 ** 9)
+
+    assert not os.path.exists(runs[30])
+    assert os.path.exists(os.path.join(runs[5], landing_zone.COMPACTED_FILE))
+    assert not os.path.exists(os.path.join(runs[0], landing_zone.COMPACTED_FILE))
+
+
+def test_retention_size_budget_keeps_newest_run():
+    for n in range(3):
+        list(land_pages(iter(PAGES), LandingWriter("api2", None, None, run_id=f"run-{n}")))
+
+    apply_retention("api2", retention_days=14, max_bytes=0)
+
+    assert [m["run_id"] for m in landing_zone.list_runs("api2")] == ["run-2"]
@@ -0,0 +1,74 @@
+"""Adaptive page sizing of services/page_size_controller.py."""
+
+import pytest
+
+import services.api_client_2 as api_client_2
+import services.page_size_controller as page_size_controller
+from services.page_size_controller import OBSERVATION_WINDOW, PageSizeController
+
+
+@pytest.fixture(autouse=True)
+def _state(tmp_path, monkeypatch):
+    monkeypatch.setattr(page_size_controller, "PAGE_SIZE_STATE_PATH",
+                        str(tmp_path / "page_size.json"))
+
+
+def _observe(controller, latency, times=OBSERVATION_WINDOW, nbytes=1000):
+    size = controller.page_size
+    for _ in range(times):
+        controller.observe(size, latency, nbytes, size)
+
+
+def test_ladder_doubles_through_initial_size():
+    controller = PageSizeController("t", 200, 50, 1000)
+    assert controller.ladder == [50, 100, 200, 400, 800]
+    assert controller.page_size == 200
+
+
+def test_fast_full_pages_grow_and_slow_pages_shrink():
+    controller = PageSizeController("t", 200, 50, 1000)
+    _observe(controller, 0.1)
+    assert controller.page_size == 400
+
+    _observe(controller, 5.0)
+    assert controller.page_size == 200
+
+
+def test_timeout_shrinks_immediately():
+    controller = PageSizeController("t", 200, 50, 1000)
+    controller.observe_timeout(200)
+    assert controller.page_size == 100
+
+
+def test_offsets_stay_aligned_after_growing():
+    controller = PageSizeController("t", 200, 50, 1000)
+    _observe(controller, 0.1)
+
+    # 200 rows already fetched at size 200 → page 2 of size 200, then 400-aligned pages
+    assert controller.size_for_offset(200) == 200
+    assert controller.size_for_offset(400) == 400
+    assert controller.size_for_offset(150) == 50
+
+
+def test_best_size_is_remembered_for_next_run():
+    controller = PageSizeController("t", 200, 50, 1000)
+    _observe(controller, 0.1)
+    _observe(controller, 0.1)
+    controller.save()
+
+    assert PageSizeController("t", 200, 50, 1000).page_size == 800
+
+
+def test_adaptive_paging_returns_every_row_once(stub_api, monkeypatch):
+    monkeypatch.setattr(api_client_2, "ADAPTIVE_PAGE_SIZE", True)
+    monkeypatch.setattr(api_client_2, "PAGE_SIZE", 10)
+    monkeypatch.setattr(api_client_2, "MIN_PAGE_SIZE", 5)
+    monkeypatch.setattr(api_client_2, "MAX_PAGE_SIZE", 80)
+
+    for in_flight in (1, 3):
+        pages = list(api_client_2.iter_api_2_pages({"from": "2025-12-01", "to": "2025-12-04"},
+                                                   max_in_flight=in_flight))
+        ids = [row["id"] for page in pages for row in page]
+        assert len(ids) == 200 and len(set(ids)) == 200
+        assert ids == sorted(ids)
+        assert max(len(p) for p in pages) > 10      # the ladder grew during the run
@@ -0,0 +1,90 @@
+"""On-disk response cache (services/response_cache.py) and its use by API 2."""
+
+import os
+from datetime import date, timedelta
+
+import pytest
+
+import services.api_client_2 as api_client_2
+from services.response_cache import TTL_OLD_DATA_SECONDS, ResponseCache
+
+HEADERS = {"ETag": '"v1"', "Last-Modified": "Mon, 01 Dec 2025 00:00:00 GMT"}
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ResponseCache(str(tmp_path / "http"))
+
+
+def test_store_and_lookup_round_trip(cache):
+    params = {"from": "2025-12-01", "to": "2025-12-01", "page": 1}
+    cache.store("api2", "http://x/api2", params, b'[{"id": 1}]', HEADERS)
+
+    entry = cache.lookup("api2", "http://x/api2", params)
+    assert entry.json() == [{"id": 1}]
+    assert entry.conditional_headers() == {"If-None-Match": '"v1"',
+                                           "If-Modified-Since": HEADERS["Last-Modified"]}
+    assert cache.lookup("api2", "http://x/api2", dict(params, page=2)) is None
+
+
+def test_ttl_follows_window_age():
+    today = date.today()
+    assert ResponseCache.ttl_for_params({"to": today.isoformat()}) == 0
+    assert ResponseCache.ttl_for_params({"to": (today - timedelta(days=1)).isoformat()}) == 3600
+    assert ResponseCache.ttl_for_params({"to": "2020-01-01"}) == TTL_OLD_DATA_SECONDS
+    assert ResponseCache.ttl_for_params({}) == 0
+    assert ResponseCache.ttl_for_params({"to": "not-a-date"}) == 0
+
+
+def test_lru_evicts_least_recently_used(cache):
+    cache.max_bytes = 25
+    for page in (1, 2):
+        cache.store("api2", "e", {"page": page}, b"x" * 10, {})
+    cache.lookup("api2", "e", {"page": 1})          # page 2 is now least recently used
+    cache.store("api2", "e", {"page": 3}, b"x" * 10, {})
+
+    assert cache.lookup("api2", "e", {"page": 1}) is not None
+    assert cache.lookup("api2", "e", {"page": 2}) is None
+    assert cache.lookup("api2", "e", {"page": 3}) is not None
+    assert cache.evictions == 1
+
+
+def test_index_is_rebuilt_from_disk(cache):
+    cache.store("api2", "e", {"page": 1}, b"x" * 10, {})
+    cache.store("api2", "e", {"page": 2}, b"x" * 10, {})
+
+    reopened = ResponseCache(cache.cache_dir, max_bytes=15)
+    reopened.store("api2", "e", {"page": 3}, b"x" * 10, {})
+    remaining = [name for _, _, files in os.walk(cache.cache_dir)
+                 for name in files if name.endswith(".body")]
+    assert len(remaining) == 1
+
+
+@pytest.fixture
+def api_cache(cache, monkeypatch):
+    monkeypatch.setattr(api_client_2, "get_response_cache", lambda: cache)
+    monkeypatch.setattr(api_client_2, "ADAPTIVE_PAGE_SIZE", False)
+    monkeypatch.setattr(api_client_2, "PAGE_SIZE", 25)
+    return cache
+
+
+def test_old_window_is_served_from_disk(stub_api, api_cache):
+    window = {"from": "2025-12-01", "to": "2025-12-01"}
+    first = api_client_2.fetch_api_2_data(window, max_in_flight=1)
+    requests_after_first = sum(stub_api.status_counts.values())
+    second = api_client_2.fetch_api_2_data(window, max_in_flight=1)
+
+    assert second == first
+    assert sum(stub_api.status_counts.values()) == requests_after_first
+    assert api_cache.stats()["hits"] == 3      # 2 data pages + the empty page
+
+
+def test_todays_window_is_revalidated(stub_api, api_cache):
+    today = date.today().isoformat()
+    window = {"from": today, "to": today}
+    first = api_client_2.fetch_api_2_data(window, max_in_flight=1)
+    second = api_client_2.fetch_api_2_data(window, max_in_flight=1)
+
+    assert second == first
+    assert stub_api.status_counts.get(304) == 3
+    assert api_cache.stats()["revalidated"] == 3
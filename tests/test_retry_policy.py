@@ -0,0 +1,176 @@
+import threading
+import time
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import services.retry_policy as retry_policy
+from services.retry_policy import (
+    CIRCUIT_CLOSED,
+    CIRCUIT_HALF_OPEN,
+    CIRCUIT_OPEN,
+    CircuitOpenError,
+    RetryPolicy,
+    parse_retry_after
+)
+
+
+@pytest.fixture
+def policy(monkeypatch):
+    monkeypatch.setattr(retry_policy, "CIRCUIT_COOLDOWN_SECONDS", 0)
+    monkeypatch.setattr(retry_policy, "PROBE_WAIT_SECONDS", 2)
+    p = RetryPolicy("test")
+    monkeypatch.setattr(p, "_sleep", lambda seconds: None)
+    return p
+
+
+def _open_circuit(policy):
+    for _ in range(retry_policy.FAILURE_THRESHOLD):
+        policy.record_failure()
+
+
+# ------------------------------------------------------------
+# RETRY-AFTER / BACKOFF
+# ------------------------------------------------------------
+def test_parse_retry_after_seconds_and_http_date():
+    assert parse_retry_after("30") == 30.0
+    assert parse_retry_after("-5") == 0.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("soon") is None
+
+    when = datetime.now(timezone.utc) + timedelta(seconds=120)
+    assert 100 < parse_retry_after(format_datetime(when, usegmt=True)) <= 120
+
+
+def test_backoff_prefers_retry_after_and_caps_it(policy):
+    assert policy.backoff_delay(1, retry_after=3.0) == 3.0
+    assert policy.backoff_delay(1, retry_after=10_000) == retry_policy.MAX_BACKOFF_SECONDS
+
+
+def test_backoff_jitter_stays_below_exponential_ceiling(policy):
+    for attempt in range(1, 8):
+        ceiling = min(retry_policy.MAX_BACKOFF_SECONDS, policy.base_backoff * 2 ** (attempt - 1))
+        assert 0 <= policy.backoff_delay(attempt) <= ceiling
+
+
+# ------------------------------------------------------------
+# RATE LIMITER
+# ------------------------------------------------------------
+def test_rate_is_unlimited_until_throttled(policy):
+    assert policy.snapshot()["rate_per_sec"] == "unlimited"
+
+    policy.record_failure(throttled=True)
+    rate = policy.snapshot()["rate_per_sec"]
+    assert rate != "unlimited"
+    assert rate >= retry_policy.MIN_RATE_PER_SEC
+
+    policy.record_failure(throttled=True)
+    assert policy.snapshot()["rate_per_sec"] == max(retry_policy.MIN_RATE_PER_SEC,
+                                                     round(rate * retry_policy.RATE_DECREASE_FACTOR, 3))
+
+
+# ------------------------------------------------------------
+# CIRCUIT BREAKER
+# ------------------------------------------------------------
+def test_circuit_opens_after_consecutive_failures(policy, monkeypatch):
+    monkeypatch.setattr(retry_policy, "CIRCUIT_COOLDOWN_SECONDS", 60)
+    _open_circuit(policy)
+
+    assert policy.snapshot()["circuit_state"] == CIRCUIT_OPEN
+    with pytest.raises(CircuitOpenError):
+        policy.before_request()
+
+
+def test_success_resets_the_failure_count(policy):
+    for _ in range(retry_policy.FAILURE_THRESHOLD - 1):
+        policy.record_failure()
+    policy.record_success()
+    policy.record_failure()
+
+    assert policy.snapshot()["circuit_state"] == CIRCUIT_CLOSED
+
+
+def test_half_open_probe_success_closes_the_circuit(policy):
+    _open_circuit(policy)
+
+    policy.before_request()
+    assert policy.snapshot()["circuit_state"] == CIRCUIT_HALF_OPEN
+    policy.record_success()
+
+    assert policy.snapshot()["circuit_state"] == CIRCUIT_CLOSED
+
+
+def test_half_open_probe_failure_reopens_the_circuit(policy):
+    _open_circuit(policy)
+
+    policy.before_request()
+    policy.record_failure()
+
+    assert policy.snapshot()["circuit_state"] == CIRCUIT_OPEN
+    assert policy.snapshot()["circuit_trips"] == 2
+
+
+def test_released_probe_lets_the_next_request_probe(policy):
+    # e.g. the probe got a non-retryable 4xx: neither success nor failure
+    _open_circuit(policy)
+    policy.before_request()
+    policy.release_probe()
+
+    policy.before_request()
+    assert policy.snapshot()["circuit_state"] == CIRCUIT_HALF_OPEN
+
+
+def test_release_probe_ignores_other_threads(policy):
+    _open_circuit(policy)
+    policy.before_request()
+
+    other = threading.Thread(target=policy.release_probe)
+    other.start()
+    other.join()
+
+    assert policy._half_open_probe
+
+
+def test_concurrent_request_waits_for_the_probe(policy):
+    _open_circuit(policy)
+    policy.before_request()
+
+    outcome = []
+
+    def worker():
+        try:
+            policy.before_request()
+            outcome.append("sent")
+        except CircuitOpenError:
+            outcome.append("failed")
+
+    waiter = threading.Thread(target=worker)
+    waiter.start()
+    time.sleep(0.1)
+    assert outcome == []            # still waiting for the probe
+
+    policy.record_success()
+    waiter.join(timeout=2)
+    assert outcome == ["sent"]
+
+
+def test_waiting_for_a_stuck_probe_times_out(policy, monkeypatch):
+    monkeypatch.setattr(retry_policy, "PROBE_WAIT_SECONDS", 0.1)
+    _open_circuit(policy)
+    policy.before_request()
+
+    errors = []
+    waiter = threading.Thread(target=lambda: errors.append(_call(policy.before_request)))
+    waiter.start()
+    waiter.join(timeout=2)
+
+    assert isinstance(errors[0], CircuitOpenError)
+
+
+def _call(fn):
+    try:
+        fn()
+    except Exception as exc:
+        return exc
+    return None
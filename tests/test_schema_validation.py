@@ -0,0 +1,111 @@
+from datetime import datetime
+
+import pytest
+
+import etl.schema_validation as schema_validation
+from etl.schema_validation import TableSchema, check_reject_ratio, compile_schema, drain_rejects
+
+
+SCHEMA = compile_schema(TableSchema("#Test_Staging", [
+    ("id", "INT", False),
+    ("name", "NVARCHAR(5)", True),
+    ("amount", "FLOAT", True),
+    ("valid", "BIT", True),
+    ("seen_at", "DATETIME", True),
+], required=["id"]))
+
+
+@pytest.fixture(autouse=True)
+def _no_pending_rejects():
+    drain_rejects()
+    yield
+    drain_rejects()
+
+
+def _rows(n):
+    return [{"id": str(i), "name": "ab", "amount": "1.5", "valid": "true",
+             "seen_at": "2025-01-05T12:33:00Z"} for i in range(n)]
+
+
+def test_rows_are_coerced_into_records_in_table_order():
+    columns, records = SCHEMA.apply(_rows(2))
+
+    assert columns == ["id", "name", "amount", "valid", "seen_at"]
+    assert tuple(records[0]) == (0, "ab", 1.5, True, "2025-01-05 12:33:00")
+    assert records[1].id == 1
+
+
+def test_empty_strings_become_null_for_non_text_columns():
+    _, records = SCHEMA.apply([{"id": 1, "name": "", "amount": "", "valid": None}])
+    assert tuple(records[0]) == (1, "", None, None, None)
+
+
+def test_datetime_objects_pass_through():
+    when = datetime(2025, 1, 5, 12, 33)
+    _, records = SCHEMA.apply([{"id": 1, "seen_at": when}])
+    assert records[0].seen_at == when
+
+
+def test_rejects_are_kept_for_quarantine():
+    rows = _rows(3) + [{"id": "x"}]
+
+    _, records = SCHEMA.apply(rows)
+
+    assert len(records) == 3
+    rejects = SCHEMA.drain_rejects()
+    assert len(rejects) == 1
+    assert rejects[0]["table"] == "#Test_Staging"
+    assert rejects[0]["row"] == {"id": "x"}
+    assert "not a valid INT" in rejects[0]["error"]
+    assert SCHEMA.drain_rejects() == []
+
+
+@pytest.mark.parametrize("row, message", [
+    ({"name": "ab"}, "missing required field 'id'"),
+    ({"id": None}, "NOT NULL"),
+    ({"id": 2 ** 31}, "not a valid INT"),
+    ({"id": 1, "name": "too long"}, "not a valid NVARCHAR(5)"),
+    ({"id": 1, "amount": float("nan")}, "not a valid FLOAT"),
+    ({"id": 1, "valid": "maybe"}, "not a valid BIT"),
+    ({"id": 1, "seen_at": "yesterday"}, "not a valid DATETIME"),
+])
+def test_invalid_values_are_rejected_with_a_reason(row, message):
+    SCHEMA.apply(_rows(1) + [row])
+
+    [reject] = SCHEMA.drain_rejects()
+    assert message in reject["error"]
+
+
+def test_batch_above_tolerance_is_quarantined_not_failed():
+    # the tolerance is checked over the whole run (check_reject_ratio)
+    _, records = SCHEMA.apply(_rows(1) + [{"id": "x"}, {"id": "y"}])
+
+    assert len(records) == 1
+    assert len(SCHEMA.drain_rejects()) == 2
+
+
+def test_reject_ratio_is_checked_over_the_run(monkeypatch):
+    check_reject_ratio("#Test_Staging", 5, 100)
+    check_reject_ratio("#Test_Staging", 0, 0)
+    with pytest.raises(ValueError, match="6/100 rows invalid"):
+        check_reject_ratio("#Test_Staging", 6, 100)
+
+
+def test_empty_batch():
+    with pytest.raises(ValueError, match="empty"):
+        SCHEMA.apply([])
+    assert SCHEMA.apply([], allow_empty=True) == (SCHEMA.columns, [])
+
+
+def test_apply_tuples_reorders_and_reports_rows_as_dicts():
+    columns, records = SCHEMA.apply_tuples(["amount", "id"], [("2", "7"), ("x", "8")])
+
+    assert columns == SCHEMA.columns
+    assert tuple(records[0]) == (7, None, 2.0, None, None)
+    [reject] = SCHEMA.drain_rejects()
+    assert reject["row"] == {"amount": "x", "id": "8"}
+
+
+def test_apply_tuples_requires_required_columns():
+    with pytest.raises(ValueError, match="missing required fields"):
+        SCHEMA.apply_tuples(["name"], [("ab",)])
@@ -0,0 +1,95 @@
+"""Target-table column metadata cache (services/table_metadata.py)."""
+
+from datetime import date, datetime
+
+import pytest
+
+from services.table_metadata import TableMetadataCache, coerce_rows, ordered_columns
+
+ROWS = [
+    ("Id", "int", None, 10, 0, "NO", 1),
+    ("Tarih", "datetime", None, None, None, "YES", 2),
+    ("Musteri", "nvarchar", 200, None, None, "YES", 3),
+    ("Miktar", "float", None, 53, None, "YES", 4),
+    ("Valid", "bit", None, None, None, "YES", 5),
+]
+
+
+class _Cursor:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def execute(self, sql, params):
+        self.conn.queries.append((sql, params))
+
+    def fetchall(self):
+        return ROWS
+
+    def close(self):
+        pass
+
+
+class _Conn:
+    def __init__(self):
+        self.queries = []
+
+    def cursor(self):
+        return _Cursor(self)
+
+
+@pytest.fixture
+def metadata():
+    return TableMetadataCache(ttl=0).get(_Conn(), "ChefsAI.dbo.Table1_ETL")
+
+
+def test_metadata_is_read_once_per_table():
+    cache, conn = TableMetadataCache(ttl=0), _Conn()
+
+    cache.get(conn, "ChefsAI.dbo.Table1_ETL")
+    cache.get(conn, "ChefsAI.dbo.Table1_ETL")
+
+    [(sql, params)] = conn.queries
+    assert "FROM ChefsAI.INFORMATION_SCHEMA.COLUMNS" in sql
+    assert params == ("dbo", "Table1_ETL")
+    assert cache.stats() == {"tables": 1, "hits": 1, "misses": 1}
+
+
+def test_invalidate_and_ttl_force_a_reread():
+    cache, conn = TableMetadataCache(ttl=0), _Conn()
+    cache.get(conn, "dbo.T")
+    cache.invalidate("dbo.T")
+    cache.get(conn, "dbo.T")
+
+    expiring = TableMetadataCache(ttl=1e-9)
+    expiring.get(conn, "dbo.T")
+    expiring.get(conn, "dbo.T")
+
+    assert len(conn.queries) == 4
+
+
+def test_placeholder_follows_the_driver():
+    conn = _Conn()
+    TableMetadataCache(placeholder="%s").get(conn, "dbo.T")
+    assert "TABLE_SCHEMA = %s AND TABLE_NAME = %s" in conn.queries[0][0]
+
+
+def test_columns_are_put_in_table_order(metadata):
+    assert ordered_columns(metadata, "T", ["valid", "id", "tarih"]) == ["id", "tarih", "valid"]
+
+    with pytest.raises(RuntimeError, match="not found"):
+        ordered_columns(metadata, "T", ["id", "extra"])
+
+
+def test_values_are_reordered_and_coerced(metadata):
+    rows = coerce_rows(metadata, "T", ["valid", "musteri", "id", "tarih", "miktar"],
+                       ["id", "tarih", "musteri", "miktar", "valid"],
+                       [(1, 5, "7", "2025-12-01 08:30:00", 2),
+                        (None, None, 8, date(2025, 12, 2), None)])
+
+    assert rows == [(7, datetime(2025, 12, 1, 8, 30), "5", 2.0, True),
+                    (8, datetime(2025, 12, 2), None, None, None)]
+
+
+def test_unconvertible_value_names_column_and_row(metadata):
+    with pytest.raises(RuntimeError, match=r"Cannot bind id='x' \(row 1\)"):
+        coerce_rows(metadata, "T", ["id"], ["id"], [(1,), ("x",)])
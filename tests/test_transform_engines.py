@@ -0,0 +1,79 @@
+"""The python and pandas transform engines produce the same records and rejects."""
+
+import os
+import subprocess
+import sys
+from datetime import datetime
+
+import pytest
+
+import etl.etl_pipeline_1 as etl_pipeline_1
+import etl.etl_pipeline_2 as etl_pipeline_2
+from benchmarks.stub_api_server import make_api1_record, make_api2_record
+
+DAY = datetime(2025, 12, 1)
+
+
+def _without(row, key):
+    return {k: v for k, v in row.items() if k != key}
+
+
+def _api1_batch():
+    rows = [make_api1_record(DAY, n, 100) for n in range(8)]
+    return [
+        rows[0],
+        _without(rows[1], "Musteri"),          # required but nullable key absent
+        dict(rows[2], Musteri=None),           # present as NULL → allowed
+        _without(rows[3], "OdaNo"),            # optional key absent → NULL
+        dict(rows[4], Id="abc"),               # not an INT
+        {},                                    # empty row, dropped
+        _without(rows[5], "Id"),               # required NOT NULL key absent
+        rows[6],
+    ]
+
+
+def _api2_batch():
+    rows = [make_api2_record(DAY, n, 100) for n in range(5)]
+    return [
+        rows[0],
+        _without(rows[1], "duration"),
+        dict(rows[2], duration=None),
+        dict(rows[3], valid="maybe"),
+        {"id": None, "hygieneId": "", "datetime": None},
+        rows[4],
+    ]
+
+
+def _run(pipeline, engine, batch, monkeypatch):
+    monkeypatch.setattr(pipeline, "TRANSFORM_ENGINE", engine)
+    columns, values = pipeline._transform(batch, allow_empty=True)
+    rejects = pipeline.TABLE_SCHEMA.drain_rejects()
+    return columns, [tuple(v) for v in values], [(r["error"], r["row"].get("id")) for r in rejects]
+
+
+@pytest.mark.parametrize("pipeline, batch", [
+    (etl_pipeline_1, _api1_batch),
+    (etl_pipeline_2, _api2_batch),
+])
+def test_engines_agree_on_records_and_rejects(pipeline, batch, monkeypatch):
+    python = _run(pipeline, "python", batch(), monkeypatch)
+    pandas = _run(pipeline, "pandas", batch(), monkeypatch)
+
+    assert pandas == python
+    assert python[2]                                  # the batch does reject rows
+
+
+def test_missing_required_key_is_rejected_not_loaded(monkeypatch):
+    batch = _api1_batch()
+    _, values, rejects = _run(etl_pipeline_1, "pandas", batch, monkeypatch)
+
+    assert ("missing required field 'musteri'", batch[1]["Id"]) in rejects
+    assert batch[1]["Id"] not in [v[0] for v in values]
+    assert batch[2]["Id"] in [v[0] for v in values]
+
+
+def test_pipelines_import_without_pandas():
+    code = ("import sys; sys.modules['pandas'] = None\n"
+            "import etl.etl_pipeline_1, etl.etl_pipeline_2")
+    subprocess.run([sys.executable, "-c", code], check=True,
+                   cwd=os.path.dirname(os.path.dirname(os.path.abspath(etl_pipeline_1.__file__))))
@@ -0,0 +1,59 @@
+"""Fused transform plans (etl/transform_plan.py) against the separate passes."""
+
+import copy
+
+from etl.common_transforms import (
+    clean_column_names,
+    drop_empty_rows,
+    normalize_dates,
+    null_to_default
+)
+from etl.transform_plan import (
+    CLEAN_COLUMN_NAMES,
+    DROP_EMPTY_ROWS,
+    NORMALIZE_DATES,
+    NULL_TO_DEFAULT,
+    build_transform_plan
+)
+
+RAW = [
+    {"Id": 1, "Tarih": "2025-12-01T08:30:00Z", "Oda No": None, "Parti No": "P-1"},
+    {"Id": None, "Tarih": "", "Oda No": None, "Parti No": ""},
+    {"Id": 2, "Tarih": "2025/12/02 09:00:00", "Oda No": 4, "Parti No": "P-2"},
+    {"Id": 3, "Tarih": "not a date", "Oda No": "", "Parti No": "2025-12-03"},
+]
+
+
+def _separate_passes(data, date_columns):
+    data = clean_column_names(copy.deepcopy(data))
+    data = drop_empty_rows(data)
+    data = normalize_dates(data, date_columns=date_columns)
+    return null_to_default(data, {"oda_no": 0})
+
+
+def _plan(date_columns):
+    return build_transform_plan([
+        CLEAN_COLUMN_NAMES,
+        DROP_EMPTY_ROWS,
+        (NORMALIZE_DATES, {"columns": date_columns}),
+        (NULL_TO_DEFAULT, {"defaults": {"oda_no": 0}}),
+    ])
+
+
+def test_plan_matches_separate_passes_with_declared_columns():
+    expected = _separate_passes(RAW, ["tarih"])
+
+    assert _plan(["tarih"]).apply(copy.deepcopy(RAW)) == expected
+    assert list(_plan(["tarih"]).iter_apply(copy.deepcopy(RAW))) == expected
+    assert expected[0] == {"id": 1, "tarih": "2025-12-01 08:30:00", "oda_no": 0, "parti_no": "P-1"}
+    assert expected[2]["parti_no"] == "2025-12-03"        # undeclared column left as is
+
+
+def test_plan_without_columns_parses_every_string():
+    # normalize_dates(date_columns=None) infers date columns from the head
+    # and tail of the batch; the per-row plan checks every string value
+    data = [{"note": "n/a"} for _ in range(250)]
+    data[120] = {"note": "2025-12-01"}
+
+    assert _separate_passes(data, None)[120] == {"note": "2025-12-01"}
+    assert _plan(None).apply(copy.deepcopy(data))[120] == {"note": "2025-12-01 00:00:00"}
@@ -0,0 +1,52 @@
+"""Incremental windows of services/watermark_store.py."""
+
+from datetime import datetime
+
+import pytest
+
+import services.watermark_store as watermark_store
+from services.watermark_store import (
+    compute_incremental_window,
+    get_watermark,
+    set_watermark,
+    watermark_after_run
+)
+
+NOW = datetime(2025, 12, 7, 22, 0)
+
+
+@pytest.fixture(autouse=True)
+def _store(tmp_path, monkeypatch):
+    monkeypatch.setattr(watermark_store, "WATERMARK_DB_PATH", str(tmp_path / "wm.sqlite"))
+
+
+def test_first_run_uses_default_window():
+    assert compute_incremental_window("p", now=NOW) == ("2025-12-01", "2025-12-07")
+
+
+def test_round_trip():
+    set_watermark("p", datetime(2025, 12, 6, 22, 0), rows_loaded=42)
+    assert get_watermark("p") == {"last_loaded_at": datetime(2025, 12, 6, 22, 0),
+                                  "rows_loaded": 42}
+
+
+def test_lookback_crossing_midnight_adds_a_day():
+    set_watermark("p", datetime(2025, 12, 7, 1, 0))
+    assert compute_incremental_window("p", lookback_hours=2, now=NOW) == ("2025-12-06", "2025-12-07")
+    assert compute_incremental_window("p", lookback_hours=0, now=NOW) == ("2025-12-07", "2025-12-07")
+
+
+def test_long_catch_up_is_clamped_from_the_watermark():
+    set_watermark("p", datetime(2025, 6, 1, 22, 0))
+
+    date_from, date_to = compute_incremental_window("p", lookback_hours=2, now=NOW)
+
+    assert (date_from, date_to) == ("2025-06-01", "2025-08-29")   # 90 days
+    # only the clamped window counts as loaded; the next run resumes there
+    assert watermark_after_run(date_to, NOW) == datetime(2025, 8, 30)
+    set_watermark("p", watermark_after_run(date_to, NOW))
+    assert compute_incremental_window("p", lookback_hours=2, now=NOW)[0] == "2025-08-29"
+
+
+def test_unclamped_run_advances_to_start_time():
+    assert watermark_after_run("2025-12-07", NOW) == NOW